@@ -1,6 +1,8 @@
 from flask import Flask
 from flask_restx import Api
 from datetime import datetime
+from app.config import config
+from app.persistence.snapshot import SnapshotStore
 from app.services.facade import facade
 from app.api.v1.users import api as users_ns
 from app.api.v1.amenities import api as amenities_ns
@@ -18,8 +20,18 @@ from app.api.v1.places import api as places_ns
 #             return obj.isoformat()
 #         return super().default(obj)
 
-def create_app():
+def create_app(config_name='default'):
     app = Flask(__name__)
+    app.config.from_object(config[config_name])
+
+    # Reload the data of the previous run and keep logging it
+    if app.config['DATA_DIR']:
+        store = SnapshotStore(app.config['DATA_DIR'],
+                              [facade.user_repo, facade.amenity_repo, facade.place_repo, facade.review_repo])
+        store.restore()
+        store.start(app.config['SNAPSHOT_INTERVAL'])
+        app.extensions['snapshots'] = store
+
     api = Api(app, version=1.0, title='HBnB aPI', description='HBnb Application API')
 
     #register the users namespace
@@ -71,7 +71,10 @@ class UserResource(Resource):
                 }, 200
     def put(self, user_id):
         user_data = api.payload
-        user = facade.update_user(user_id, user_data)
+        try:
+            user = facade.update_user(user_id, user_data)
+        except ValueError as e:
+            return {'error': str(e)}, 400
         if user == None:
             return {'error': 'User not found'}, 404
         elif user == False:
@@ -0,0 +1,119 @@
+"""
+Concurrent repository benchmark: one global lock vs. ConcurrentInMemoryRepository.
+
+N threads share a repository of places. Each thread mixes reads (get, owner
+lookup, price range) and writes (add, update). It prints the total
+operations per second for 1, 2, 4, ... threads, with one lock around every
+call of an InMemoryRepository and with ConcurrentInMemoryRepository (lock
+taken by writers only).
+
+CPython runs one thread at a time (the GIL), so neither scales like native
+code would. The comparison is about what the lock costs: with one global
+lock every read waits behind every other call.
+
+Usage (from the part2 directory):
+    python -m app.benchmarks.bench_concurrent_repository --threads 1 2 4 8 --writes 10
+"""
+import argparse
+import random
+import threading
+import time
+from app.models.place import Place
+from app.persistence.concurrent_repository import ConcurrentInMemoryRepository
+from app.persistence.repository import InMemoryRepository
+
+
+class GlobalLockRepository(InMemoryRepository):
+    """Every call under the same lock, the simple way to share an InMemoryRepository"""
+
+    def __init__(self, model=None):
+        super().__init__(model)
+        self._lock = threading.RLock()
+
+    def add(self, obj):
+        with self._lock:
+            super().add(obj)
+
+    def add_all(self, objs):
+        with self._lock:
+            super().add_all(objs)
+
+    def update(self, obj_id, data):
+        with self._lock:
+            return super().update(obj_id, data)
+
+    def get(self, obj_id):
+        with self._lock:
+            return super().get(obj_id)
+
+    def get_all_by_attribute(self, attr_name, attr_value):
+        with self._lock:
+            return super().get_all_by_attribute(attr_name, attr_value)
+
+    def get_range(self, attr_name, low=None, high=None):
+        with self._lock:
+            return super().get_range(attr_name, low, high)
+
+
+def new_place(rng, owners):
+    return Place(title='Bench place', description='', price=rng.randint(10, 500), latitude=0, longitude=0,
+                 owner_id=rng.choice(owners), amenities=[])
+
+
+def work(repo, ids, owners, write_percent, seconds, seed, counts):
+    rng = random.Random(seed)
+    operations = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        for _ in range(100):
+            choice = rng.randrange(100)
+            if choice < write_percent:
+                if rng.random() < 0.5:
+                    place = new_place(rng, owners)
+                    repo.add(place)
+                    ids.append(place.id)
+                else:
+                    repo.update(rng.choice(ids), {'price': rng.randint(10, 500)})
+            elif choice % 3 == 0:
+                repo.get(rng.choice(ids))
+            elif choice % 3 == 1:
+                repo.get_all_by_attribute('owner_id', rng.choice(owners))
+            else:
+                low = rng.randint(10, 500)
+                repo.get_range('price', low, low + 5)
+        operations += 100
+    counts.append(operations)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--threads', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--places', type=int, default=10000)
+    parser.add_argument('--writes', type=int, default=10, help='Percentage of writes')
+    parser.add_argument('--seconds', type=float, default=2.0)
+    args = parser.parse_args()
+
+    owners = [f'owner-{i}' for i in range(100)]
+    print(f"{'threads':>8} {'global lock ops/s':>18} {'optimistic ops/s':>17}")
+    for threads in args.threads:
+        results = []
+        for repository in (GlobalLockRepository, ConcurrentInMemoryRepository):
+            rng = random.Random(0)
+            repo = repository(Place)
+            places = [new_place(rng, owners) for _ in range(args.places)]
+            repo.add_all(places)
+            ids = [place.id for place in places]
+
+            counts = []
+            workers = [threading.Thread(target=work, args=(repo, ids, owners, args.writes, args.seconds, n, counts))
+                       for n in range(threads)]
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+            results.append(sum(counts) / args.seconds)
+        print(f"{threads:>8} {results[0]:>18.0f} {results[1]:>17.0f}")
+
+
+if __name__ == '__main__':
+    main()
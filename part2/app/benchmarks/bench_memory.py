@@ -0,0 +1,56 @@
+"""
+Memory benchmark: bytes per entity held by the in-memory repositories.
+
+Creates N entities of each model, the way the API does, and prints the
+memory they take divided by N (traced with tracemalloc, the list holding
+them excluded). Strings and lists owned by an entity (id, timestamps,
+title, the reviews list, ...) are counted with it. Objects shared between
+entities (the owner of a review, the amenities of a place) are counted
+once, with their own model.
+
+Usage (from the part2 directory):
+    python -m app.benchmarks.bench_memory --entities 100000
+"""
+import argparse
+import gc
+import tracemalloc
+from app.models.amenity import Amenity
+from app.models.place import Place
+from app.models.review import Review
+from app.models.user import User
+
+
+def measure(count, create):
+    """Bytes taken by count objects made by create(i), the list of them excluded"""
+    gc.collect()
+    objects = [None] * count
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for i in range(count):
+        objects[i] = create(i)
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return used / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--entities', type=int, default=100000)
+    args = parser.parse_args()
+
+    owner = User("Bench", "Owner", "owner@bench.io", "B3nchmark!")
+    wifi = Amenity("WiFi", "Fast")
+    place = Place("Place", "Bench place", 100, 0, 0, owner.id, [wifi])
+    models = {
+        'User': lambda i: User("Bench", "User", f"user{i}@bench.io", "B3nchmark!"),
+        'Amenity': lambda i: Amenity(f"Amenity {i}", "Bench amenity"),
+        'Place': lambda i: Place(f"Place {i}", "Bench place", i % 500, 45.5, -73.5, owner.id, [wifi]),
+        'Review': lambda i: Review("Bench review", 1 + i % 5, place=place, user=owner),
+    }
+    print(f"{'model':>8} {'bytes/entity':>13}")
+    for name, create in models.items():
+        print(f"{name:>8} {measure(args.entities, create):>13.0f}")
+
+
+if __name__ == '__main__':
+    main()
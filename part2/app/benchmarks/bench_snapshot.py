@@ -0,0 +1,73 @@
+"""
+Snapshot benchmark: writing and restoring the in-memory repositories.
+
+Fills the repositories with N entities (a tenth users, the rest places,
+each with an amenity and a review), writes a snapshot and restores it into
+empty repositories, the way a restarted process does. Prints the snapshot
+size and time, and the restore time.
+
+Usage (from the part2 directory):
+    python -m app.benchmarks.bench_snapshot --entities 100000 1000000
+"""
+import argparse
+import os
+import tempfile
+import time
+from app.models.amenity import Amenity
+from app.models.place import Place
+from app.models.review import Review
+from app.models.user import User
+from app.persistence.concurrent_repository import ConcurrentInMemoryRepository
+from app.persistence.snapshot import SNAPSHOT_FILE, SnapshotStore
+
+
+def repositories():
+    return [ConcurrentInMemoryRepository(model) for model in (User, Amenity, Place, Review)]
+
+
+def fill(repos, count):
+    users_repo, amenities_repo, places_repo, reviews_repo = repos
+    amenities = [Amenity(f"Amenity {i}") for i in range(20)]
+    amenities_repo.add_all(amenities)
+    users = [User("Bench", "User", f"user{i}@bench.io", "B3nchmark!") for i in range(max(count // 10, 1))]
+    users_repo.load(users)
+    places, reviews = [], []
+    for i in range((count - len(users)) // 2):
+        place = Place(f"Place {i}", "Bench place", i % 500, 0, 0, users[i % len(users)].id, [amenities[i % 20]])
+        review = Review("Bench review", 1 + i % 5, place=place, user=users[(i + 1) % len(users)])
+        place.add_review(review)
+        places.append(place)
+        reviews.append(review)
+    places_repo.load(places)
+    reviews_repo.load(reviews)
+    return len(users) + len(amenities) + len(places) + len(reviews)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--entities', type=int, nargs='+', default=[100000])
+    args = parser.parse_args()
+
+    print(f"{'entities':>9} {'snapshot MB':>12} {'bytes/entity':>13} {'snapshot s':>11} {'restore s':>10}")
+    for count in args.entities:
+        with tempfile.TemporaryDirectory() as directory:
+            store = SnapshotStore(directory, repositories())
+            store.restore()
+            total = fill(list(store._repositories.values()), count)
+
+            started = time.perf_counter()
+            store.snapshot()
+            snapshot_s = time.perf_counter() - started
+            store.close()
+            size = os.path.getsize(os.path.join(directory, SNAPSHOT_FILE))
+
+            started = time.perf_counter()
+            restored = SnapshotStore(directory, repositories()).restore()
+            restore_s = time.perf_counter() - started
+            assert restored == total
+            print(f"{total:>9} {size / 1024 / 1024:>12.1f} {size / total:>13.0f} {snapshot_s:>11.2f} "
+                  f"{restore_s:>10.2f}")
+
+
+if __name__ == '__main__':
+    main()
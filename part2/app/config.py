@@ -3,6 +3,9 @@ import os
 class Config:
     SECRET_KEY = os.getenv('SECRET_KEY', 'default_secret_key')
     DEBUG = False
+    # Directory where the in-memory data is kept across restarts (snapshot + write log), None to keep nothing
+    DATA_DIR = os.getenv('DATA_DIR')
+    SNAPSHOT_INTERVAL = int(os.getenv('SNAPSHOT_INTERVAL', '300'))  # seconds
 
 class DevelopmentConfig(Config):
     DEBUG = True
@@ -10,6 +10,8 @@ class Amenity(BaseModel):
         description (str): Detailed description of the amenity
     """
 
+    __slots__ = ('name', 'description')
+
     def __init__(self, name, description=None):
         """
         Initialize a new Amenity instance.
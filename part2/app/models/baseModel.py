@@ -1,6 +1,20 @@
 import uuid
 from datetime import datetime
 
+_UNSET = object()
+
+def _slot_names(cls):
+    """Attribute names of the __slots__ of cls and its bases, mangled like the attributes they hold"""
+    names = []
+    for klass in reversed(cls.__mro__):
+        slots = klass.__dict__.get('__slots__', ())
+        for name in (slots,) if isinstance(slots, str) else slots:
+            if name.startswith('__') and not name.endswith('__'):
+                name = f"_{klass.__name__.lstrip('_')}{name}"
+            names.append(name)
+    return tuple(names)
+
+
 class BaseModel:
     """
     Base class for all entities in the HBnB application.
@@ -9,8 +23,27 @@ class BaseModel:
     - id: A UUID string that uniquely identifies each entity
     - created_at: Timestamp when the entity is created
     - updated_at: Timestamp when the entity is last updated
+
+    Entities keep their attributes in __slots__ rather than a per-instance
+    __dict__: a few million of them are held in memory at once. Every
+    subclass declares __slots__ for the attributes it sets, _fields lists
+    them all (private ones by their mangled name, e.g. _Place__title).
+
+    Subclasses declare the attributes their InMemoryRepository indexes:
+    INDEXES maps an attribute to 'unique' or 'multi' (dotted names reach
+    into related objects) and SORTED_INDEXES lists the attributes kept
+    sorted for range queries.
     """
 
+    __slots__ = ('id', 'created_at', 'updated_at')
+
+    INDEXES = {}
+    SORTED_INDEXES = ('created_at',)
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._fields = _slot_names(cls)
+
     def __init__(self):
         """
         Initialize a new BaseEntity instance with:
@@ -19,7 +52,7 @@ class BaseModel:
         """
         self.id = str(uuid.uuid4())  # Generate a random UUID and convert to string
         self.created_at = str(datetime.now())  # Set creation timestamp
-        self.updated_at = str(datetime.now())  # Set initial update timestamp
+        self.updated_at = self.created_at  # Set initial update timestamp, the same string
 
     def save(self):
         """
@@ -46,6 +79,20 @@ class BaseModel:
         # Update the timestamp
         self.save()
 
+    def __getstate__(self):
+        """Attribute values of the entity, for pickle and the snapshots (see persistence.snapshot)"""
+        state = {}
+        for name in self._fields:
+            value = getattr(self, name, _UNSET)
+            if value is not _UNSET:
+                state[name] = value
+        return state
+
+    def __setstate__(self, state):
+        """Restore the attributes of __getstate__() as they are, without validating them again"""
+        for name, value in state.items():
+            object.__setattr__(self, name, value)
+
     def to_dict(self):
         """
         Convert the entity to a dictionary representation.
@@ -54,9 +101,12 @@ class BaseModel:
         Returns:
             dict: Dictionary containing all entity attributes
         """
-        entity_dict = self.__dict__.copy()
+        entity_dict = self.__getstate__()
 
         # Add class name for type information
         entity_dict['__class__'] = self.__class__.__name__
 
         return entity_dict
+
+
+BaseModel._fields = _slot_names(BaseModel)
@@ -17,6 +17,12 @@ class Place(BaseModel):
         reviews (list): List of Review instances for the place
     """
 
+    __slots__ = ('__title', '__description', '__price', '__latitude', '__longitude', '__owner_id',
+                 '__amenities', 'reviews')
+
+    INDEXES = {'owner_id': 'multi'}
+    SORTED_INDEXES = ('created_at', 'price')
+
     def __init__(self, title, description, price, latitude, longitude, owner_id, amenities):
         """
         Initialize a new Place instance.
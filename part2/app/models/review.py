@@ -13,6 +13,10 @@ class Review(BaseModel):
         user (User): User who wrote the review
     """
 
+    __slots__ = ('text', 'rating', 'place', 'user')
+
+    INDEXES = {'place.id': 'multi', 'user.id': 'multi'}
+
     def __init__(self, text, rating, place_id=None, user_id=None, place=None, user=None):
         """
         Initialize a new Review instance.
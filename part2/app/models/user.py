@@ -14,7 +14,11 @@ class User(BaseModel):
         is_admin (bool): User is Admin
         places (list[Place]): Places the User owns
     """
-    
+
+    __slots__ = ('__first_name', '__last_name', '__email', '__password', 'is_admin', 'places')
+
+    INDEXES = {'email': 'unique'}
+
     def __init__(self, first_name=None, last_name=None, email=None, password=None, is_admin=False): 
         """Initialize the User with all Attributes listed above.
         Requirements:
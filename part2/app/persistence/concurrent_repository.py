@@ -0,0 +1,111 @@
+from contextlib import contextmanager
+from threading import RLock
+import time
+from app.persistence.repository import InMemoryRepository
+
+
+class ConcurrentInMemoryRepository(InMemoryRepository):
+    """
+    InMemoryRepository that threads can share (threaded WSGI servers).
+
+    Writers take a lock, one at a time. Readers never take it: they read
+    optimistically, like a seqlock. Every write bumps a version number once
+    before and once after changing anything, so the version is odd while a
+    write is in progress. A reader notes the version, reads, and keeps the
+    result only if the version was even and is still the same afterwards,
+    otherwise it reads again. A reader that keeps losing the race to writers
+    (OPTIMISTIC_READS attempts) takes the lock for its last attempt, so it
+    cannot starve.
+
+    get, exists and count are a single dict operation, atomic on their own.
+    Objects are still changed in place by update(): a reader holding one may
+    see some fields of the update before the others.
+    """
+
+    OPTIMISTIC_READS = 8
+
+    def __init__(self, model=None):
+        super().__init__(model)
+        # Reentrant: add_all and delete_many write through add and delete
+        self._write_lock = RLock()
+        self._write_depth = 0
+        self._version = 0
+
+    @contextmanager
+    def _writing(self):
+        with self._write_lock:
+            self._write_depth += 1
+            if self._write_depth == 1:
+                self._version += 1
+            try:
+                yield
+            finally:
+                if self._write_depth == 1:
+                    self._version += 1
+                self._write_depth -= 1
+
+    def _read(self, read):
+        for _ in range(self.OPTIMISTIC_READS):
+            version = self._version
+            if version % 2 == 0:
+                try:
+                    result = read()
+                except (KeyError, RuntimeError):
+                    # An index pointing at a deleted object, a dict resized while iterated:
+                    # a write got in the middle, the version check below would fail anyway
+                    pass
+                else:
+                    if self._version == version:
+                        return result
+            time.sleep(0)  # Let the writer finish
+        with self._write_lock:
+            return read()
+
+    # === Writes ===
+
+    def add(self, obj):
+        with self._writing():
+            super().add(obj)
+
+    def add_all(self, objs):
+        with self._writing():
+            super().add_all(objs)
+
+    def update(self, obj_id, data):
+        with self._writing():
+            return super().update(obj_id, data)
+
+    def reindex(self, obj):
+        with self._writing():
+            super().reindex(obj)
+
+    def load(self, objs):
+        with self._writing():
+            super().load(objs)
+
+    def delete(self, obj_id):
+        with self._writing():
+            super().delete(obj_id)
+
+    def delete_many(self, obj_ids):
+        with self._writing():
+            return super().delete_many(obj_ids)
+
+    # === Reads ===
+
+    def get_all(self):
+        return self._read(super().get_all)
+
+    def get_many(self, obj_ids):
+        obj_ids = list(obj_ids)
+        return self._read(lambda: super(ConcurrentInMemoryRepository, self).get_many(obj_ids))
+
+    def get_by_attribute(self, attr_name, attr_value):
+        return self._read(lambda: super(ConcurrentInMemoryRepository, self).get_by_attribute(attr_name, attr_value))
+
+    def get_all_by_attribute(self, attr_name, attr_value):
+        return self._read(
+            lambda: super(ConcurrentInMemoryRepository, self).get_all_by_attribute(attr_name, attr_value))
+
+    def get_range(self, attr_name, low=None, high=None):
+        return self._read(lambda: super(ConcurrentInMemoryRepository, self).get_range(attr_name, low, high))
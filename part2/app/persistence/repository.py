@@ -1,4 +1,6 @@
 from abc import ABC, abstractmethod
+from bisect import bisect_left, bisect_right, insort
+from operator import attrgetter
 
 class Repository(ABC):
     @abstractmethod
@@ -20,14 +22,164 @@ class Repository(ABC):
     def get_by_attribute(self, attr_name, attr_value):
         pass
 
+    def get_many(self, obj_ids):
+        pass
+
+    def add_all(self, objs):
+        pass
+
+    def exists(self, obj_id):
+        pass
+
+    def count(self):
+        pass
+
+    def delete_many(self, obj_ids):
+        pass
+
+    def get_all_by_attribute(self, attr_name, attr_value):
+        pass
+
+    def get_range(self, attr_name, low=None, high=None):
+        pass
+
 class InMemoryRepository(Repository):
-    def __init__(self):
+    """
+    Repository keeping the objects in a dict.
+
+    Given a model, it indexes the attributes the model declares (see
+    BaseModel.INDEXES and BaseModel.SORTED_INDEXES): lookups on them are
+    dict lookups and range queries a binary search, instead of a scan of
+    every object. Without a model, or on other attributes, it scans.
+
+    The indexes follow add, update and delete. An object changed in place
+    without going through update() must be passed to reindex().
+
+    Listeners registered with subscribe() hear about every write, e.g. to
+    log it (see SnapshotStore).
+    """
+    def __init__(self, model=None):
+        self.model = model
         self._storage = {}
+        self._getters = {}   # attribute -> function reading it from an object
+        self._unique = {}    # attribute -> {value: obj_id}
+        self._multi = {}     # attribute -> {value: {obj_id: None}}, dicts keep the insertion order
+        self._sorted = {}    # attribute -> sorted list of (value, obj_id)
+        self._indexed = {}   # obj_id -> {attribute: value} as currently indexed
+        self._listeners = []
+        if model is not None:
+            for attr_name, kind in model.INDEXES.items():
+                if kind not in ('unique', 'multi'):
+                    raise ValueError(f"Unknown index kind {kind!r} for {model.__name__}.{attr_name}")
+                (self._unique if kind == 'unique' else self._multi)[attr_name] = {}
+                self._getters[attr_name] = attrgetter(attr_name)
+            for attr_name in model.SORTED_INDEXES:
+                self._sorted[attr_name] = []
+                self._getters[attr_name] = attrgetter(attr_name)
         # print(f"Created new repository: {id(self)}")
 
+    def _check_unique(self, obj_id, values):
+        for attr_name, index in self._unique.items():
+            owner = index.get(values.get(attr_name))
+            if owner is not None and owner != obj_id:
+                raise ValueError(f"An object with {attr_name} {values[attr_name]!r} already exists")
+
+    def _index(self, obj):
+        """Index obj, after checking its unique attributes: nothing changes if one is taken"""
+        if not self._getters:
+            return
+        values = {attr_name: getter(obj) for attr_name, getter in self._getters.items()}
+        self._check_unique(obj.id, values)
+        self._unindex(obj.id)
+        for attr_name, index in self._unique.items():
+            if values[attr_name] is not None:
+                index[values[attr_name]] = obj.id
+        for attr_name, index in self._multi.items():
+            if values[attr_name] is not None:
+                index.setdefault(values[attr_name], {})[obj.id] = None
+        for attr_name, entries in self._sorted.items():
+            if values[attr_name] is not None:
+                insort(entries, (values[attr_name], obj.id))
+        self._indexed[obj.id] = values
+
+    def _unindex(self, obj_id):
+        values = self._indexed.pop(obj_id, None)
+        if values is None:
+            return
+        for attr_name, index in self._unique.items():
+            if index.get(values[attr_name]) == obj_id:
+                del index[values[attr_name]]
+        for attr_name, index in self._multi.items():
+            ids = index.get(values[attr_name])
+            if ids is not None:
+                ids.pop(obj_id, None)
+                if not ids:
+                    del index[values[attr_name]]
+        for attr_name, entries in self._sorted.items():
+            if values[attr_name] is not None:
+                position = bisect_left(entries, (values[attr_name], obj_id))
+                if position < len(entries) and entries[position] == (values[attr_name], obj_id):
+                    del entries[position]
+
+    def subscribe(self, listener):
+        """Call listener('put', obj) after every add/update/reindex and listener('delete', obj_id) after a delete"""
+        self._listeners.append(listener)
+
+    def _notify(self, event, value):
+        for listener in self._listeners:
+            listener(event, value)
+
+    def reindex(self, obj):
+        """Bring the indexes up to date after obj was changed in place"""
+        self._index(obj)
+        self._notify('put', obj)
+
+    def load(self, objs):
+        """
+        Replace the whole content, without telling the listeners (restoring a snapshot).
+
+        Builds the indexes one attribute at a time, and the sorted ones with one
+        sort instead of an insertion per object. Everything is built aside and
+        swapped in at the end: if a unique value is taken twice, the repository
+        keeps its previous content.
+
+        Raises:
+            ValueError: If two objects share the value of a unique attribute
+        """
+        storage = {obj.id: obj for obj in objs}
+        ids = list(storage)
+        columns = {attr_name: list(map(getter, storage.values())) for attr_name, getter in self._getters.items()}
+        unique = {}
+        for attr_name in self._unique:
+            index = unique[attr_name] = {}
+            for obj_id, value in zip(ids, columns[attr_name]):
+                if value is not None and index.setdefault(value, obj_id) != obj_id:
+                    raise ValueError(f"An object with {attr_name} {value!r} already exists")
+        multi = {}
+        for attr_name in self._multi:
+            index = multi[attr_name] = {}
+            for obj_id, value in zip(ids, columns[attr_name]):
+                if value is not None:
+                    index.setdefault(value, {})[obj_id] = None
+        sorted_indexes = {
+            attr_name: sorted((value, obj_id) for obj_id, value in zip(ids, columns[attr_name]) if value is not None)
+            for attr_name in self._sorted
+        }
+        names = list(columns)
+        indexed = {obj_id: dict(zip(names, values)) for obj_id, values in zip(ids, zip(*columns.values()))}
+
+        self._storage, self._unique, self._multi = storage, unique, multi
+        self._sorted, self._indexed = sorted_indexes, indexed
+
     def add(self, obj):
+        """
+        Raises:
+            ValueError: If a unique attribute of obj is taken by another object
+        """
         # print(f"Adding object with ID {obj.id} to repository {id(self)}")
+        self._index(obj)
         self._storage[obj.id] = obj
+        self._notify('put', obj)
         # print(f"Repository now contains: {list(self._storage.keys())}")
 
     def get(self, obj_id):
@@ -41,17 +193,83 @@ class InMemoryRepository(Repository):
         return list(self._storage.values())
 
     def update(self, obj_id, data):
+        """
+        Raises:
+            ValueError: If the data gives a unique attribute a value taken by another object
+        """
         # print(f"Updating object with ID {obj_id} in repository {id(self)}")
         obj = self.get(obj_id)
         if obj:
-            obj.update(data)
+            self._check_unique(obj_id, data)
+            try:
+                obj.update(data)
+            finally:
+                # Also after a failed validation, which may have changed some attributes
+                self.reindex(obj)
         return obj
 
     def delete(self, obj_id):
         # print(f"Deleting object with ID {obj_id} from repository {id(self)}")
         if obj_id in self._storage:
+            self._unindex(obj_id)
             del self._storage[obj_id]
+            self._notify('delete', obj_id)
 
     def get_by_attribute(self, attr_name, attr_value):
         # print(f"Looking for objects with {attr_name}={attr_value} in repository {id(self)}")
-        return next((obj for obj in self._storage.values() if getattr(obj, attr_name) == attr_value), None)
+        if attr_name in self._unique:
+            obj_id = self._unique[attr_name].get(attr_value)
+            return self._storage[obj_id] if obj_id is not None else None
+        if attr_name in self._multi:
+            ids = self._multi[attr_name].get(attr_value)
+            return self._storage[next(iter(ids))] if ids else None
+        getter = attrgetter(attr_name)
+        return next((obj for obj in self._storage.values() if getter(obj) == attr_value), None)
+
+    def get_all_by_attribute(self, attr_name, attr_value):
+        """Every object whose attribute equals the value, in the order they were indexed"""
+        if attr_name in self._unique:
+            obj_id = self._unique[attr_name].get(attr_value)
+            return [self._storage[obj_id]] if obj_id is not None else []
+        if attr_name in self._multi:
+            return [self._storage[obj_id] for obj_id in self._multi[attr_name].get(attr_value, ())]
+        getter = attrgetter(attr_name)
+        return [obj for obj in self._storage.values() if getter(obj) == attr_value]
+
+    def get_range(self, attr_name, low=None, high=None):
+        """
+        Objects whose attribute is between low and high (both included, None for no bound),
+        sorted by that attribute. Objects where it is None are left out.
+        """
+        entries = self._sorted.get(attr_name)
+        if entries is None:
+            getter = attrgetter(attr_name)
+            matches = [(getter(obj), obj_id) for obj_id, obj in self._storage.items()]
+            entries = sorted(match for match in matches if match[0] is not None)
+        # (value,) sorts before and (value, '\uffff') after every (value, obj_id)
+        start = bisect_left(entries, (low,)) if low is not None else 0
+        end = bisect_right(entries, (high, '\uffff')) if high is not None else len(entries)
+        return [self._storage[obj_id] for _, obj_id in entries[start:end]]
+
+    def get_many(self, obj_ids):
+        """Objects of the given ids, in the order of the ids, unknown ids are skipped"""
+        return [self._storage[obj_id] for obj_id in dict.fromkeys(obj_ids) if obj_id in self._storage]
+
+    def add_all(self, objs):
+        for obj in objs:
+            self.add(obj)
+
+    def exists(self, obj_id):
+        return obj_id in self._storage
+
+    def count(self):
+        return len(self._storage)
+
+    def delete_many(self, obj_ids):
+        """Delete the objects of the given ids, returns how many were deleted"""
+        deleted = 0
+        for obj_id in dict.fromkeys(obj_ids):
+            if obj_id in self._storage:
+                self.delete(obj_id)
+                deleted += 1
+        return deleted
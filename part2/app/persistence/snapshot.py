@@ -0,0 +1,303 @@
+"""
+Snapshots and write log of the in-memory repositories.
+
+The data directory holds:
+- snapshot: every object of the repositories at some point in time
+- log.<n>: the writes made after it, appended as they happen
+
+restore() maps the snapshot file in memory, decodes it one section (model)
+at a time, replays the logs on top and loads the result into the
+repositories. snapshot() writes a new snapshot next to the old one, renames
+it over it and drops the logs it covers.
+
+Formats (little endian):
+- snapshot: header (magic, format version, number of the first log to
+  replay, number of sections), then per model a section: its length and a
+  marshal blob (model name, state keys, the keys holding references,
+  whether some objects lack a key, one tuple of state values per object).
+- log: records of (payload length, CRC32 of the payload) then the payload,
+  a marshal blob ('put', model name, state) or ('delete', None, id).
+
+A state is what the object's __getstate__() returns. References to other
+entities in it (Review.place, Place.amenities, ...) are stored as 1-tuples
+holding the id and linked again once every object is loaded. A reference to
+an object that is gone is dropped.
+
+Crash safety: a put carries the whole state of the object, so replaying a
+record twice does no harm. Logs are switched before the objects are copied
+into a snapshot, and the snapshot only replaces the previous one once it is
+complete on disk, so a crash at any point leaves a snapshot and logs that
+together hold every logged write. A log record cut short by a crash fails
+its length or CRC check, it is dropped and the log truncated there.
+"""
+from contextlib import contextmanager
+import gc
+import marshal
+import mmap
+import os
+import struct
+import threading
+import zlib
+from app.models.baseModel import BaseModel
+
+MAGIC = b'HBNBSNAP'
+FORMAT_VERSION = 1
+HEADER = struct.Struct('<8sHQI')
+SECTION = struct.Struct('<Q')
+RECORD = struct.Struct('<II')
+SNAPSHOT_FILE = 'snapshot'
+LOG_PREFIX = 'log.'
+
+
+def _encode(value):
+    """A state value with the entities replaced by (id,)"""
+    if isinstance(value, list):
+        return [_encode(item) for item in value]
+    if isinstance(value, BaseModel):
+        return (value.id,)
+    return value
+
+
+def _has_reference(value):
+    return isinstance(value, tuple) or (isinstance(value, list) and any(isinstance(item, tuple) for item in value))
+
+
+def _resolve(value, objects):
+    """The value with its (id,) references replaced by the objects, unknown ids dropped"""
+    if isinstance(value, tuple):
+        return objects.get(value[0])
+    return [objects[item[0]] if isinstance(item, tuple) else item
+            for item in value if not isinstance(item, tuple) or item[0] in objects]
+
+
+def _log_number(name):
+    return int(name[len(LOG_PREFIX):])
+
+
+@contextmanager
+def _no_gc():
+    """
+    Pause the cyclic garbage collector: building millions of objects triggers
+    full collections that scan every one of them again and again, which makes
+    restoring a big snapshot several times slower
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+class SnapshotStore:
+    """
+    Keeps a set of InMemoryRepository on disk.
+
+    Attributes:
+        directory (str): Data directory, created if missing
+        sync (bool): fsync the log after every write, survives a crash of the
+            machine and not only of the process, at the cost of a disk flush per write
+    """
+
+    def __init__(self, directory, repositories, sync=False):
+        self.directory = directory
+        self.sync = sync
+        self._repositories = {repo.model.__name__: repo for repo in repositories}
+        self._lock = threading.Lock()  # Log appends and switches
+        self._log = None
+        self._log_number = 0
+        self._stop = threading.Event()
+        self._thread = None
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, name):
+        return os.path.join(self.directory, name)
+
+    def _logs(self):
+        return sorted((_log_number(name) for name in os.listdir(self.directory)
+                       if name.startswith(LOG_PREFIX) and name[len(LOG_PREFIX):].isdigit()))
+
+    # === Restore ===
+
+    def restore(self):
+        """
+        Load the snapshot and the logs into the repositories (their content is
+        replaced), then log every write made to them from now on. Call once.
+
+        Returns:
+            int: Number of objects loaded
+        """
+        with _no_gc():
+            count, last_log = self._restore()
+        self._open_log(last_log)
+        return count
+
+    def _restore(self):
+        states = {}  # id -> (model name, state, keys of the state holding references)
+        first_log = self._read_snapshot(states)
+        logs = [number for number in self._logs() if number >= first_log]
+        for number in logs:
+            self._replay(number, states)
+
+        # Create every object first, so that the references between them can be linked
+        models = {name: repo.model for name, repo in self._repositories.items()}
+        objects = {}
+        for obj_id, (name, _, _) in states.items():
+            objects[obj_id] = models[name].__new__(models[name])
+        for obj_id, (_, state, reference_keys) in states.items():
+            for key in reference_keys:
+                if key in state:
+                    state[key] = _resolve(state[key], objects)
+            objects[obj_id].__setstate__(state)
+
+        by_model = {name: [] for name in self._repositories}
+        for obj_id, (name, _, _) in states.items():
+            by_model[name].append(objects[obj_id])
+        for name, repo in self._repositories.items():
+            repo.load(by_model[name])
+            repo.subscribe(self._record)
+        return len(objects), logs[-1] + 1 if logs else first_log
+
+    def _read_snapshot(self, states):
+        """Decode the snapshot into states, returns the number of the first log to replay"""
+        path = self._path(SNAPSHOT_FILE)
+        if not os.path.exists(path):
+            return 0
+        with open(path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            with memoryview(mapped) as view:
+                magic, version, first_log, sections = HEADER.unpack_from(view, 0)
+                if magic != MAGIC or version != FORMAT_VERSION:
+                    raise ValueError(f"{path} is not a snapshot this version can read")
+                offset = HEADER.size
+                for _ in range(sections):
+                    (length,) = SECTION.unpack_from(view, offset)
+                    offset += SECTION.size
+                    name, keys, reference_keys, partial, records = marshal.loads(view[offset:offset + length])
+                    offset += length
+                    id_position = keys.index('id')
+                    for record in records:
+                        state = dict(zip(keys, record))
+                        if partial:
+                            state = {key: value for key, value in state.items() if value is not ...}
+                        states[record[id_position]] = (name, state, reference_keys)
+        return first_log
+
+    def _replay(self, number, states):
+        """Apply the records of a log to states, cut the log after its last complete record"""
+        path = self._path(f'{LOG_PREFIX}{number}')
+        size = os.path.getsize(path)
+        end = 0
+        if size:
+            with open(path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                while end + RECORD.size <= size:
+                    length, checksum = RECORD.unpack_from(mapped, end)
+                    payload = mapped[end + RECORD.size:end + RECORD.size + length]
+                    if len(payload) < length or zlib.crc32(payload) != checksum:
+                        break
+                    event, name, value = marshal.loads(payload)
+                    if event == 'put':
+                        states[value['id']] = (name, value, [key for key, item in value.items()
+                                                             if _has_reference(item)])
+                    else:
+                        states.pop(value, None)
+                    end += RECORD.size + length
+        if end < size:
+            with open(path, 'r+b') as file:
+                file.truncate(end)
+
+    # === Log ===
+
+    def _open_log(self, number):
+        self._log_number = number
+        self._log = open(self._path(f'{LOG_PREFIX}{number}'), 'ab')
+
+    def _record(self, event, value):
+        """Repository listener: append the write to the log"""
+        if event == 'put':
+            payload = marshal.dumps(('put', type(value).__name__,
+                                     {key: _encode(item) for key, item in value.__getstate__().items()}))
+        else:
+            payload = marshal.dumps(('delete', None, value))
+        with self._lock:
+            self._log.write(RECORD.pack(len(payload), zlib.crc32(payload)) + payload)
+            self._log.flush()
+            if self.sync:
+                os.fsync(self._log.fileno())
+
+    # === Snapshot ===
+
+    def snapshot(self):
+        """
+        Write the content of the repositories to a new snapshot.
+
+        Returns:
+            int: Number of objects written
+        """
+        # New writes go to a new log from here, everything in the older logs is
+        # already in the repositories and so in the copy below
+        with self._lock:
+            previous = self._log
+            self._open_log(self._log_number + 1)
+            first_log = self._log_number
+        if previous is not None:
+            previous.close()
+
+        with _no_gc():
+            sections, count = self._sections()
+        self._write_snapshot(first_log, sections)
+        return count
+
+    def _sections(self):
+        """The snapshot section of every repository, and the number of objects in them"""
+        sections = []
+        count = 0
+        for name, repo in self._repositories.items():
+            keys = {}
+            states = []
+            for obj in repo.get_all():
+                state = {key: _encode(value) for key, value in obj.__getstate__().items()}
+                keys.update(dict.fromkeys(state))
+                states.append(state)
+            keys = list(keys)
+            # Ellipsis: a key this object does not have (partial: some object lacks a key)
+            records = [tuple(state.get(key, ...) for key in keys) for state in states]
+            partial = any(len(state) < len(keys) for state in states)
+            reference_keys = [key for position, key in enumerate(keys)
+                              if any(_has_reference(record[position]) for record in records)]
+            sections.append(marshal.dumps((name, keys, reference_keys, partial, records)))
+            count += len(records)
+        return sections, count
+
+    def _write_snapshot(self, first_log, sections):
+        """Replace the snapshot once the new one is on disk, then drop the logs it covers"""
+        temporary = self._path(SNAPSHOT_FILE + '.tmp')
+        with open(temporary, 'wb') as file:
+            file.write(HEADER.pack(MAGIC, FORMAT_VERSION, first_log, len(sections)))
+            for section in sections:
+                file.write(SECTION.pack(len(section)))
+                file.write(section)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary, self._path(SNAPSHOT_FILE))
+        for number in self._logs():
+            if number < first_log:
+                os.remove(self._path(f'{LOG_PREFIX}{number}'))
+
+    def start(self, interval):
+        """Take a snapshot every interval seconds, in a daemon thread"""
+        def run():
+            while not self._stop.wait(interval):
+                self.snapshot()
+        self._thread = threading.Thread(target=run, name='snapshots', daemon=True)
+        self._thread.start()
+
+    def close(self):
+        """Stop the periodic snapshots and close the log"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        with self._lock:
+            if self._log is not None:
+                self._log.close()
+                self._log = None
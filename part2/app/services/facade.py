@@ -1,4 +1,4 @@
-from app.persistence.repository import InMemoryRepository
+from app.persistence.concurrent_repository import ConcurrentInMemoryRepository
 from app.models.user import User
 from app.models.place import Place
 from app.models.review import Review
@@ -19,11 +19,12 @@ class HBnBFacade:
         """
         Initialize repositories for each entity type.
         Each repository is responsible for storing and retrieving a specific entity type.
+        The facade is shared by every request thread, so are the repositories.
         """
-        self.user_repo = InMemoryRepository()
-        self.place_repo = InMemoryRepository()
-        self.review_repo = InMemoryRepository()
-        self.amenity_repo = InMemoryRepository()
+        self.user_repo = ConcurrentInMemoryRepository(User)
+        self.place_repo = ConcurrentInMemoryRepository(Place)
+        self.review_repo = ConcurrentInMemoryRepository(Review)
+        self.amenity_repo = ConcurrentInMemoryRepository(Amenity)
 
 # === User operations ===
     def create_user(self, user_data):
@@ -76,7 +77,8 @@ class HBnBFacade:
             return None
         if any(x not in user.serialize() for x in user_data.keys()):
             return False
-        user.update(user_data)
+        # Through the repository, which keeps the email index up to date
+        self.user_repo.update(user_id, user_data)
         return True
       
 # === Place Operations ===
@@ -84,15 +86,8 @@ class HBnBFacade:
     def create_place(self, place_data):
         """Create a Place Object with optional amenities"""
         
-        # Extract amenity IDs from the request
-        amenity_ids = place_data.get('amenities', [])
-        amenities = []
-        
-        # Get actual amenity objects from the repository
-        for amenity_id in amenity_ids:
-            amenity = self.amenity_repo.get(amenity_id)
-            if amenity:
-                amenities.append(amenity)
+        # Get actual amenity objects from the repository (unknown ids are skipped)
+        amenities = self.amenity_repo.get_many(place_data.get('amenities', []))
         
         place = Place(
             title=place_data.get('title'),
@@ -271,6 +266,7 @@ class HBnBFacade:
             return False
             
         place.add_amenity(amenity)
+        self.place_repo.reindex(place)
         return True
 
 # === Review ===
@@ -316,6 +312,7 @@ class HBnBFacade:
         
         # Add the review to the place's reviews list
         place_obj.add_review(review)
+        self.place_repo.reindex(place_obj)
         
         return review
 
@@ -397,11 +394,10 @@ class HBnBFacade:
         Returns:
             list: List of reviews for the place
         """
-        place = self.get_place(place_id)
-        if not place:
+        if not self.place_repo.exists(place_id):
             return None
 
-        # Return the reviews from the place object
+        # Index lookup, get_place() would serialize the whole place for nothing
         return [
             {
                 'id': review.id,
@@ -410,7 +406,7 @@ class HBnBFacade:
                 'user_id': review.user.id,
                 'created_at': review.created_at,
                 'updated_at': review.updated_at
-            } for review in place.reviews
+            } for review in self.review_repo.get_all_by_attribute('place.id', place_id)
         ]
 
 
@@ -0,0 +1,47 @@
+import pickle
+import pytest
+from app.models.amenity import Amenity
+from app.models.place import Place
+from app.models.review import Review
+from app.models.user import User
+
+
+class TestCompactEntities():
+    """Tests for the __slots__ storage of the entities"""
+
+    def entities(self):
+        owner = User("Ann", "Host", "ann@host.com", "G00dP455!")
+        wifi = Amenity("WiFi", "Fast")
+        loft = Place("Loft", "Top floor", 80, -37.8, 144.9, owner.id, [wifi])
+        review = Review("Great", 5, place=loft, user=owner)
+        return owner, wifi, loft, review
+
+    def test_no_instance_dict(self):
+        for entity in self.entities():
+            assert not hasattr(entity, "__dict__")
+            with pytest.raises(AttributeError):
+                entity.unknown_field = 1
+
+    def test_setters_still_validate(self):
+        owner, wifi, loft, review = self.entities()
+        with pytest.raises(ValueError):
+            loft.price = -1
+        with pytest.raises(ValueError):
+            owner.first_name = "x" * 51
+        assert loft.price == 80.0
+
+    def test_state_round_trip(self):
+        owner, wifi, loft, review = self.entities()
+        state = loft.__getstate__()
+        assert state["_Place__title"] == "Loft"
+        assert state["_Place__amenities"] == [wifi]
+
+        copy = pickle.loads(pickle.dumps(review))
+        assert (copy.id, copy.text, copy.rating) == (review.id, "Great", 5)
+        assert copy.place.title == "Loft"
+        assert copy.user.email == "ann@host.com"
+
+    def test_to_dict(self):
+        owner, wifi, loft, review = self.entities()
+        assert wifi.to_dict() == {"id": wifi.id, "created_at": wifi.created_at, "updated_at": wifi.updated_at,
+                                  "name": "WiFi", "description": "Fast", "__class__": "Amenity"}
@@ -0,0 +1,99 @@
+import random
+import sys
+import threading
+import pytest
+from app.models.place import Place
+from app.persistence.concurrent_repository import ConcurrentInMemoryRepository
+
+
+def place(title, price, owner_id):
+    return Place(title=title, description="", price=price, latitude=0, longitude=0,
+                 owner_id=owner_id, amenities=[])
+
+
+class TestConcurrentInMemoryRepository():
+    """Many threads mixing reads and writes on one ConcurrentInMemoryRepository"""
+
+    WRITERS = 4
+    READERS = 4
+    ROUNDS = 600
+
+    @pytest.fixture(autouse=True)
+    def frequent_thread_switches(self):
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        yield
+        sys.setswitchinterval(interval)
+
+    def test_stress(self):
+        repo = ConcurrentInMemoryRepository(Place)
+        live = {}  # writer -> ids it added and did not delete, only touched by that writer
+        errors = []
+        done = threading.Event()
+
+        def writer(number):
+            rng = random.Random(number)
+            mine = live[number] = []
+            owners = (f"{number}-a", f"{number}-b")
+            for round_number in range(self.ROUNDS):
+                new = place(f"{number}/{round_number}", rng.randint(0, 100), owners[0])
+                repo.add(new)
+                mine.append(new.id)
+                repo.update(rng.choice(mine), {"price": rng.randint(0, 100), "owner_id": rng.choice(owners)})
+                if rng.random() < 0.3:
+                    repo.delete(mine.pop(rng.randrange(len(mine))))
+
+        def reader(number):
+            rng = random.Random(100 + number)
+            while not done.is_set():
+                owner = f"{rng.randrange(self.WRITERS)}-{rng.choice('ab')}"
+                owned = repo.get_all_by_attribute("owner_id", owner)
+                # Owners are never shared between writers, and the titles start with the writer number
+                if any(not p.title.startswith(owner.split("-")[0] + "/") for p in owned):
+                    errors.append(f"{owner} owns a place of another writer")
+                low = rng.randint(0, 100)
+                in_range = repo.get_range("price", low, low + 10)
+                if len({p.id for p in in_range}) != len(in_range):
+                    errors.append("get_range returned a place twice")
+                everything = repo.get_all()
+                if len({p.id for p in everything}) != len(everything):
+                    errors.append("get_all returned a place twice")
+
+        def guarded(target):
+            def run(number):
+                try:
+                    target(number)
+                except Exception as e:
+                    errors.append(repr(e))
+            return run
+
+        readers = [threading.Thread(target=guarded(reader), args=(n,)) for n in range(self.READERS)]
+        writers = [threading.Thread(target=guarded(writer), args=(n,)) for n in range(self.WRITERS)]
+        for thread in readers + writers:
+            thread.start()
+        for thread in writers:
+            thread.join()
+        done.set()
+        for thread in readers:
+            thread.join()
+
+        assert errors == []
+        # No lost write: the repository holds exactly what the writers think it holds
+        expected = {place_id for ids in live.values() for place_id in ids}
+        assert {p.id for p in repo.get_all()} == expected
+        assert repo.count() == len(expected)
+        # ... and the indexes agree with a scan of the objects
+        for number in range(self.WRITERS):
+            for owner in (f"{number}-a", f"{number}-b"):
+                scanned = {p.id for p in repo.get_all() if p.owner_id == owner}
+                assert {p.id for p in repo.get_all_by_attribute("owner_id", owner)} == scanned
+        prices = [p.price for p in repo.get_range("price")]
+        assert prices == sorted(p.price for p in repo.get_all())
+
+    def test_reads_fall_back_to_the_lock(self):
+        repo = ConcurrentInMemoryRepository(Place)
+        loft = place("Loft", 80, "owner")
+        repo.add(loft)
+        # A write that never ends: every optimistic read sees an odd version
+        repo._version += 1
+        assert repo.get_by_attribute("owner_id", "owner") is loft
@@ -0,0 +1,133 @@
+import pytest
+from app.models.amenity import Amenity
+from app.models.place import Place
+from app.models.review import Review
+from app.models.user import User
+from app.persistence.repository import InMemoryRepository
+
+
+class TestInMemoryRepositoryBatch():
+    """Tests for the batch operations of InMemoryRepository"""
+
+    def test_add_all_get_many_and_count(self):
+        repo = InMemoryRepository()
+        wifi, pool, gym = Amenity("WiFi"), Amenity("Pool"), Amenity("Gym")
+        repo.add_all([wifi, pool, gym])
+
+        assert repo.count() == 3
+        assert repo.exists(pool.id)
+        assert not repo.exists("unknown")
+        # Order of the ids, unknown ids skipped, duplicates returned once
+        assert repo.get_many([gym.id, "unknown", wifi.id, gym.id]) == [gym, wifi]
+
+    def test_delete_many(self):
+        repo = InMemoryRepository()
+        wifi, pool = Amenity("WiFi"), Amenity("Pool")
+        repo.add_all([wifi, pool])
+
+        assert repo.delete_many([wifi.id, "unknown", wifi.id]) == 1
+        assert repo.get_all() == [pool]
+
+
+class TestInMemoryRepositoryIndexes():
+    """Tests for the declared indexes of InMemoryRepository"""
+
+    def place(self, title, price, owner_id="owner-1"):
+        return Place(title=title, description="", price=price, latitude=0, longitude=0,
+                     owner_id=owner_id, amenities=[])
+
+    def test_unique_index(self):
+        repo = InMemoryRepository(User)
+        john = User("John", "Smith", "john@smith.com", "G00dP455!")
+        repo.add(john)
+
+        assert repo.get_by_attribute("email", "john@smith.com") is john
+        with pytest.raises(ValueError):
+            repo.add(User("Jane", "Smith", "john@smith.com", "G00dP455!"))
+
+        repo.update(john.id, {"email": "johnny@smith.com"})
+        assert repo.get_by_attribute("email", "john@smith.com") is None
+        assert repo.get_by_attribute("email", "johnny@smith.com") is john
+
+        repo.delete(john.id)
+        assert repo.get_by_attribute("email", "johnny@smith.com") is None
+
+    def test_update_rejects_a_taken_unique_value(self):
+        repo = InMemoryRepository(User)
+        john = User("John", "Smith", "john@smith.com", "G00dP455!")
+        jane = User("Jane", "Smith", "jane@smith.com", "G00dP455!")
+        repo.add_all([john, jane])
+
+        with pytest.raises(ValueError):
+            repo.update(jane.id, {"email": "john@smith.com"})
+        assert jane.email == "jane@smith.com"
+        assert repo.get_by_attribute("email", "john@smith.com") is john
+
+    def test_multi_index(self):
+        repo = InMemoryRepository(Place)
+        loft, cabin, hut = self.place("Loft", 80), self.place("Cabin", 60), self.place("Hut", 10, "owner-2")
+        repo.add_all([loft, cabin, hut])
+
+        assert repo.get_all_by_attribute("owner_id", "owner-1") == [loft, cabin]
+        repo.update(cabin.id, {"owner_id": "owner-2"})
+        assert repo.get_all_by_attribute("owner_id", "owner-1") == [loft]
+        assert repo.get_all_by_attribute("owner_id", "owner-2") == [hut, cabin]
+        assert repo.get_all_by_attribute("owner_id", "nobody") == []
+
+    def test_range_query(self):
+        repo = InMemoryRepository(Place)
+        places = [self.place(f"Place {price}", price) for price in (50, 10, 80, 30, 30)]
+        repo.add_all(places)
+
+        assert [p.price for p in repo.get_range("price", 20, 50)] == [30, 30, 50]
+        assert [p.price for p in repo.get_range("price", low=60)] == [80]
+        assert [p.price for p in repo.get_range("price", high=10)] == [10]
+
+        repo.update(places[2].id, {"price": 20})
+        repo.delete(places[0].id)
+        assert [p.price for p in repo.get_range("price", 20, 50)] == [20, 30, 30]
+        # Not indexed: same answer from a scan
+        assert len(repo.get_range("latitude", 0, 0)) == 4
+
+    def test_dotted_attributes_and_scans_give_the_same_results(self):
+        owner = User("John", "Smith", "john@smith.com", "G00dP455!")
+        place = self.place("Loft", 80, owner.id)
+        indexed, plain = InMemoryRepository(Review), InMemoryRepository()
+        for repo in (indexed, plain):
+            repo.add(Review("Great", 5, place=place, user=owner))
+        assert len(indexed.get_all_by_attribute("place.id", place.id)) == 1
+        assert [r.text for r in plain.get_all_by_attribute("place.id", place.id)] == ["Great"]
+
+    def test_load_builds_the_same_indexes_as_add(self):
+        places = [self.place(f"Place {i}", price, f"owner-{i % 2}") for i, price in enumerate((50, 10, 80, 30))]
+        added, loaded = InMemoryRepository(Place), InMemoryRepository(Place)
+        added.add_all(places)
+        loaded.add(self.place("Replaced", 99))
+        loaded.load(places)
+
+        assert loaded.count() == 4
+        assert loaded._indexed == added._indexed
+        assert loaded._sorted == added._sorted
+        assert loaded.get_all_by_attribute("owner_id", "owner-1") == added.get_all_by_attribute("owner_id", "owner-1")
+        assert [p.price for p in loaded.get_range("price", 20, 60)] == [30, 50]
+        # Still maintained by the writes after the load
+        loaded.update(places[1].id, {"price": 40})
+        assert [p.price for p in loaded.get_range("price", 20, 60)] == [30, 40, 50]
+
+    def test_load_rejects_a_taken_unique_value(self):
+        repo = InMemoryRepository(User)
+        with pytest.raises(ValueError):
+            repo.load([User("John", "Smith", "john@smith.com", "G00dP455!"),
+                       User("Jane", "Smith", "john@smith.com", "G00dP455!")])
+
+    def test_failed_load_keeps_the_previous_content(self):
+        repo = InMemoryRepository(User)
+        kept = User("Kim", "Kept", "kim@kept.com", "G00dP455!")
+        repo.add(kept)
+        with pytest.raises(ValueError):
+            repo.load([User("John", "Smith", "john@smith.com", "G00dP455!"),
+                       User("Jane", "Smith", "john@smith.com", "G00dP455!")])
+
+        assert repo.get_all() == [kept]
+        assert repo.get_by_attribute("email", "kim@kept.com") is kept
+        assert repo.get_by_attribute("email", "john@smith.com") is None
@@ -0,0 +1,129 @@
+import os
+import pytest
+from app.models.amenity import Amenity
+from app.models.place import Place
+from app.models.review import Review
+from app.models.user import User
+from app.persistence.concurrent_repository import ConcurrentInMemoryRepository
+from app.persistence.snapshot import SNAPSHOT_FILE, SnapshotStore
+
+
+class TestSnapshotStore():
+    """Snapshots, write log and crash recovery of the in-memory repositories"""
+
+    def repositories(self):
+        return [ConcurrentInMemoryRepository(model) for model in (User, Amenity, Place, Review)]
+
+    def open_store(self, directory):
+        """A new process: empty repositories restored from the directory"""
+        repos = self.repositories()
+        store = SnapshotStore(str(directory), repos)
+        store.restore()
+        return store, dict(zip(("users", "amenities", "places", "reviews"), repos))
+
+    def fill(self, repos):
+        owner = User("Ann", "Host", "ann@host.com", "G00dP455!")
+        guest = User("Gus", "Guest", "gus@guest.com", "G00dP455!")
+        wifi = Amenity("WiFi", "Fast")
+        loft = Place("Loft", "Top floor", 80, -37.8, 144.9, owner.id, [wifi])
+        review = Review("Great", 5, place=loft, user=guest)
+        loft.add_review(review)
+        repos["users"].add_all([owner, guest])
+        repos["amenities"].add(wifi)
+        repos["places"].add(loft)
+        repos["reviews"].add(review)
+        return loft, review
+
+    def assert_restored(self, repos, loft_id, review_id):
+        loft = repos["places"].get(loft_id)
+        review = repos["reviews"].get(review_id)
+        assert (loft.title, loft.description) == ("Loft", "Top floor")
+        # References are the restored objects, not copies
+        assert review.place is loft
+        assert loft.reviews == [review]
+        assert review.user is repos["users"].get_by_attribute("email", "gus@guest.com")
+        assert [a.name for a in loft.amenities] == ["WiFi"]
+        assert loft.amenities[0] is repos["amenities"].get(loft.amenities[0].id)
+
+    def test_restores_from_the_log_alone(self, tmp_path):
+        store, repos = self.open_store(tmp_path)
+        loft, review = self.fill(repos)
+        # Crash: no snapshot, no close
+
+        _, restored = self.open_store(tmp_path)
+        self.assert_restored(restored, loft.id, review.id)
+
+    def test_restores_snapshot_and_later_writes(self, tmp_path):
+        store, repos = self.open_store(tmp_path)
+        loft, review = self.fill(repos)
+        assert store.snapshot() == 5
+        repos["places"].update(loft.id, {"price": 95})
+        cabin = Place("Cabin", "", 60, 0, 0, loft.owner_id, [])
+        repos["places"].add(cabin)
+        repos["amenities"].delete(loft.amenities[0].id)
+        store.close()
+
+        _, restored = self.open_store(tmp_path)
+        assert restored["places"].get(loft.id).price == 95.0
+        assert restored["places"].get(cabin.id).title == "Cabin"
+        assert [p.id for p in restored["places"].get_range("price", 90, 100)] == [loft.id]
+        # The deleted amenity is gone, and so is the reference to it
+        assert restored["amenities"].count() == 0
+        assert restored["places"].get(loft.id).amenities == []
+
+    def test_torn_log_record_is_dropped(self, tmp_path):
+        store, repos = self.open_store(tmp_path)
+        loft, review = self.fill(repos)
+        log = store._log.name
+        size = os.path.getsize(log)
+        # Crash in the middle of writing the last record
+        repos["places"].update(loft.id, {"price": 95})
+        with open(log, "r+b") as file:
+            file.truncate(size + 5)
+
+        _, restored = self.open_store(tmp_path)
+        self.assert_restored(restored, loft.id, review.id)
+        assert restored["places"].get(loft.id).price == 80.0
+        assert os.path.getsize(log) == size
+
+    def test_corrupted_log_record_is_dropped(self, tmp_path):
+        store, repos = self.open_store(tmp_path)
+        loft, review = self.fill(repos)
+        repos["places"].update(loft.id, {"price": 95})
+        with open(store._log.name, "r+b") as file:
+            file.seek(-1, os.SEEK_END)
+            file.write(b"\x00")
+
+        _, restored = self.open_store(tmp_path)
+        assert restored["places"].get(loft.id).price == 80.0
+
+    def test_crash_while_writing_a_snapshot(self, tmp_path):
+        store, repos = self.open_store(tmp_path)
+        loft, review = self.fill(repos)
+        store.snapshot()
+        repos["places"].update(loft.id, {"price": 95})
+        # A snapshot that never got renamed over the previous one
+        with open(tmp_path / (SNAPSHOT_FILE + ".tmp"), "wb") as file:
+            file.write(b"HBNBSNAP\x01")
+
+        _, restored = self.open_store(tmp_path)
+        self.assert_restored(restored, loft.id, review.id)
+        assert restored["places"].get(loft.id).price == 95.0
+
+    def test_crash_before_the_old_logs_are_removed(self, tmp_path, monkeypatch):
+        store, repos = self.open_store(tmp_path)
+        loft, review = self.fill(repos)
+        repos["places"].update(loft.id, {"price": 95})
+        monkeypatch.setattr(os, "remove", lambda path: None)
+        store.snapshot()
+        monkeypatch.undo()
+        repos["places"].update(loft.id, {"price": 70})
+
+        # Logs already in the snapshot are not replayed over the newer writes
+        _, restored = self.open_store(tmp_path)
+        assert restored["places"].get(loft.id).price == 70.0
+
+    def test_rejects_an_unknown_file(self, tmp_path):
+        (tmp_path / SNAPSHOT_FILE).write_bytes(b"NOTASNAPSHOT" + bytes(20))
+        with pytest.raises(ValueError):
+            self.open_store(tmp_path)
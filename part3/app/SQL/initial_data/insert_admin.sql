@@ -7,7 +7,7 @@ INSERT INTO users (
   password,
   is_admin)
 VALUES (
-  '36c9050e-ddd3-4c3b-9731-9f487208bbc1',
+  UNHEX(REPLACE('36c9050e-ddd3-4c3b-9731-9f487208bbc1', '-', '')),
   'admin@hbnb.io',
   'Admin',
   'HBnB',
@@ -16,7 +16,7 @@ VALUES (
 
 -- Inserting into amenities table
   INSERT INTO amenities (id, name) VALUES
-  ('bbb533ac-e2b4-4599-b5fd-5eaa0ff085e5', 'WiFi'),
-  ('8a3e5f01-4ef5-4fe6-8815-9ac58f9ae0d7', 'Swimming Pool'),
-  ('47fabf38-8594-4220-979b-88f5a365f809', 'Air Conditioning');
+  (UNHEX(REPLACE('bbb533ac-e2b4-4599-b5fd-5eaa0ff085e5', '-', '')), 'WiFi'),
+  (UNHEX(REPLACE('8a3e5f01-4ef5-4fe6-8815-9ac58f9ae0d7', '-', '')), 'Swimming Pool'),
+  (UNHEX(REPLACE('47fabf38-8594-4220-979b-88f5a365f809', '-', '')), 'Air Conditioning');
   
@@ -1,4 +1,4 @@
 CREATE TABLE IF NOT EXISTS amenities (
-    id CHAR(36) NOT NULL PRIMARY KEY,
+    id BINARY(16) NOT NULL PRIMARY KEY,
     name VARCHAR(255) NOT NULL UNIQUE
 )
\ No newline at end of file
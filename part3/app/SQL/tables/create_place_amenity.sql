@@ -1,8 +1,9 @@
 -- many to many relationship
 CREATE TABLE IF NOT EXISTS place_amenity (
-    place_id CHAR(36) NOT NULL,
-    amenity_id CHAR(36) NOT NULL,
+    place_id BINARY(16) NOT NULL,
+    amenity_id BINARY(16) NOT NULL,
     PRIMARY KEY (place_id, amenity_id),
+    INDEX ix_place_amenity_amenity_id (amenity_id),
     FOREIGN KEY (place_id) REFERENCES places(id) ON DELETE CASCADE,
     FOREIGN KEY (amenity_id) REFERENCES amenities(id) ON DELETE CASCADE
 );
\ No newline at end of file
@@ -1,12 +1,23 @@
 CREATE TABLE IF NOT EXISTS places (
-    id CHAR(36) NOT NULL PRIMARY KEY,
+    id BINARY(16) NOT NULL PRIMARY KEY,
     title VARCHAR(255) NOT NULL,
     description TEXT,
     price DECIMAL(10, 2),
     latitude FLOAT NOT NULL,
     longitude FLOAT NOT NULL,
-    owner_id CHAR(36) NOT NULL,
-    FOREIGN KEY (owner_id) REFERENCES users(id) ON DELETE CASCADE
+    owner_id BINARY(16) NOT NULL,
+    geohash VARCHAR(9),
+    review_count INT NOT NULL DEFAULT 0,
+    rating_sum INT NOT NULL DEFAULT 0,
+    rating_avg FLOAT NOT NULL DEFAULT 0,
+    created_at DATETIME,
+    updated_at DATETIME,
+    FOREIGN KEY (owner_id) REFERENCES users(id) ON DELETE CASCADE,
+    INDEX ix_places_owner_id (owner_id),
+    INDEX ix_places_geohash (geohash),
+    INDEX ix_places_review_count (review_count),
+    INDEX ix_places_rating_avg_review_count (rating_avg, review_count),
+    INDEX ix_places_created_at_id (created_at, id)
     );
 
 -- if you put ON DELETE SET NULL, this will keep the place id and set it to null
@@ -1,10 +1,12 @@
 CREATE TABLE IF NOT EXISTS reviews (
-    id CHAR(36) NOT NULL PRIMARY KEY,
+    id BINARY(16) NOT NULL PRIMARY KEY,
     text TEXT,
     rating INT CHECK (rating BETWEEN 1 AND 5),
-    user_id CHAR(36) NOT NULL,
-    place_id CHAR(36) NOT NULL,
+    user_id BINARY(16) NOT NULL,
+    place_id BINARY(16) NOT NULL,
     FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
     FOREIGN KEY (place_id) REFERENCES places(id) ON DELETE CASCADE,
-    CONSTRAINT unique_review UNIQUE (user_id, place_id)
+    CONSTRAINT unique_review UNIQUE (user_id, place_id),
+    INDEX ix_reviews_place_id (place_id),
+    INDEX ix_reviews_rating (rating)
 );
\ No newline at end of file
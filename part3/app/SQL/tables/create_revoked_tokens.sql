@@ -0,0 +1,9 @@
+CREATE TABLE IF NOT EXISTS revoked_tokens(
+  jti BINARY(16) NOT NULL,
+  kind VARCHAR(10) NOT NULL,
+  expires_at DATETIME NOT NULL,
+  revoked_at DATETIME NOT NULL,
+  PRIMARY KEY (jti),
+  INDEX ix_revoked_tokens_expires_at (expires_at),
+  INDEX ix_revoked_tokens_revoked_at (revoked_at)
+);
@@ -1,5 +1,5 @@
 CREATE TABLE IF NOT EXISTS users(
-  id CHAR(36) NOT NULL,
+  id BINARY(16) NOT NULL,
   first_name VARCHAR(255) NOT NULL,
   last_name VARCHAR(255) NOT NULL,
   email VARCHAR(255) NOT NULL,
@@ -2,9 +2,11 @@ from flask import Flask
 from flask_restx import Api
 from flask_sqlalchemy import SQLAlchemy
 from flask_cors import CORS
-from datetime import timedelta
-from part3.app.extensions import db, bcrypt, jwt
+from part3.app.extensions import db, jwt, metrics, passwords
 from part3.app.config import config
+from part3.app.services import ids
+from part3.app.services.passwords import HasherBusy
+from part3.app.persistence import backends
 
 def create_app(config_name="development"):
     app = Flask(__name__)
@@ -20,38 +22,80 @@ def create_app(config_name="development"):
     # Apply configuration to the app
     app.config.from_object(config[config_name])
 
+    # Debug output of the app's modules (part3.app.*), see LOG_LEVEL
+    app.logger.setLevel(app.config['LOG_LEVEL'])
+
     # Config JWT Specific Settings
     app.config["JWT_SECRET_KEY"] = app.config.get("SECRET_KEY", "default-jwt-key")
     # default-jwt-key is the "fall back key if no SECRET KEY is present"
-    app.config["JWT_ACCESS_TOKEN_EXPIRES"] = timedelta(hours=24)
+    # Token lifetimes: JWT_ACCESS_TOKEN_EXPIRES / JWT_REFRESH_TOKEN_EXPIRES of the config
+
+
+    # Primary keys of the rows created from now on
+    ids.set_strategy(app.config['ID_STRATEGY'])
 
+    # Database of the configured persistence backend
+    backends.configure(app)
 
     # Initialize extensions with the app
     db.init_app(app)
-    bcrypt.init_app(app)
+    passwords.init_app(app)
     jwt.init_app(app)
+    metrics.init_app(app)
 
     with app.app_context():
+        from sqlalchemy import inspect
+        # A database with no table yet gets the current schema from create_all()
+        new_database = not inspect(db.engine).get_table_names()
+
         from part3.app.models.place import Place
         from part3.app.models.user import User
         from part3.app.models.amenity import Amenity
         from part3.app.models.review import Review
+        from part3.app.models.revoked_token import RevokedToken
         db.create_all()
 
+        # create_all() never changes existing tables, `flask migrate` brings
+        # older databases up to date (never here: every worker would run it)
+        from part3.app.persistence.migrations import pending
+        missing = [] if new_database else pending(db.engine)
+        if missing:
+            app.logger.warning("Schema migrations pending, run `flask migrate`: %s", ", ".join(missing))
+
+    # The facade now serves this app: its backend, empty caches
+    from part3.app.services.facade import facade
+    facade.init_app(app)
+
+    @jwt.token_in_blocklist_loader
+    def session_revoked(jwt_header, jwt_payload):
+        """Tokens of a logged out session, or of one whose refresh token was replayed"""
+        return facade.is_session_revoked(jwt_payload)
+
     # Import namespaces after app is created to avoid circular imports
     from part3.app.api.v1.users import api as users_ns
     from part3.app.api.v1.amenities import api as amenities_ns
     from part3.app.api.v1.reviews import api as reviews_ns
     from part3.app.api.v1.places import api as places_ns
     from part3.app.api.v1.auth import api as auth_ns
+    from part3.app.api.v1.metrics import api as metrics_ns
 
     api = Api(app, version=1.0, title='HBnB API', description='HBnb Application API')
 
+    @api.errorhandler(HasherBusy)
+    def hasher_busy(error):
+        """Every password hashing slot is taken (login burst), shed the request"""
+        return {'error': str(error)}, 503, {'Retry-After': '1'}
+
     # Register the namespaces
     api.add_namespace(users_ns, path='/api/v1/users')
     api.add_namespace(amenities_ns, path='/api/v1/amenities')
     api.add_namespace(reviews_ns, path='/api/v1/reviews')
     api.add_namespace(places_ns, path='/api/v1/places')
     api.add_namespace(auth_ns, path='/api/v1/auth')
+    api.add_namespace(metrics_ns, path='/api/v1/metrics')
+
+    # Maintenance commands (flask --app run <command>)
+    from part3.app.commands import register_commands
+    register_commands(app)
 
     return app
@@ -107,20 +107,14 @@ class AmenityResource(Resource):
             404 not found: If the amenity with the given ID doesn't exit
         """
 
-        # Use the facade to get the amenity by ID
-        amenity = facade.get_amenity(amenity_id)
+        # Use the facade to get the (cached) amenity data by ID
+        amenity = facade.get_amenity_data(amenity_id)
 
         if not amenity:
             return {'error': 'Amenity not found'}, 404
 
         # Return the amenity data with status code
-        return {
-            'id': amenity.id,
-            'name': amenity.name,
-            'description': amenity.description,
-            'created_at': amenity.created_at,
-            'updated_at': amenity.updated_at
-        }, 200
+        return amenity, 200
 
     @api.expect(amenity_model, validate=True)
     @api.response(200,'Amenity Updated Successfully')
@@ -1,8 +1,8 @@
 from flask import request, jsonify
 from flask_restx import Namespace, Resource, fields
-from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity, get_jwt
+from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
 from part3.app.services.facade import facade
-from part3.app.extensions import bcrypt
+from part3.app.services.passwords import HasherBusy
 
 api = Namespace('auth', description='Authentication operations')
 
@@ -14,6 +14,7 @@ login_model = api.model('Login', {
 # Model for Token Response when created
 token_model = api.model('Token', {
     'access_token': fields.String(description='JWT access token'),
+    'refresh_token': fields.String(description='JWT refresh token, exchanged once at /auth/refresh'),
     'user_id': fields.String(description='User ID')
 })
 
@@ -23,6 +24,7 @@ class Login(Resource):
     @api.expect(login_model)
     @api.response(200,'Login Successful', token_model)
     @api.response(401,'Authentication failed')
+    @api.response(503,'Too many logins in progress')
     def post(self):
         """Login to get JWT Token
         Created and stored on client machine"""
@@ -33,25 +35,54 @@ class Login(Resource):
         user = facade.get_user_by_email(data.get('email'))
 
         # Check if user exists and password is correct
-        if user and user.verify_password(data.get('password')):
+        # Answered here rather than by the API error handler, which logs every 5xx:
+        # a login burst would fill the log with tracebacks
+        try:
+            verified = user is not None and user.verify_password(data.get('password'))
+        except HasherBusy as error:
+            return {'error': str(error)}, 503, {'Retry-After': '1'}
+
+        if verified:
+            # Hashed with another bcrypt cost than the current one: store a new hash
+            facade.rehash_password(user, data.get('password'))
 
         # Create token with user identity and admin credentials
         # Admin status in token allows verification of admin privileges
             # >> Having the credentials and status in the token means that
             #   no query is needed or made to the database
             #   for each protected endpoint
-            access_token = create_access_token(
-                identity=user.id,
-                additional_claims={"is_admin": user.is_admin}
-            )
-            return {
-                'access_token': access_token,
-                'user_id': user.id
-            }, 200
+            # The refresh token renews them without another password check
+            return facade.issue_tokens(user), 200
 
         return {'error': 'Invalid email or password'}, 401
 
 
+@api.route('/refresh')
+class Refresh(Resource):
+    """New tokens for a refresh token, without the password"""
+    @api.response(200, 'Tokens renewed', token_model)
+    @api.response(401, 'Refresh token expired, revoked or already used')
+    @jwt_required(refresh=True)
+    def post(self):
+        """Exchange the refresh token (Authorization header) for a new access and refresh token
+        The refresh token works once: presenting it again logs out its session"""
+        tokens = facade.refresh_tokens(get_jwt())
+        if tokens is None:
+            return {'error': 'Refresh token already used, session revoked'}, 401
+        return tokens, 200
+
+
+@api.route('/logout')
+class Logout(Resource):
+    """End the session of a token"""
+    @api.response(200, 'Logged out')
+    @jwt_required(verify_type=False)
+    def post(self):
+        """Revoke the session of the access or refresh token: none of its tokens work anymore"""
+        facade.revoke_session(get_jwt())
+        return {'message': 'Logged out'}, 200
+
+
 # Check if user is an admin or not (boolean)
 # Utility Function (Decorator)
 # Remember: >> 'jwt_required() does the authentication
@@ -80,3 +111,30 @@ def admin_required():
             return fn(*args, **kwargs)
         return decorator
     return wrapper
+
+
+def current_caller():
+    """
+    Who is calling a @jwt_required() endpoint, from the verified claims of its token (no query)
+
+    Returns: tuple (user ID, is_admin)
+    """
+    claims = get_jwt()
+    return get_jwt_identity(), claims.get('is_admin', False)
+
+
+def check_place_owner(place_id):
+    """
+    Ownership check of the place endpoints: the caller must own the place or be an admin
+
+    Reads the owner_id column of the place only, one primary key lookup whatever the size of the place.
+
+    Returns: None if allowed, otherwise the error response (404 or 403)
+    """
+    user_id, is_admin = current_caller()
+    owner_id = facade.get_place_owner_id(place_id)
+    if owner_id is None:
+        return {"error": "Place not found"}, 404
+    if not is_admin and owner_id != user_id:
+        return {"error": "Unauthorized action - not the place owner"}, 403
+    return None
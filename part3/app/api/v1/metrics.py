@@ -0,0 +1,17 @@
+from flask import Response
+from flask_restx import Namespace, Resource
+from part3.app.api.v1.auth import admin_required
+from part3.app.extensions import metrics
+from part3.app.services.metrics import CONTENT_TYPE
+
+api = Namespace('metrics', description='Monitoring')
+
+
+@api.route('/')
+class MetricsResource(Resource):
+    @api.response(200, 'Metrics in the Prometheus text format')
+    @api.response(403, 'Admin privilege required')
+    @admin_required()
+    def get(self):
+        """Request latency, SQL statement and response size metrics per endpoint (Admin only)"""
+        return Response(metrics.render(), content_type=CONTENT_TYPE)
@@ -1,6 +1,8 @@
-from flask_restx import Namespace, Resource, fields
-from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
+from flask import request
+from flask_restx import Namespace, Resource, fields, reqparse
+from flask_jwt_extended import jwt_required, get_jwt_identity
 from part3.app.services.facade import facade
+from part3.app.api.v1.auth import admin_required, check_place_owner, current_caller
 
 api = Namespace('places', description='Place operations')
 
@@ -14,6 +16,43 @@ place_model = api.model('Place', {
     'amenities': fields.List(fields.String(), required=True, description="List of amenities ID's")   
 })
 
+# Query parameters for the server side listing mode of GET /places
+# e.g. /places?limit=20&min_price=50&amenity_id=<id>&amenity_id=<id>&cursor=<next_cursor>
+list_parser = reqparse.RequestParser()
+list_parser.add_argument('limit', type=int, location='args', help='Page size (max 100)')
+list_parser.add_argument('cursor', location='args', help='next_cursor from the previous page')
+list_parser.add_argument('min_price', type=float, location='args')
+list_parser.add_argument('max_price', type=float, location='args')
+list_parser.add_argument('amenity_id', action='append', location='args')
+list_parser.add_argument('owner_id', location='args')
+
+featured_parser = reqparse.RequestParser()
+featured_parser.add_argument('category', default='new', location='args',
+                             help="'new', 'top-rated', 'popular' or 'unique'")
+featured_parser.add_argument('limit', type=int, default=6, location='args')
+
+search_parser = reqparse.RequestParser()
+search_parser.add_argument('q', required=True, location='args', help='Search words')
+search_parser.add_argument('page', type=int, default=1, location='args')
+search_parser.add_argument('per_page', type=int, default=20, location='args')
+
+bulk_parser = reqparse.RequestParser()
+bulk_parser.add_argument('batch_size', type=int, default=1000, location='args',
+                         help='Lines written per transaction (max 10000)')
+
+bbox_parser = reqparse.RequestParser()
+bbox_parser.add_argument('min_lat', type=float, required=True, location='args')
+bbox_parser.add_argument('min_lng', type=float, required=True, location='args')
+bbox_parser.add_argument('max_lat', type=float, required=True, location='args')
+bbox_parser.add_argument('max_lng', type=float, required=True, location='args')
+bbox_parser.add_argument('limit', type=int, location='args')
+
+nearby_parser = reqparse.RequestParser()
+nearby_parser.add_argument('lat', type=float, required=True, location='args')
+nearby_parser.add_argument('lng', type=float, required=True, location='args')
+nearby_parser.add_argument('radius_km', type=float, default=10, location='args')
+nearby_parser.add_argument('limit', type=int, default=20, location='args')
+
 @api.route('/')
 class PlaceList(Resource):
     @api.expect(place_model)
@@ -23,9 +62,7 @@ class PlaceList(Resource):
     @jwt_required()
     def post(self):
         """Creates a new place Authenticated users only"""
-        current_user_id = get_jwt_identity()
-        claims = get_jwt()
-        is_admin = claims.get('is_admin, False')
+        current_user_id, is_admin = current_caller()
 
         place_data = api.payload
 
@@ -43,12 +80,105 @@ class PlaceList(Resource):
         except ValueError:
             return {"error": "Invalid input data"}, 400
     
+    @api.expect(list_parser)
     @api.response(200, 'List of places retrieved successfully')
+    @api.response(400, 'Invalid cursor')
     def get(self):
-        """Retrieves a list of all places"""
-        all_places = facade.get_all_places()
-        return all_places, 200
+        """Retrieves a list of all places, or one filtered page when query parameters are given"""
+        args = {k: v for (k, v) in list_parser.parse_args().items() if v is not None}
+
+        # No parameters keeps the original behaviour (every place, fully serialized)
+        if args == {}:
+            all_places = facade.get_all_places()
+            return all_places, 200
+
+        try:
+            page = facade.get_places_page(
+                limit=args.get('limit', 20),
+                cursor=args.get('cursor'),
+                min_price=args.get('min_price'),
+                max_price=args.get('max_price'),
+                amenity_ids=args.get('amenity_id'),
+                owner_id=args.get('owner_id')
+            )
+        except ValueError:
+            return {"error": "Invalid cursor"}, 400
+        return page, 200
     
+@api.route('/bulk')
+class PlaceBulkImport(Resource):
+    @api.expect(bulk_parser)
+    @api.response(200, 'Import finished, see the report for rejected rows')
+    @api.response(400, 'Invalid batch size')
+    @api.response(403, 'Admin privileges required')
+    @admin_required()
+    def post(self):
+        """
+        Bulk import amenities, places and reviews (Admin only)
+
+        The body is NDJSON, one {"type": "amenity" | "place" | "review", ...} object
+        per line. Places without an owner_id belong to the calling admin.
+        """
+        args = bulk_parser.parse_args()
+        if not 1 <= args['batch_size'] <= 10000:
+            return {'error': 'batch_size must be between 1 and 10000'}, 400
+
+        report = facade.bulk_import(request.stream, default_owner_id=get_jwt_identity(),
+                                    batch_size=args['batch_size'])
+        return report, 200
+
+@api.route('/featured')
+class FeaturedPlaceList(Resource):
+    @api.expect(featured_parser)
+    @api.response(200, 'Featured places retrieved successfully')
+    @api.response(400, 'Unknown category')
+    def get(self):
+        """Featured places for the home page carousel, sorted server side"""
+        args = featured_parser.parse_args()
+        try:
+            places = facade.get_featured_places(args['category'], args['limit'])
+        except ValueError as e:
+            return {"error": str(e)}, 400
+        return places, 200
+
+@api.route('/search')
+class PlaceSearch(Resource):
+    @api.expect(search_parser)
+    @api.response(200, 'Search results retrieved successfully')
+    def get(self):
+        """Full-text search over place titles and descriptions, best match first"""
+        args = search_parser.parse_args()
+        return facade.search_places(args['q'], args['page'], args['per_page']), 200
+
+@api.route('/bbox')
+class PlaceBoundingBoxList(Resource):
+    @api.expect(bbox_parser)
+    @api.response(200, 'Places in the box retrieved successfully')
+    @api.response(400, 'Invalid bounding box')
+    def get(self):
+        """Places inside a map viewport (min_lng > max_lng crosses the antimeridian)"""
+        args = bbox_parser.parse_args()
+        try:
+            places = facade.get_places_in_bbox(args['min_lat'], args['min_lng'],
+                                               args['max_lat'], args['max_lng'], args['limit'])
+        except ValueError as e:
+            return {"error": str(e)}, 400
+        return places, 200
+
+@api.route('/nearby')
+class PlaceNearbyList(Resource):
+    @api.expect(nearby_parser)
+    @api.response(200, 'Nearby places retrieved successfully')
+    @api.response(400, 'Invalid coordinates, radius or limit')
+    def get(self):
+        """Places within radius_km of a point, closest first"""
+        args = nearby_parser.parse_args()
+        try:
+            places = facade.get_places_nearby(args['lat'], args['lng'], args['radius_km'], args['limit'])
+        except ValueError as e:
+            return {"error": str(e)}, 400
+        return places, 200
+
 @api.route('/<place_id>')
 class PlaceResource(Resource):
     @api.response(200, 'Place details retrieved successfully')
@@ -58,7 +188,7 @@ class PlaceResource(Resource):
         place = facade.get_place(place_id)
         if place is None:
             return {"error": "Place not found"}, 404
-        place.update({'owner': facade.get_user(place['owner_id']).serialized})
+        place.update({'owner': facade.get_user_data(place['owner_id'])})
         return place, 200
     
     @api.expect(place_model)
@@ -70,16 +200,11 @@ class PlaceResource(Resource):
     def put(self, place_id):
         """Update a place's information (For owner or admin only)"""
         # Get ID and admin status (JWT) > Get place > Check if user is_admin > Update info
-        current_user_id = get_jwt_identity()
-        claims = get_jwt()
-        is_admin = claims.get('is_admin', False)
+        current_user_id, is_admin = current_caller()
 
-        place = facade.get_place(place_id)
-        if place is None:
-            return {"error": "Place not found"}, 404
-        
-        if not is_admin and place.get('owner_id') != current_user_id:
-            return {"error": "Unauthorized action - not the place owner"}, 403
+        denied = check_place_owner(place_id)
+        if denied:
+            return denied
 
         place_new_data = api.payload
 
@@ -99,16 +224,9 @@ class PlaceResource(Resource):
     @jwt_required()
     def delete(self, place_id):
         """Delete a place (Owner or admin only)"""
-        current_user_id = get_jwt_identity()
-        claims = get_jwt()
-        is_admin = claims.get('is_admin', False)
-
-        place = facade.get_place(place_id)
-        if place is None:
-            return {"error": "Place not found"}, 404
-
-        if not is_admin and place.get('owner_id') != current_user_id:
-            return {"error": "Unauthorized action - not the place owner"}, 403
+        denied = check_place_owner(place_id)
+        if denied:
+            return denied
 
         success = facade.delete_place(place_id)
         if not success:
@@ -143,16 +261,9 @@ class PlaceAmenityResource(Resource):
     def post(self, place_id):
         """Add an amenity to a place (Owner and Admin Only)"""
         # Do the JWT checks first
-        current_user_id = get_jwt_identity()
-        claims = get_jwt()
-        is_admin = claims.get('is_admin', False)
-
-        place_obj = facade.get_place(place_id)
-        if not place_obj:
-            return  {'error': 'Place not found'}, 404
-        
-        if not is_admin and place_obj.get('owner_id') != current_user_id:
-            return {"error": "Unauthorized action - not the place owner"}, 403
+        denied = check_place_owner(place_id)
+        if denied:
+            return denied
 
         # Extract amenity ID from the request body
         amenity_id = api.payload.get('amenity_id')
@@ -1,6 +1,7 @@
 from flask_restx import Namespace, Resource, fields
-from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
+from flask_jwt_extended import jwt_required
 from part3.app.services.facade import facade
+from part3.app.api.v1.auth import current_caller
 
 # Create a namespace for reviews-related endpoints
 # Easier to read and identify the page / endpoint
@@ -60,9 +61,7 @@ class ReviewList(Resource):
             400 Bad Request: If input validation fails
         """
         # Always get JWT status
-        current_user_id = get_jwt_identity()
-        claims = get_jwt()
-        is_admin = claims.get('is_admin', False)
+        current_user_id, is_admin = current_caller()
 
         # Extract data from the request payload
         review_data = api.payload
@@ -76,12 +75,12 @@ class ReviewList(Resource):
 
         # See the place being reviewed and make sure the owner isn't reviewing their own place.
         place_id = review_data.get('place_id')
-        place = facade.get_place(place_id)
+        owner_id = facade.get_place_owner_id(place_id)
 
-        if not place:
+        if owner_id is None:
             return {'error': 'Place not found'}, 404
 
-        if not is_admin and place.get('owner_id') == current_user_id:
+        if not is_admin and owner_id == current_user_id:
             return {'error': 'You cannot review your own place'}, 400
 
         if not is_admin and facade.has_user_reviewed_place(current_user_id, place_id):
@@ -179,18 +178,17 @@ class ReviewResource(Resource):
             400 Bad request: If input validation fails
         """
 
-        current_user_id = get_jwt_identity()
-        claims = get_jwt()
-        is_admin = claims.get('is_admin', False)
+        current_user_id, is_admin = current_caller()
 
         # Check if review exists
-        review = facade.get_review(review_id)
-        if not review:
+        author = facade.get_review_author(review_id)
+        if author is None:
             return {'error': 'review doesn\'t exist'}, 404
+        author_id, reviewed_place_id = author
 
         # Need to check if the review is the original writer (author) or has admin priv's
         # Non-admins cannot edit the review and or info
-        if not is_admin and review.user_id != current_user_id:
+        if not is_admin and author_id != current_user_id:
             return {'error': 'Unauthorized action - not the review creator'}, 403
 
         # Extract the updated data from the request
@@ -199,7 +197,7 @@ class ReviewResource(Resource):
         if not is_admin:
             if 'user_id' in update_data and update_data['user_id'] != current_user_id:
                 return {'error': 'Unauthorized action - cannot change review author'}, 403
-            if 'place_id' in update_data and update_data['place_id'] != review.get('place_id'):
+            if 'place_id' in update_data and update_data['place_id'] != reviewed_place_id:
                 return {'error': 'Unauthorized action - cannot change reviewed place'}, 403
 
         try:
@@ -209,8 +207,8 @@ class ReviewResource(Resource):
             # If update successful, return the updated data
             return {
                 'id': updated_review.id,
-                'created_at': updated_review.created_at,
-                'updated_at': updated_review.updated_at,
+                'created_at': str(updated_review.created_at),
+                'updated_at': str(updated_review.updated_at),
                 'text': updated_review.text,
                 'rating': updated_review.rating,
                 'place_id': updated_review.place.id,
@@ -242,15 +240,13 @@ class ReviewResource(Resource):
             404 Not Found: If the review ID doesn't exist.
         """
         
-        current_user_id = get_jwt_identity()
-        claims = get_jwt()
-        is_admin = claims.get('is_admin', False)
+        current_user_id, is_admin = current_caller()
 
-        review = facade.get_review(review_id)
-        if not review:
+        author = facade.get_review_author(review_id)
+        if author is None:
             return {'error': 'Review not found'}, 404
         # You need to check if the review that is getting deleted is the OG writer or Admin Only
-        if not is_admin and review.user_id != current_user_id:
+        if not is_admin and author[0] != current_user_id:
             return {'error': 'Unauthorized action - not the review author'}, 403
 
         # Use facade to delete the review
@@ -0,0 +1,102 @@
+"""
+Authorization overhead of a protected endpoint, per request.
+
+Times what PUT/DELETE /api/v1/places/<id> do before their actual work:
+verify the JWT of the request, then check the caller owns the place.
+Two ways, for places with more and more reviews:
+
+    full   every request verifies its token, and loads and serializes
+           the place to read its owner_id (the place cache is cold, as
+           after any write to places)
+    light  the claims of a token already verified are reused, and the
+           owner_id column alone is read by primary key
+
+Prints the mean microseconds per check and the claims cache hit rate.
+
+Usage (from the repository root):
+    python -m part3.app.benchmarks.bench_auth --requests 2000 --reviews 0 10 100 1000
+"""
+import argparse
+import time
+from flask_jwt_extended import verify_jwt_in_request
+from part3.app import create_app, db
+from part3.app.api.v1.auth import check_place_owner, current_caller
+from part3.app.config import TestingConfig, config
+from part3.app.extensions import jwt
+from part3.app.models.place import Place
+from part3.app.models.review import Review
+from part3.app.models.user import User
+from part3.app.services.facade import facade
+
+
+def add_place(reviews):
+    """A place with reviews reviews (one reviewer each), returns (place id, owner)"""
+    owner = User("Bench", "Owner", f"owner{reviews}@bench.io", "B3nchmark!")
+    db.session.add(owner)
+    db.session.commit()
+    place = Place(f"Place {reviews}", "Benchmark", 100, 10.0, 20.0, owner.id, [])
+    db.session.add(place)
+    db.session.commit()
+    for i in range(reviews):
+        reviewer = User("Bench", "Reviewer", f"r{i}.{reviews}@bench.io", "B3nchmark!")
+        db.session.add(reviewer)
+        db.session.flush()
+        db.session.add(Review("Benchmark review", 1 + i % 5, place_id=place.id, user_id=reviewer.id))
+    db.session.commit()
+    return place.id, owner
+
+
+def full_check(place_id):
+    jwt.claims_cache.clear()
+    facade.place_cache.clear()
+    verify_jwt_in_request()
+    user_id, is_admin = current_caller()
+    place = facade.get_place(place_id)
+    assert is_admin or place['owner_id'] == user_id
+
+
+def light_check(place_id):
+    verify_jwt_in_request()
+    assert check_place_owner(place_id) is None
+
+
+def time_checks(app, check, place_id, token, requests):
+    """Mean microseconds of check over requests requests, each in its own request context"""
+    headers = {'Authorization': f'Bearer {token}'}
+    elapsed = 0.0
+    for _ in range(requests):
+        with app.test_request_context(f'/api/v1/places/{place_id}', method='PUT', headers=headers):
+            started = time.perf_counter()
+            check(place_id)
+            elapsed += time.perf_counter() - started
+    return elapsed / requests * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--reviews', type=int, nargs='+', default=[0, 10, 100, 1000], help='Reviews per place')
+    args = parser.parse_args()
+
+    config['benchmark'] = type('BenchmarkConfig', (TestingConfig,), {
+        'SECRET_KEY': 'benchmark-secret-key-of-32-bytes-at-least',
+    })
+    app = create_app('benchmark')
+    print(f"{'reviews':>8} {'full us':>9} {'light us':>9} {'cache hits':>11}")
+    for reviews in args.reviews:
+        with app.app_context():
+            place_id, owner = add_place(reviews)
+            token = facade.issue_tokens(owner)['access_token']
+            db.session.remove()
+
+        # Outside of an app context: each request gets its own, like when served
+        full = time_checks(app, full_check, place_id, token, args.requests)
+        before = jwt.claims_cache.stats()
+        light = time_checks(app, light_check, place_id, token, args.requests)
+        after = jwt.claims_cache.stats()
+        hits = (after['hits'] - before['hits']) / (after['hits'] + after['misses'] - before['hits'] - before['misses'])
+        print(f"{reviews:>8} {full:>9.1f} {light:>9.1f} {hits:>10.1%}")
+
+
+if __name__ == '__main__':
+    main()
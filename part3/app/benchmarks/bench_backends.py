@@ -0,0 +1,106 @@
+"""
+Persistence backend benchmark: the same API workload on every backend.
+
+For each backend (see persistence.backends) it creates an app, then goes
+through the HTTP API with the Flask test client: N places created, each
+fetched by id, the listing paged through 20 at a time, then N reviews
+written. It prints the requests per second of each step, so the backends
+can be compared on what a deployment actually serves.
+
+The sqlite backend writes to a temporary file. The mysql backend uses
+MYSQL_URL and is skipped when no server answers there; its tables are
+dropped at the end, point it at a scratch database.
+
+Usage (from the repository root):
+    python -m part3.app.benchmarks.bench_backends --backends sqlite-memory sqlite mysql --places 1000
+"""
+import argparse
+import os
+import tempfile
+import time
+import uuid
+from flask_jwt_extended import create_access_token
+from sqlalchemy.exc import OperationalError
+from part3.app import create_app, db
+from part3.app.config import TestingConfig, config
+from part3.app.models.user import User
+
+
+def timed(requests):
+    """Requests per second of a list of callables each sending a request"""
+    started = time.perf_counter()
+    for request in requests:
+        response = request()
+        assert response.status_code in (200, 201), response.json
+    return len(requests) / (time.perf_counter() - started)
+
+
+def run(app, count):
+    client = app.test_client()
+    with app.app_context():
+        users = [User("Bench", "User", f"{uuid.uuid4()}@bench.io", "B3nchmark!") for _ in range(count + 1)]
+        db.session.add_all(users)
+        db.session.commit()
+        tokens = [{'Authorization': f"Bearer {create_access_token(identity=user.id)}"} for user in users]
+
+    owner = tokens[0]
+    places = []
+
+    def create_place(i):
+        response = client.post('/api/v1/places/', headers=owner, json={
+            'title': f'Bench place {i}', 'description': 'Benchmark', 'price': 10 + i % 500,
+            'latitude': 45.5, 'longitude': -73.5, 'amenities': []})
+        places.append(response.json['id'])
+        return response
+
+    cursor = None
+
+    def next_page():
+        nonlocal cursor
+        response = client.get('/api/v1/places/', query_string={'limit': 20, **({'cursor': cursor} if cursor else {})})
+        cursor = response.json['next_cursor']
+        return response
+
+    results = {}
+    results['create place'] = timed([lambda i=i: create_place(i) for i in range(count)])
+    results['get place'] = timed([lambda place_id=place_id: client.get(f'/api/v1/places/{place_id}')
+                                  for place_id in places])
+    results['list page'] = timed([next_page] * -(-count // 20))
+    results['create review'] = timed([
+        lambda i=i: client.post('/api/v1/reviews/', headers=tokens[i + 1],
+                                json={'text': 'Benchmark', 'rating': 1 + i % 5, 'place_id': places[i]})
+        for i in range(count)])
+
+    with app.app_context():
+        db.session.remove()
+        db.drop_all()
+        db.engine.dispose()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--backends', nargs='+', default=['sqlite-memory', 'sqlite'])
+    parser.add_argument('--places', type=int, default=500)
+    args = parser.parse_args()
+
+    print(f"{'backend':>13} {'create place/s':>15} {'get place/s':>12} {'list page/s':>12} {'create review/s':>16}")
+    with tempfile.TemporaryDirectory() as directory:
+        for backend in args.backends:
+            config['benchmark'] = type('BenchmarkConfig', (TestingConfig,), {
+                'PERSISTENCE_BACKEND': backend,
+                'SECRET_KEY': 'benchmark-secret-key-of-32-bytes-at-least',
+                'SQLITE_PATH': os.path.join(directory, f'{backend}.db')
+            })
+            try:
+                app = create_app('benchmark')
+            except (OperationalError, ImportError) as err:
+                print(f"{backend:>13} unavailable: {err.__class__.__name__}")
+                continue
+            results = run(app, args.places)
+            print(f"{backend:>13} {results['create place']:>15.0f} {results['get place']:>12.0f} "
+                  f"{results['list page']:>12.0f} {results['create review']:>16.0f}")
+
+
+if __name__ == '__main__':
+    main()
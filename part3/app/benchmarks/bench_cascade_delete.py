@@ -0,0 +1,99 @@
+"""
+Cascading delete benchmark: deleting a host with 1k places x 50 reviews.
+
+Compares facade.delete_user (ON DELETE CASCADE, passive_deletes: the
+database removes the places, reviews and amenity links) with the ORM
+cascade it replaces, where every place and review is loaded into the
+session and deleted row by row.
+
+Usage (from the repository root):
+    python -m part3.app.benchmarks.bench_cascade_delete --places 1000 --reviews 50
+"""
+import argparse
+import random
+import time
+import uuid
+from datetime import datetime, timezone
+from sqlalchemy import event, insert
+from sqlalchemy.orm import selectinload
+from part3.app import create_app, db
+from part3.app.models.amenity import Amenity
+from part3.app.models.place import Place, place_amenity
+from part3.app.models.review import Review
+from part3.app.models.user import User
+from part3.app.services.facade import facade
+
+
+def fill(places, reviews, rng):
+    """A host owning `places` places, each reviewed by `reviews` guests. Returns the host id"""
+    now = datetime.now(timezone.utc)
+    host = User("Bench", "Host", f"{uuid.uuid4()}@bench.io", "B3nchmark!")
+    guests = [User("Bench", "Guest", f"{uuid.uuid4()}@bench.io", "B3nchmark!") for _ in range(reviews)]
+    amenities = [Amenity(f"Amenity {i}") for i in range(5)]
+    db.session.add_all([host, *guests, *amenities])
+    db.session.commit()
+
+    place_rows, link_rows, review_rows = [], [], []
+    for i in range(places):
+        place_id = str(uuid.uuid4())
+        place_rows.append({
+            'id': place_id, 'title': f'Place {i}', 'description': '', 'price': 100.0, 'latitude': 0.0,
+            'longitude': 0.0, 'geohash': 's00000000', 'owner_id': host.id, 'review_count': reviews,
+            'rating_sum': 0, 'rating_avg': 0.0, 'created_at': now, 'updated_at': now
+        })
+        link_rows.extend({'place_id': place_id, 'amenity_id': a.id} for a in amenities[:2])
+        review_rows.extend({
+            'id': str(uuid.uuid4()), 'text': 'Bench review', 'rating': rng.randint(1, 5), 'place_id': place_id,
+            'user_id': guest.id, 'created_at': now, 'updated_at': now
+        } for guest in guests)
+    db.session.execute(insert(Place.__table__), place_rows)
+    db.session.execute(insert(place_amenity), link_rows)
+    db.session.execute(insert(Review.__table__), review_rows)
+    db.session.commit()
+    return host.id
+
+
+def orm_cascade_delete(user_id):
+    """The previous behaviour: load every place and review, delete them one by one"""
+    user = db.session.get(User, user_id)
+    places = Place.query.options(selectinload(Place.reviews), selectinload(Place.amenities)) \
+        .filter(Place.owner_id == user_id).all()
+    for place in places:
+        for review in place.reviews:
+            db.session.delete(review)
+        place.amenities = []
+        db.session.delete(place)
+    db.session.delete(user)
+    db.session.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--places', type=int, default=1000)
+    parser.add_argument('--reviews', type=int, default=50, help='Reviews per place')
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    print(f"{'strategy':>14} {'statements':>11} {'ms':>9}")
+    for name, delete in (('orm cascade', orm_cascade_delete), ('db cascade', facade.delete_user)):
+        app = create_app('testing')
+        with app.app_context():
+            host_id = fill(args.places, args.reviews, rng)
+            db.session.expunge_all()
+
+            statements = []
+            record = lambda *_: statements.append(1)
+            event.listen(db.engine, 'before_cursor_execute', record)
+            started = time.perf_counter()
+            delete(host_id)
+            elapsed = (time.perf_counter() - started) * 1000
+            event.remove(db.engine, 'before_cursor_execute', record)
+
+            assert Place.query.count() == 0 and Review.query.count() == 0
+            print(f"{name:>14} {len(statements):>11} {elapsed:>9.1f}")
+            db.session.remove()
+            db.drop_all()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""
+Geo search benchmark: geohash index vs. plain latitude/longitude scan.
+
+Fills an in-memory SQLite database with N places spread over the world and
+times viewport (bounding box) queries of about 20 x 20 km. The geohash query
+should stay almost flat as N grows (index range scans), the plain query grows
+linearly (full table scan).
+
+Usage (from the repository root):
+    python -m part3.app.benchmarks.bench_geo --sizes 10000 100000 1000000
+"""
+import argparse
+import random
+import time
+import uuid
+from sqlalchemy import insert
+from part3.app import create_app, db
+from part3.app.models.place import Place
+from part3.app.models.user import User
+from part3.app.services import geo
+from part3.app.services.facade import facade
+
+
+def fill(count, owner_id, rng, batch_size=50000):
+    """Insert `count` random places with Core executemany batches"""
+    for start in range(0, count, batch_size):
+        rows = []
+        for _ in range(min(batch_size, count - start)):
+            latitude = rng.uniform(-60.0, 70.0)
+            longitude = rng.uniform(-180.0, 180.0)
+            rows.append({
+                'id': str(uuid.uuid4()), 'title': 'Bench place', 'description': '',
+                'price': 100.0, 'latitude': latitude, 'longitude': longitude,
+                'owner_id': owner_id, 'review_count': 0, 'rating_sum': 0, 'rating_avg': 0.0,
+                'geohash': geo.encode(latitude, longitude, Place.GEOHASH_PRECISION)
+            })
+        db.session.execute(insert(Place.__table__), rows)
+    db.session.commit()
+
+
+def time_queries(boxes, run):
+    started = time.perf_counter()
+    found = 0
+    for box in boxes:
+        found += len(run(box))
+    return (time.perf_counter() - started) * 1000 / len(boxes), found
+
+
+def scan(box):
+    """Same box without the geohash prefilter: the database has to read every row"""
+    min_lat, min_lng, max_lat, max_lng = box
+    return Place.query.filter(Place.latitude.between(min_lat, max_lat),
+                              Place.longitude.between(min_lng, max_lng)).all()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000])
+    parser.add_argument('--queries', type=int, default=50)
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    boxes = []
+    for _ in range(args.queries):
+        latitude, longitude = rng.uniform(-50.0, 60.0), rng.uniform(-170.0, 170.0)
+        boxes.append(geo.bounding_box(latitude, longitude, 10))
+
+    print(f"{'places':>10} {'geohash ms/query':>18} {'scan ms/query':>15} {'results':>8}")
+    for size in args.sizes:
+        app = create_app('testing')
+        with app.app_context():
+            owner = User("Bench", "Owner", f"{uuid.uuid4()}@bench.io", "B3nchmark!")
+            db.session.add(owner)
+            db.session.commit()
+            fill(size, owner.id, rng)
+
+            indexed_ms, found = time_queries(boxes, lambda box: facade.place_repo.get_places_in_bbox(*box))
+            scan_ms, scan_found = time_queries(boxes, scan)
+            assert found == scan_found
+            print(f"{size:>10} {indexed_ms:>18.3f} {scan_ms:>15.3f} {found:>8}")
+            db.session.remove()
+            db.drop_all()
+
+
+if __name__ == '__main__':
+    main()
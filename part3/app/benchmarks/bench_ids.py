@@ -0,0 +1,71 @@
+"""
+Primary key benchmark: random UUIDv4 ids vs. time-ordered UUIDv7 ids.
+
+Inserts N amenities in batches of one transaction each, into an SQLite file
+with the default page cache, once per id strategy (see services.ids). Random
+ids land anywhere in the primary key B-tree, so once the index outgrows the
+cache every insert reads and splits an old page; time-ordered ids always go
+to the last page. The last column is the insert rate of the final batch, when
+the table is at its biggest. The default is 1M rows, a production-sized
+10M rows takes several minutes per strategy.
+
+Usage (from the repository root):
+    python -m part3.app.benchmarks.bench_ids --rows 1000000 10000000
+"""
+import argparse
+import os
+import tempfile
+import time
+from datetime import datetime, timezone
+from sqlalchemy import insert
+from part3.app import create_app, db
+from part3.app.config import TestingConfig, config
+from part3.app.models.amenity import Amenity
+from part3.app.services import ids
+
+
+def fill(rows, batch_size):
+    """Insert the rows, returns (total seconds, seconds of the last batch, rows of the last batch)"""
+    now = datetime.now(timezone.utc)
+    statement = insert(Amenity.__table__)
+    total = last = 0.0
+    for start in range(0, rows, batch_size):
+        batch = [{'id': ids.new_id(), 'name': f'Amenity {i}', 'description': '', 'created_at': now,
+                  'updated_at': now} for i in range(start, min(start + batch_size, rows))]
+        started = time.perf_counter()
+        db.session.execute(statement, batch)
+        db.session.commit()
+        last = time.perf_counter() - started
+        total += last
+    return total, last, len(batch)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='+', default=[1000000])
+    parser.add_argument('--batch-size', type=int, default=10000)
+    args = parser.parse_args()
+
+    print(f"{'strategy':>9} {'rows':>10} {'seconds':>8} {'rows/s':>9} {'MB':>7} {'last batch rows/s':>18}")
+    with tempfile.TemporaryDirectory() as directory:
+        for rows in args.rows:
+            for strategy in ids.STRATEGIES:
+                path = os.path.join(directory, f'{strategy}-{rows}.db')
+                config['benchmark'] = type('BenchmarkConfig', (TestingConfig,), {
+                    'SQLALCHEMY_DATABASE_URI': f"sqlite:///{path}",
+                    'ID_STRATEGY': strategy
+                })
+                app = create_app('benchmark')
+                with app.app_context():
+                    total, last, last_rows = fill(rows, args.batch_size)
+                    size_mb = os.path.getsize(path) / 1024 / 1024
+                    print(f"{strategy:>9} {rows:>10} {total:>8.1f} {rows / total:>9.0f} {size_mb:>7.1f} "
+                          f"{last_rows / last:>18.0f}")
+                    db.session.remove()
+                    db.drop_all()
+    # Back to the default for anything running after this in the same process
+    ids.set_strategy(TestingConfig.ID_STRATEGY)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""
+Bulk import benchmark: facade.bulk_import vs. one facade.create_place per row.
+
+Generates an NDJSON inventory (a few amenities, N places with 3 amenities
+each and one review per place) and imports it into an in-memory SQLite
+database. The per-row path is only timed on the first --single rows, it does
+a commit per place.
+
+Usage (from the repository root):
+    python -m part3.app.benchmarks.bench_import --rows 10000 100000
+"""
+import argparse
+import json
+import random
+import time
+import uuid
+from part3.app import create_app, db
+from part3.app.models.user import User
+from part3.app.services import ids
+from part3.app.services.facade import facade
+
+AMENITIES = 20
+
+
+def inventory(count, reviewer_id, rng):
+    """NDJSON lines: the amenities, then a place and its review per row"""
+    amenity_ids = [ids.new_id() for _ in range(AMENITIES)]
+    for i, amenity_id in enumerate(amenity_ids):
+        yield json.dumps({'type': 'amenity', 'id': amenity_id, 'name': f'Amenity {i}'})
+    for i in range(count):
+        place_id = ids.new_id()
+        yield json.dumps({
+            'type': 'place', 'id': place_id, 'title': f'Place {i}', 'description': 'Bench place',
+            'price': rng.randint(20, 500), 'latitude': rng.uniform(-60.0, 70.0),
+            'longitude': rng.uniform(-180.0, 180.0),
+            'amenities': rng.sample(amenity_ids, 3)
+        })
+        yield json.dumps({'type': 'review', 'place_id': place_id, 'user_id': reviewer_id,
+                          'text': 'Bench review', 'rating': rng.randint(1, 5)})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='+', default=[10000])
+    parser.add_argument('--batch-size', type=int, default=1000)
+    parser.add_argument('--single', type=int, default=1000, help='Places created one by one for comparison')
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    print(f"{'places':>10} {'lines':>8} {'bulk s':>8} {'bulk lines/s':>13} {'single places/s':>16}")
+    for count in args.rows:
+        app = create_app('testing')
+        with app.app_context():
+            owner = User("Bench", "Owner", f"{uuid.uuid4()}@bench.io", "B3nchmark!")
+            reviewer = User("Bench", "Reviewer", f"{uuid.uuid4()}@bench.io", "B3nchmark!")
+            db.session.add_all([owner, reviewer])
+            db.session.commit()
+            lines = list(inventory(count, reviewer.id, rng))
+
+            started = time.perf_counter()
+            report = facade.bulk_import(lines, default_owner_id=owner.id, batch_size=args.batch_size)
+            bulk_seconds = time.perf_counter() - started
+            assert report['failed'] == 0, report['errors'][:5]
+
+            single = [json.loads(line) for line in lines if '"type": "place"' in line][:args.single]
+            started = time.perf_counter()
+            for place in single:
+                place['id'] = None
+                place['owner_id'] = owner.id
+                facade.create_place(place)
+            single_rate = len(single) / (time.perf_counter() - started)
+
+            print(f"{count:>10} {len(lines):>8} {bulk_seconds:>8.2f} {len(lines) / bulk_seconds:>13.0f} {single_rate:>16.0f}")
+            db.session.remove()
+            db.drop_all()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+"""
+Password hashing benchmark: login throughput vs. latency of the other endpoints.
+
+Runs a login burst (N threads posting to /api/v1/auth/login) while one
+thread keeps fetching GET /api/v1/amenities/ and records how long each
+fetch takes. Done three times: without logins, with bcrypt run inline in
+the request threads (PASSWORD_HASH_WORKERS=0) and with bcrypt on the
+worker processes. Prints logins per second, logins shed with a 503 and
+the GET latency percentiles.
+
+The bcrypt cost is calibrated to --target-ms, like `flask calibrate-passwords`.
+
+Usage (from the repository root):
+    python -m part3.app.benchmarks.bench_passwords --threads 8 --seconds 5
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import threading
+import time
+from part3.app import create_app, db
+from part3.app.config import TestingConfig, config
+from part3.app.extensions import passwords
+from part3.app.models.user import User
+from part3.app.services.passwords import PasswordHasher
+
+
+def burst(app, threads, seconds):
+    """(logins/s, logins shed, GET latencies in ms) of a login burst of threads threads"""
+    deadline = time.perf_counter() + seconds
+    logins, shed, latencies = [], [], []
+
+    def login():
+        client = app.test_client()
+        while time.perf_counter() < deadline:
+            response = client.post('/api/v1/auth/login', json={'email': 'bench@bench.io', 'password': 'B3nchmark!'})
+            if response.status_code == 200:
+                logins.append(1)
+            else:
+                # Shed: come back when told to, like a client would
+                shed.append(1)
+                time.sleep(float(response.headers['Retry-After']))
+
+    def browse():
+        client = app.test_client()
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            assert client.get('/api/v1/amenities/').status_code == 200
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    workers = [threading.Thread(target=login) for _ in range(threads)] + [threading.Thread(target=browse)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return len(logins) / seconds, len(shed), latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--threads', type=int, default=8, help='Concurrent logins')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Hashing processes')
+    parser.add_argument('--target-ms', type=int, default=100)
+    parser.add_argument('--seconds', type=float, default=5.0)
+    args = parser.parse_args()
+
+    rounds = PasswordHasher().calibrate(args.target_ms / 1000)
+    print(f"{'mode':>9} {'logins/s':>9} {'shed':>6} {'GET p50 ms':>11} {'GET p99 ms':>11}")
+    with tempfile.TemporaryDirectory() as directory:
+        modes = (('idle', 0, 0), ('inline', 0, args.threads), ('processes', args.workers, args.threads))
+        for mode, workers, threads in modes:
+            config['benchmark'] = type('BenchmarkConfig', (TestingConfig,), {
+                'PERSISTENCE_BACKEND': 'sqlite',
+                'SQLITE_PATH': os.path.join(directory, f'{mode}.db'),
+                'SECRET_KEY': 'benchmark-secret-key-of-32-bytes-at-least',
+                'BCRYPT_LOG_ROUNDS': rounds,
+                'PASSWORD_HASH_WORKERS': workers,
+                # Inline, every login thread hashes at once: no limit
+                'PASSWORD_HASH_QUEUE': 0 if workers else args.threads + 1,
+            })
+            app = create_app('benchmark')
+            with app.app_context():
+                db.session.add(User("Bench", "User", "bench@bench.io", "B3nchmark!"))
+                db.session.commit()
+                db.session.remove()
+
+            rate, shed, latencies = burst(app, threads, args.seconds)
+            percentiles = statistics.quantiles(latencies, n=100)
+            print(f"{mode:>9} {rate:>9.1f} {shed:>6} {percentiles[49]:>11.1f} {percentiles[98]:>11.1f}")
+            passwords.close()
+    print(f"bcrypt cost {passwords.rounds}, {args.workers} worker process(es)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""
+Repository benchmark: single-object calls vs. the batch API.
+
+For N amenities, compares add() per object against add_all(), get() per id
+against get_many(), and delete() per id against delete_many(). Prints the
+number of SQL statements (round trips) and the time of each.
+
+Usage (from the repository root):
+    python -m part3.app.benchmarks.bench_repository --sizes 100 1000 10000
+"""
+import argparse
+import time
+from sqlalchemy import event
+from part3.app import create_app, db
+from part3.app.models.amenity import Amenity
+from part3.app.services.facade import facade
+
+
+class StatementCounter:
+    """Counts the statements sent to the database while active"""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, *args):
+        self.count += 1
+
+
+def measure(counter, run):
+    db.session.expunge_all()
+    counter.count = 0
+    started = time.perf_counter()
+    run()
+    return counter.count, (time.perf_counter() - started) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000])
+    args = parser.parse_args()
+
+    repo = facade.amenity_repo
+    print(f"{'objects':>8} {'operation':>10} {'single stmts':>13} {'single ms':>10} {'batch stmts':>12} {'batch ms':>9}")
+    for size in args.sizes:
+        app = create_app('testing')
+        with app.app_context():
+            counter = StatementCounter()
+            event.listen(db.engine, 'before_cursor_execute', counter)
+
+            def add_single():
+                for i in range(size):
+                    repo.add(Amenity(f'Amenity {i}'))
+            single_add = measure(counter, add_single)
+            ids = [amenity.id for amenity in repo.get_all()]
+            batch_add = measure(counter, lambda: repo.add_all([Amenity(f'Amenity {i}') for i in range(size)]))
+
+            # A new application context per run, so the request identity map is empty
+            def in_new_context(run):
+                def wrapped():
+                    with app.app_context():
+                        run()
+                return wrapped
+
+            single_get = measure(counter, in_new_context(lambda: [repo.get(obj_id) for obj_id in ids]))
+            batch_get = measure(counter, in_new_context(lambda: repo.get_many(ids)))
+
+            batch_ids = [amenity.id for amenity in repo.get_all() if amenity.id not in set(ids)]
+            single_delete = measure(counter, in_new_context(lambda: [repo.delete(obj_id) for obj_id in ids]))
+            batch_delete = measure(counter, in_new_context(lambda: repo.delete_many(batch_ids)))
+            assert repo.count() == 0
+
+            for name, single, batch in (('add', single_add, batch_add), ('get', single_get, batch_get),
+                                        ('delete', single_delete, batch_delete)):
+                print(f"{size:>8} {name:>10} {single[0]:>13} {single[1]:>10.1f} {batch[0]:>12} {batch[1]:>9.1f}")
+
+            event.remove(db.engine, 'before_cursor_execute', counter)
+            db.session.remove()
+            db.drop_all()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+"""
+Unit of work benchmark: one commit per facade write vs. facade.transaction().
+
+Creates N amenities and links each one to a place, first with a commit per
+repository write (the default), then inside a single facade.transaction().
+Runs on an SQLite file so every commit pays for a real fsync.
+
+Usage (from the repository root):
+    python -m part3.app.benchmarks.bench_unit_of_work --sizes 100 1000
+"""
+import argparse
+import os
+import tempfile
+import time
+import uuid
+from part3.app import create_app, db
+from part3.app.config import TestingConfig, config
+from part3.app.models.user import User
+from part3.app.services.facade import facade
+
+
+def write(count, place_id):
+    for i in range(count):
+        amenity = facade.create_amenity({'name': f'Amenity {i}'})
+        facade.add_amenity_to_place(place_id, amenity.id)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000])
+    args = parser.parse_args()
+
+    print(f"{'writes':>8} {'per write ms':>13} {'transaction ms':>15} {'speedup':>8}")
+    with tempfile.TemporaryDirectory() as directory:
+        config['benchmark'] = type('BenchmarkConfig', (TestingConfig,), {
+            'SQLALCHEMY_DATABASE_URI': f"sqlite:///{os.path.join(directory, 'bench.db')}"
+        })
+        for size in args.sizes:
+            app = create_app('benchmark')
+            with app.app_context():
+                owner = User("Bench", "Owner", f"{uuid.uuid4()}@bench.io", "B3nchmark!")
+                db.session.add(owner)
+                db.session.commit()
+                places = [facade.create_place({
+                    'title': f'Bench place {i}', 'description': '', 'price': 100, 'latitude': 0,
+                    'longitude': 0, 'owner_id': owner.id, 'amenities': []
+                }).id for i in range(2)]
+
+                started = time.perf_counter()
+                write(size, places[0])
+                single_ms = (time.perf_counter() - started) * 1000
+
+                started = time.perf_counter()
+                with facade.transaction():
+                    write(size, places[1])
+                batch_ms = (time.perf_counter() - started) * 1000
+
+                print(f"{size * 2:>8} {single_ms:>13.1f} {batch_ms:>15.1f} {single_ms / batch_ms:>7.1f}x")
+                db.session.remove()
+                db.drop_all()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+import click
+from part3.app import db
+from part3.app.extensions import passwords
+from part3.app.persistence.migrations import migrate
+from part3.app.services.facade import facade
+
+
+def register_commands(app):
+    """
+    Register the maintenance commands on the Flask CLI.
+    Run them with: flask --app run <command>
+    """
+
+    @app.cli.command('backfill-ratings')
+    def backfill_ratings():
+        """Recompute review_count / rating_sum / rating_avg of every place from its reviews"""
+        updated = facade.backfill_place_ratings()
+        click.echo(f"Updated the ratings of {updated} places")
+
+    @app.cli.command('backfill-geohash')
+    def backfill_geohash():
+        """Compute the geohash of places created before the column existed"""
+        updated = facade.backfill_place_geohashes()
+        click.echo(f"Updated the geohash of {updated} places")
+
+    @app.cli.command('import')
+    @click.argument('source', type=click.File('rb'))
+    @click.option('--owner', 'owner_id', help='Owner of the places without an owner_id')
+    @click.option('--batch-size', default=1000, show_default=True, help='Lines written per transaction')
+    def bulk_import(source, owner_id, batch_size):
+        """Bulk import amenities, places and reviews from an NDJSON file ('-' for stdin)"""
+        report = facade.bulk_import(source, default_owner_id=owner_id, batch_size=batch_size)
+        imported = ", ".join(f"{row_type}: {count}" for row_type, count in report['imported'].items())
+        click.echo(f"Read {report['lines']} lines, imported {imported}, {report['failed']} rows rejected")
+        for error in report['errors']:
+            click.echo(f"  line {error['line']}: {error['error']}", err=True)
+
+    @app.cli.command('migrate')
+    def run_migrations():
+        """Apply the schema migrations missing from the database, once per deployment"""
+        applied = migrate(db.engine)
+        click.echo(f"Applied {len(applied)} migrations" + (f": {', '.join(applied)}" if applied else ""))
+
+    @app.cli.command('calibrate-passwords')
+    @click.option('--target-ms', type=int, default=app.config['PASSWORD_HASH_TARGET_MS'], show_default=True,
+                  help='Time one password check should take')
+    def calibrate_passwords(target_ms):
+        """Suggest the bcrypt cost to set as BCRYPT_LOG_ROUNDS on every process"""
+        rounds = passwords.calibrate(target_ms / 1000)
+        click.echo(f"Lowest bcrypt cost taking {target_ms} ms here: {rounds} (in use: {passwords.rounds})")
+        click.echo(f"Set BCRYPT_LOG_ROUNDS={rounds} for every process: hashes below it are rehashed at login")
+
+    @app.cli.command('purge-revoked-tokens')
+    def purge_revoked_tokens():
+        """Delete the revocations of tokens that have expired anyway"""
+        deleted = facade.purge_revoked_tokens()
+        click.echo(f"Deleted {deleted} expired revocations")
@@ -1,16 +1,43 @@
 import os
+from datetime import timedelta
 
 class Config:
     SECRET_KEY = os.getenv('SECRET_KEY', 'default_secret_key')
     DEBUG = False
+    # Level of the part3.app loggers, the facade's debug output only shows at DEBUG
+    LOG_LEVEL = os.getenv('LOG_LEVEL', 'WARNING')
+    # How new primary keys are generated: 'uuid7' (time-ordered) or 'uuid4' (random), see services.ids
+    ID_STRATEGY = os.getenv('ID_STRATEGY', 'uuid7')
+    # Where the entities are stored: 'sqlite-memory', 'sqlite' or 'mysql', see persistence.backends
+    PERSISTENCE_BACKEND = os.getenv('PERSISTENCE_BACKEND', 'mysql')
+    SQLITE_PATH = os.getenv('SQLITE_PATH', 'hbnb.db')
+    MYSQL_URL = os.getenv('MYSQL_URL', 'mysql+mysqldb://root:@localhost/hbnb')
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Access tokens are renewed with the refresh token at /api/v1/auth/refresh.
+    # 24 hours until the frontend (part4) refreshes them: it only keeps the access token
+    JWT_ACCESS_TOKEN_EXPIRES = timedelta(minutes=int(os.getenv('JWT_ACCESS_MINUTES', str(24 * 60))))
+    JWT_REFRESH_TOKEN_EXPIRES = timedelta(days=int(os.getenv('JWT_REFRESH_DAYS', '30')))
+    # bcrypt off the request threads, see services.passwords
+    # Same cost on every process, `flask calibrate-passwords` suggests one for PASSWORD_HASH_TARGET_MS
+    BCRYPT_LOG_ROUNDS = int(os.getenv('BCRYPT_LOG_ROUNDS', '12'))
+    PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', os.cpu_count() or 1))
+    PASSWORD_HASH_QUEUE = int(os.getenv('PASSWORD_HASH_QUEUE', '0'))  # 0: four per worker
+    PASSWORD_HASH_TARGET_MS = int(os.getenv('PASSWORD_HASH_TARGET_MS', '250'))
 
 class DevelopmentConfig(Config):
     DEBUG = True
-    SQLALCHEMY_DATABASE_URI = 'mysql+mysqldb://root:@localhost/hbnb'
-    SQLALCHEMY_TRACK_MODIFICATIONS = False
     TESTING = True
+    LOG_LEVEL = os.getenv('LOG_LEVEL', 'DEBUG')
+
+class TestingConfig(Config):
+    TESTING = True
+    PERSISTENCE_BACKEND = 'sqlite-memory'
+    # Keep password hashing cheap so the test suite stays fast
+    BCRYPT_LOG_ROUNDS = 4
+    PASSWORD_HASH_WORKERS = 0
 
 config = {
     'development': DevelopmentConfig,
+    'testing': TestingConfig,
     'default': DevelopmentConfig
 }
\ No newline at end of file
@@ -1,9 +1,26 @@
-from flask_bcrypt import Bcrypt
-from flask_jwt_extended import JWTManager
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+import sqlite3
+from part3.app.services.jwt_claims import CachingJWTManager
+from part3.app.services.metrics import Metrics
+from part3.app.services.passwords import PasswordHasher
 
 
 # Initialize extensions
-bcrypt = Bcrypt()
-jwt = JWTManager()
+passwords = PasswordHasher()
+jwt = CachingJWTManager()
+metrics = Metrics()
 db = SQLAlchemy()
+
+
+@event.listens_for(Engine, "connect")
+def enable_sqlite_foreign_keys(dbapi_connection, connection_record):
+    """
+    SQLite ignores foreign keys unless asked on every connection, without
+    this the ON DELETE CASCADE of the models would do nothing in tests
+    """
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
@@ -13,7 +13,8 @@ class Amenity(BaseModel):
 
     __tablename__ = "amenities"
 
-    name = db.Column(db.String(50), nullable = False)
+    # Indexed for get_amenity_by_name
+    name = db.Column(db.String(50), nullable = False, index=True)
     description = db.Column(db.String(512))
 
 
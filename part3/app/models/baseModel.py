@@ -1,37 +1,81 @@
 from part3.app.extensions import db
+from part3.app.services import ids
+from sqlalchemy.dialects import mysql
+from sqlalchemy.types import String, TypeDecorator
 import uuid
 from datetime import datetime, timezone
 
+
+class UUIDString(TypeDecorator):
+    """
+    Primary and foreign key column type: a UUID string in Python.
+
+    MySQL stores it as BINARY(16), less than half the size of CHAR(36) in the
+    primary key and in every secondary index (which all carry the primary
+    key). Other databases store the string itself. Bound values are brought
+    to the canonical form first (ids.normalize), so '0192B3C4-...' finds the
+    same row on every database.
+
+    A value that is not a UUID has no BINARY(16) form: binding one on MySQL
+    raises ValueError instead of comparing with NULL. The repositories answer
+    "not found" for such ids before any query. Other databases compare the
+    string as it is (rows of older versions may have other keys).
+    """
+    impl = String(36)
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == 'mysql':
+            return dialect.type_descriptor(mysql.BINARY(16))
+        return dialect.type_descriptor(String(36))
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        canonical = ids.normalize(value)
+        if dialect.name != 'mysql':
+            return canonical if canonical is not None else value
+        if canonical is None:
+            raise ValueError(f"{value!r} is not a UUID")
+        return uuid.UUID(canonical).bytes
+
+    def process_result_value(self, value, dialect):
+        if isinstance(value, bytes):
+            return str(uuid.UUID(bytes=value))
+        return value
+
+
 class BaseModel(db.Model):
     __abstract__ = True # Ensures SQLAlchemy doesn't use this for a table
     """
     Base class for all entities in the HBnB application.
     
     Provides common attributes and methods that will be inherited by all entity classes:
-    - id: A UUID string that uniquely identifies each entity
+    - id: A UUID string that uniquely identifies each entity (see services.ids for the strategy)
     - created_at: Timestamp when the entity is created
     - updated_at: Timestamp when the entity is last updated
     """
-    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    created_at = db.Column(db.DateTime, default=datetime.now(timezone.utc))
-    updated_at = db.Column(db.DateTime, default=datetime.now(timezone.utc), onupdate=datetime.now(timezone.utc))
+    id = db.Column(UUIDString, primary_key=True, default=ids.new_id)
+    # Defaults must be callables, otherwise every row gets the import-time timestamp
+    created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
+    updated_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
 
     def __init__(self):
         """
         Initialize a new BaseEntity instance with:
-        - A unique UUID as a string
+        - A unique UUID as a string, time-ordered unless ID_STRATEGY says otherwise
         - The current datetime for both created_at and updated_at
         """
-        self.id = str(uuid.uuid4())  # Generate a random UUID and convert to string
-        self.created_at = str(datetime.now())  # Set creation timestamp
-        self.updated_at = str(datetime.now())  # Set initial update timestamp
+        self.id = ids.new_id()
+        self.created_at = datetime.now(timezone.utc)  # Set creation timestamp
+        self.updated_at = datetime.now(timezone.utc)  # Set initial update timestamp
 
     def save(self):
         """
         Update the updated_at timestamp whenever the entity is modified.
         This should be called whenever an entity's attributes are changed.
         """
-        self.updated_at = str(datetime.now())
+        self.updated_at = datetime.now(timezone.utc)
 
     def update(self, data):
         """
@@ -1,11 +1,15 @@
-from part3.app.models.baseModel import BaseModel
+from part3.app.models.baseModel import BaseModel, UUIDString
 from part3.app.extensions import db
+from part3.app.services import geo
 from sqlalchemy.orm import validates
 
 # Relationship Association Table (Place > Amenity)
+# Links go away with either side in the database (ON DELETE CASCADE)
 place_amenity = db.Table('place_amenity',
-    db.Column('place_id', db.String(36), db.ForeignKey('places.id'), primary_key=True),
-    db.Column('amenity_id', db.String(36), db.ForeignKey('amenities.id'), primary_key=True)
+    db.Column('place_id', UUIDString, db.ForeignKey('places.id', ondelete='CASCADE'), primary_key=True),
+    # The primary key serves lookups by place_id, this index the ones (and cascades) by amenity_id
+    db.Column('amenity_id', UUIDString, db.ForeignKey('amenities.id', ondelete='CASCADE'), primary_key=True,
+              index=True)
 )
 
 class Place(BaseModel):
@@ -21,8 +25,19 @@ class Place(BaseModel):
         owner (User): User instance who owns the place
         amenities (list): List of Amenity instances available at the place
         reviews (list): List of Review instances for the place
+        review_count (int): Number of reviews, kept up to date by the facade
+        rating_sum (int): Sum of all review ratings
+        rating_avg (float): rating_sum / review_count, 0 without reviews
+        geohash (str): Geohash of (latitude, longitude), set by their validators
     """
     __tablename__ = "places"
+    GEOHASH_PRECISION = 9
+    # Serve the "top rated" ordering (rating_avg DESC, review_count DESC)
+    # and the "newest" ordering / listing pages (created_at, id)
+    __table_args__ = (
+        db.Index('ix_places_rating_avg_review_count', 'rating_avg', 'review_count'),
+        db.Index('ix_places_created_at_id', 'created_at', 'id'),
+    )
 
     # id = db.Column(db.Integer, primary_key = True)
     title = db.Column(db.String(100), nullable = False)
@@ -30,12 +45,23 @@ class Place(BaseModel):
     price = db.Column(db.Float, nullable = False)
     latitude = db.Column(db.Float, nullable = False)
     longitude = db.Column(db.Float, nullable = False)
+    # Indexed so geo searches are index range scans (see services/geo.py)
+    geohash = db.Column(db.String(GEOHASH_PRECISION), index=True)
+
+    # Aggregated review ratings, maintained incrementally on review writes
+    review_count = db.Column(db.Integer, nullable=False, default=0, index=True)
+    rating_sum = db.Column(db.Integer, nullable=False, default=0)
+    rating_avg = db.Column(db.Float, nullable=False, default=0.0)
 
     # Add relationships back to the above place_amenity outside of the class
-    owner_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)
-    reviews = db.relationship('Review', backref='place', lazy=True, cascade="all, delete-orphan")
-    amenities = db.relationship('Amenity', secondary=place_amenity, lazy='subquery', 
-                         backref=db.backref('places', lazy=True))
+    # Indexed for the ON DELETE CASCADE of the owner (and the places-by-owner lookups)
+    owner_id = db.Column(UUIDString, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False, index=True)
+    # passive_deletes: the database deletes the reviews/amenity links (ON DELETE CASCADE),
+    # the ORM doesn't load them just to delete them one by one
+    reviews = db.relationship('Review', backref='place', lazy=True, cascade="all, delete-orphan",
+                              passive_deletes=True)
+    amenities = db.relationship('Amenity', secondary=place_amenity, lazy=True, passive_deletes=True,
+                         backref=db.backref('places', lazy=True, passive_deletes=True))
 
 
 
@@ -67,6 +93,11 @@ class Place(BaseModel):
         # Initialize lists for relationships
         self.amenities = amenities
         self.reviews = []
+
+        # No reviews yet
+        self.review_count = 0
+        self.rating_sum = 0
+        self.rating_avg = 0.0
     
     @validates("title")
     def validate_title(self, key, value):
@@ -107,6 +138,7 @@ class Place(BaseModel):
             raise ValueError("Latitude is required")
         elif not -90.0 <= value <= 90.0:
             raise ValueError("Latitude must be within the range of -90.0 to 90.0")
+        self.refresh_geohash(float(value), self.longitude)
         return float(value)
 
     @validates("longitude")
@@ -124,7 +156,13 @@ class Place(BaseModel):
             raise ValueError("Longitude is required")
         if not -180.0 <= value <= 180.0:
             raise ValueError("Longitude must be within the range of -180.0 to 180.0")
+        self.refresh_geohash(self.latitude, float(value))
         return float(value)
+
+    def refresh_geohash(self, latitude, longitude):
+        """Recompute the geohash once both coordinates are known"""
+        if latitude is not None and longitude is not None:
+            self.geohash = geo.encode(latitude, longitude, self.GEOHASH_PRECISION)
            
     @validates("owner_id")
     def validate_owner_id(self, key, value):
@@ -229,8 +267,9 @@ class Place(BaseModel):
                         'created_at': str(review.created_at),
                         'updated_at': str(review.updated_at)
                     }
-                    if hasattr(review, 'user') and review.user:
-                        review_data['user_id'] = review.user.id
+                    # Read the foreign key, not review.user, to avoid loading the author
+                    if review.user_id:
+                        review_data['user_id'] = review.user_id
                     reviews_data.append(review_data)
         
         return {
@@ -244,5 +283,27 @@ class Place(BaseModel):
             "longitude": self.longitude,
             "owner_id": self.owner_id,
             "amenities": amenities_data,
-            "reviews": reviews_data
+            "reviews": reviews_data,
+            "review_count": self.review_count,
+            "rating_avg": self.rating_avg
+        }
+
+    def summary_serialization(self):
+        """
+        Convert the place to a lightweight dictionary for listing pages.
+        Reviews are left out, only the amenity ids and names are kept.
+        """
+        return {
+            "id": self.id,
+            "created_at": str(self.created_at),
+            "updated_at": str(self.updated_at),
+            "title": self.title,
+            "description": self.description,
+            "price": self.price,
+            "latitude": self.latitude,
+            "longitude": self.longitude,
+            "owner_id": self.owner_id,
+            "amenities": [{'id': a.id, 'name': a.name} for a in self.amenities],
+            "review_count": self.review_count,
+            "rating_avg": self.rating_avg
         }
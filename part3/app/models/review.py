@@ -1,4 +1,4 @@
-from part3.app.models.baseModel import BaseModel
+from part3.app.models.baseModel import BaseModel, UUIDString
 from part3.app.models.user import User
 from part3.app.extensions import db
 
@@ -15,13 +15,21 @@ class Review(BaseModel):
     """
 
     __tablename__ = "reviews"
+    # A user can only review a place once (same constraint as SQL/tables/create_reviews.sql)
+    # The index also serves the (user_id, place_id) duplicate lookups
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'place_id', name='unique_review'),
+    )
 
     text = db.Column(db.String(100), nullable = False)
-    rating = db.Column(db.Integer, nullable = False)
+    # Indexed for get_review_by_rating
+    rating = db.Column(db.Integer, nullable = False, index=True)
 
     # Relationship for Authorization (Foreign Keys)
-    place_id = db.Column(db.String(36), db.ForeignKey('places.id'), nullable=False)
-    user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)
+    # Indexed: the ON DELETE CASCADE of a place looks its reviews up by place_id
+    # (user_id lookups use the unique (user_id, place_id) index, it starts with user_id)
+    place_id = db.Column(UUIDString, db.ForeignKey('places.id', ondelete='CASCADE'), nullable=False, index=True)
+    user_id = db.Column(UUIDString, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
 
     def __init__(self, text, rating, place_id=None, user_id=None, place=None, user=None):
         """
@@ -0,0 +1,33 @@
+from part3.app.models.baseModel import UUIDString
+from part3.app.extensions import db
+from datetime import datetime, timezone
+
+
+class RevokedToken(db.Model):
+    """
+    A token id that can no longer be used, see services.revocation.
+
+    Attributes:
+        jti (str): The jti of a refresh token already exchanged (kind 'refresh'),
+            or the session id (fam claim) of a session logged out (kind 'session')
+        kind (str): 'refresh' or 'session'
+        expires_at (datetime): When the tokens it blocks expire anyway, the row
+            can be purged after that
+        revoked_at (datetime): When it was revoked, other processes pick up
+            the revocations made since their last sync
+    """
+    __tablename__ = 'revoked_tokens'
+
+    REFRESH = 'refresh'
+    SESSION = 'session'
+
+    jti = db.Column(UUIDString, primary_key=True)
+    kind = db.Column(db.String(10), nullable=False)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+    revoked_at = db.Column(db.DateTime, nullable=False, index=True)
+
+    def __init__(self, jti, kind, expires_at):
+        self.jti = jti
+        self.kind = kind
+        self.expires_at = expires_at
+        self.revoked_at = datetime.now(timezone.utc)
@@ -1,6 +1,7 @@
 from part3.app.models.baseModel import BaseModel
 from email_validator import validate_email, EmailNotValidError
-from part3.app import bcrypt, db
+from part3.app import db
+from part3.app.extensions import passwords
 from sqlalchemy.orm import validates
 
 class User(BaseModel):
@@ -32,8 +33,11 @@ class User(BaseModel):
 
     # Relationship Association table (Place > User{owner} reviews > user)
     # Add to the User class
-    places = db.relationship('Place', backref='owner', lazy=True, cascade="all, delete-orphan")
-    reviews = db.relationship('Review', backref='user', lazy=True, cascade="all, delete-orphan")
+    # passive_deletes: the database deletes them (ON DELETE CASCADE), nothing is loaded
+    places = db.relationship('Place', backref='owner', lazy=True, cascade="all, delete-orphan",
+                             passive_deletes=True)
+    reviews = db.relationship('Review', backref='user', lazy=True, cascade="all, delete-orphan",
+                              passive_deletes=True)
 
     def __init__(self, first_name, last_name, email, password):
         self.first_name = first_name
@@ -46,7 +50,8 @@ class User(BaseModel):
     def hash_password(self, key, password):
         """Hashes the password before storing it
         Args: password (str): plaintext password to hash
-        Note: bcrypt is used to securely hash the password
+        Note: bcrypt is used to securely hash the password, on the
+        worker processes of services.passwords
         """
         # FAIL SAFE
         if password is None:
@@ -58,7 +63,7 @@ class User(BaseModel):
             raise password_check[1]
 
         # Use bcrypt to hash the password
-        return bcrypt.generate_password_hash(password).decode('utf-8')
+        return passwords.hash(password)
 
     def verify_password(self, password):
         """Verifies the password that was inputted to match the hashed password
@@ -66,9 +71,7 @@ class User(BaseModel):
         Returns: boolean [True if match, False otherwise]
         """
 
-        if self.password is None:
-            return False
-        return bcrypt.check_password_hash(self.password, password)
+        return passwords.verify(self.password, password)
 
 
     def validate_password(self, password):
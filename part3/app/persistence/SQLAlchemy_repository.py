@@ -1,16 +1,101 @@
 from part3.app.extensions import db
 from part3.app.persistence.repository import Repository
+from part3.app.persistence import identity_map, unit_of_work
+from part3.app.services import ids
+from sqlalchemy import exists, func, inspect, select
+from sqlalchemy.exc import IntegrityError
 
 class SQLAlchemyRepository(Repository):
+    # Ids per IN query, stays below the bound parameter limit of every backend
+    IN_BATCH_SIZE = 500
+
     def __init__(self, model):
         self.model = model
 
     def add(self, obj):
         db.session.add(obj)
-        db.session.commit()
+        try:
+            unit_of_work.commit()
+        except IntegrityError:
+            # Leave the session usable for the rest of the request,
+            # inside a transaction() block the block rolls back
+            if not unit_of_work.active():
+                db.session.rollback()
+            raise
+        identity_map.remember(self.model.__name__, self._identity(obj), obj)
+
+    @staticmethod
+    def _identity(obj):
+        """Primary key of a persisted object, without the reload obj.id triggers once the commit expired it"""
+        return inspect(obj).identity[0]
 
     def get(self, obj_id):
-        return self.model.query.get(obj_id)
+        # Not a UUID: no row has that id (and MySQL could not even compare it)
+        obj_id = ids.normalize(obj_id)
+        if obj_id is None:
+            return None
+
+        # Objects already fetched during this request are reused
+        obj = identity_map.lookup(self.model.__name__, obj_id)
+        if obj is not None and obj in db.session:
+            return obj
+
+        obj = self._fetch(obj_id)
+        identity_map.remember(self.model.__name__, obj_id, obj)
+        return obj
+
+    def _fetch(self, obj_id):
+        """Load one object from the database by primary key"""
+        return db.session.get(self.model, obj_id)
+
+    def get_many(self, obj_ids):
+        """
+        Objects of the given ids with one IN query (per IN_BATCH_SIZE ids).
+
+        Returns:
+            list: The objects in the order of the ids, unknown ids are skipped
+        """
+        obj_ids = [obj_id for obj_id in dict.fromkeys(map(ids.normalize, obj_ids)) if obj_id is not None]
+        found = {}
+        missing = []
+        for obj_id in obj_ids:
+            obj = identity_map.lookup(self.model.__name__, obj_id)
+            if obj is not None and obj in db.session:
+                found[obj_id] = obj
+            else:
+                missing.append(obj_id)
+
+        for start in range(0, len(missing), self.IN_BATCH_SIZE):
+            for obj in self._fetch_many(missing[start:start + self.IN_BATCH_SIZE]):
+                found[obj.id] = obj
+                identity_map.remember(self.model.__name__, obj.id, obj)
+
+        return [found[obj_id] for obj_id in obj_ids if obj_id in found]
+
+    def _fetch_many(self, obj_ids):
+        """Load the objects of a list of ids from the database"""
+        return self.model.query.filter(self.model.id.in_(obj_ids)).all()
+
+    def add_all(self, objs):
+        """Add several objects in a single transaction, none are added if one fails"""
+        db.session.add_all(objs)
+        try:
+            unit_of_work.commit()
+        except IntegrityError:
+            if not unit_of_work.active():
+                db.session.rollback()
+            raise
+        for obj in objs:
+            identity_map.remember(self.model.__name__, self._identity(obj), obj)
+
+    def exists(self, obj_id):
+        obj_id = ids.normalize(obj_id)
+        if obj_id is None:
+            return False
+        return db.session.scalar(select(exists().where(self.model.id == obj_id)))
+
+    def count(self):
+        return db.session.scalar(select(func.count()).select_from(self.model))
 
     def get_all(self):
         return self.model.query.all()
@@ -20,16 +105,33 @@ class SQLAlchemyRepository(Repository):
         if obj:
             for key, value in data.items():
                 setattr(obj, key, value)
-            db.session.commit()
+            unit_of_work.commit()
         return obj
 
     def delete(self, obj_id):
         obj = self.get(obj_id)
         if obj:
             db.session.delete(obj)
-            db.session.commit()
+            unit_of_work.commit()
+            identity_map.forget(self.model.__name__, obj_id)
             return True
         return False
 
+    def delete_many(self, obj_ids):
+        """
+        Delete the objects of the given ids in a single transaction.
+        Objects are loaded first so the ORM cascades (reviews of a place, ...) still apply.
+
+        Returns:
+            int: Number of objects deleted
+        """
+        objs = self.get_many(obj_ids)
+        for obj in objs:
+            db.session.delete(obj)
+        unit_of_work.commit()
+        for obj in objs:
+            identity_map.forget(self.model.__name__, obj.id)
+        return len(objs)
+
     def get_by_attribute(self, attr_name, attr_value):
         return self.model.query.filter(getattr(self.model, attr_name) == attr_value).first()
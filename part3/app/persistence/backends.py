@@ -0,0 +1,38 @@
+"""
+Persistence backends, chosen by the PERSISTENCE_BACKEND setting.
+
+Every backend stores the entities through the same SQLAlchemy models and
+repositories, what changes is the database behind them:
+- sqlite-memory: an SQLite database in memory, private to the process and
+  gone when it exits (tests, benchmarks, demos)
+- sqlite: the SQLite file SQLITE_PATH (a single server, no database to run)
+- mysql: the MySQL server of MYSQL_URL (production)
+
+An SQLALCHEMY_DATABASE_URI set in the config wins over the backend, for
+setups none of the above describes.
+
+The indexed InMemoryRepository of part2 is not one of them: the part3
+repositories lean on SQL (geohash range scans, rating UPDATEs, bulk
+inserts, cascades) that it has no equivalent for, hence 'sqlite-memory'
+rather than 'memory'.
+"""
+
+BACKENDS = {
+    'sqlite-memory': lambda config: 'sqlite:///:memory:',
+    'sqlite': lambda config: f"sqlite:///{config['SQLITE_PATH']}",
+    'mysql': lambda config: config['MYSQL_URL'],
+}
+
+
+def configure(app):
+    """
+    Point Flask-SQLAlchemy at the database of the app's backend, call before db.init_app(app).
+
+    Raises:
+        ValueError: If PERSISTENCE_BACKEND is not one of BACKENDS
+    """
+    backend = app.config['PERSISTENCE_BACKEND']
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown persistence backend {backend!r}, expected one of {', '.join(BACKENDS)}")
+    if not app.config.get('SQLALCHEMY_DATABASE_URI'):
+        app.config['SQLALCHEMY_DATABASE_URI'] = BACKENDS[backend](app.config)
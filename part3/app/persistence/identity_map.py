@@ -0,0 +1,82 @@
+"""
+Request scoped identity map.
+
+Keeps every entity (and serialized entity) fetched during the current
+request on flask.g, keyed by (kind, id), so a single API call never fetches
+the same row twice. flask.g lives as long as the application context, which
+Flask creates and tears down around each request, so nothing is shared
+between requests. Outside of an application context every lookup misses.
+
+The SQLAlchemy Session has an identity map of its own, but it only answers
+session.get() by primary key and holds ORM objects: the serialized dicts
+built by the facade, which cost more than the row itself, have nowhere to
+live there. Unlike the Session's (weak references), this map holds its
+entries strongly, so it is emptied whenever the Session commits or rolls
+back. The Session expires every object at that point anyway, and a CLI
+command, a bulk import or a test running under one long application
+context keeps at most MAX_ENTRIES entries between two commits.
+
+Kinds used:
+    'Place', 'User', ...             ORM objects (see SQLAlchemyRepository.get)
+    'Place:serialized', ...          dicts returned by the facade
+"""
+from flask import g, has_app_context
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+# Entries kept between two commits, the map starts over once it is full
+MAX_ENTRIES = 10000
+
+
+def _entries():
+    if not has_app_context():
+        return None
+    if 'identity_map' not in g:
+        g.identity_map = {}
+    return g.identity_map
+
+
+def lookup(kind, obj_id):
+    """Return the entry remembered for (kind, obj_id) in this request, or None"""
+    entries = _entries()
+    if entries is None:
+        return None
+    return entries.get((kind, obj_id))
+
+
+def remember(kind, obj_id, value):
+    """Remember value for (kind, obj_id) until the end of the request"""
+    entries = _entries()
+    if entries is not None and value is not None:
+        if len(entries) >= MAX_ENTRIES:
+            entries.clear()
+        entries[(kind, obj_id)] = value
+
+
+def forget(kind, obj_id):
+    """Drop the entry for (kind, obj_id) after it was changed or deleted"""
+    entries = _entries()
+    if entries is not None:
+        entries.pop((kind, obj_id), None)
+
+
+def forget_kind(kind):
+    """Drop every entry of a kind (e.g. all serialized places)"""
+    entries = _entries()
+    if entries is not None:
+        for key in [key for key in entries if key[0] == kind]:
+            del entries[key]
+
+
+def clear():
+    """Drop every entry, e.g. after a rollback"""
+    entries = _entries()
+    if entries is not None:
+        entries.clear()
+
+
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_rollback")
+def _clear_at_transaction_end(session):
+    """The transaction the entries were read in is over, so are they"""
+    clear()
@@ -0,0 +1,281 @@
+"""
+Versioned schema migrations.
+
+db.create_all() creates missing tables but never changes existing ones, so a
+database created by an older version of the app lacks the columns and
+indexes added since. Each migration below moves such a database one version
+forward. The versions already applied are recorded in the schema_version
+table and migrate() applies the missing ones in order, each in its own
+transaction.
+
+Migrations only run through `flask migrate`, once per deployment, never
+when the app starts: every worker would run them at once, racing on the
+ALTERs and the schema_version inserts, and a long one (binary_uuid_keys
+rewrites every key on MySQL) would hold up the start of the app. create_app
+only logs a warning while some are pending (see pending()). On MySQL,
+migrate() also holds a named lock, so two `flask migrate` started together
+run one after the other and the second finds nothing left to do.
+
+Migrations look at the live schema before changing it. On a database just
+created by db.create_all() they find everything in place and are only
+recorded, and a migration interrupted halfway (MySQL commits every DDL
+statement on its own) can simply run again.
+
+To change the schema: declare it on the models, then append a migration to
+MIGRATIONS. Never edit or reorder the existing ones.
+"""
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from sqlalchemy import (Column, DateTime, Float, Integer, MetaData, String, Table, bindparam, cast,
+                        func, inspect, select, text, update)
+from part3.app.extensions import db
+from part3.app.services import geo
+
+# Named lock held by migrate() on MySQL, and how long to wait for it (seconds)
+LOCK_NAME = 'hbnb_schema_migrations'
+LOCK_TIMEOUT = 600
+
+# Kept out of db.metadata: it describes the database, not the models
+schema_version = Table(
+    'schema_version', MetaData(),
+    Column('version', Integer, primary_key=True),
+    Column('name', String(100), nullable=False),
+    Column('applied_at', DateTime, nullable=False)
+)
+
+
+def add_column(connection, table, name, definition):
+    """
+    ALTER TABLE ... ADD COLUMN unless the column exists.
+
+    Returns:
+        bool: True if the column was added
+    """
+    if name in {column['name'] for column in inspect(connection).get_columns(table)}:
+        return False
+    connection.execute(text(f"ALTER TABLE {table} ADD COLUMN {name} {definition}"))
+    return True
+
+
+def create_index(connection, table, name):
+    """Create an index declared on the models, unless the database has one by that name"""
+    inspector = inspect(connection)
+    existing = {index['name'] for index in inspector.get_indexes(table)}
+    if name in existing:
+        return
+    index = next(index for index in db.metadata.tables[table].indexes if index.name == name)
+    index.create(connection)
+
+
+# === Migrations, in order: the version of a migration is its position (from 1) ===
+
+def place_rating_columns(connection):
+    """Aggregated review ratings on places, filled from the existing reviews"""
+    added = add_column(connection, 'places', 'review_count', 'INTEGER NOT NULL DEFAULT 0')
+    add_column(connection, 'places', 'rating_sum', 'INTEGER NOT NULL DEFAULT 0')
+    add_column(connection, 'places', 'rating_avg', 'FLOAT NOT NULL DEFAULT 0')
+    create_index(connection, 'places', 'ix_places_review_count')
+    create_index(connection, 'places', 'ix_places_rating_avg_review_count')
+
+    if added:
+        places = db.metadata.tables['places']
+        reviews = db.metadata.tables['reviews']
+        of_place = reviews.c.place_id == places.c.id
+        connection.execute(update(places).values(
+            review_count=select(func.count(reviews.c.id)).where(of_place).scalar_subquery(),
+            rating_sum=select(func.coalesce(func.sum(reviews.c.rating), 0)).where(of_place).scalar_subquery(),
+            rating_avg=select(func.coalesce(func.avg(cast(reviews.c.rating, Float)), 0.0)).where(of_place)
+            .scalar_subquery(),
+        ))
+
+
+def place_geohash(connection, batch_size=1000):
+    """Geohash of every place, for the geo searches"""
+    add_column(connection, 'places', 'geohash', 'VARCHAR(9)')
+    create_index(connection, 'places', 'ix_places_geohash')
+
+    places = db.metadata.tables['places']
+    statement = update(places).where(places.c.id == bindparam('place_id')).values(geohash=bindparam('hash'))
+    while True:
+        rows = connection.execute(
+            select(places.c.id, places.c.latitude, places.c.longitude)
+            .where(places.c.geohash.is_(None)).limit(batch_size)
+        ).all()
+        if not rows:
+            return
+        connection.execute(statement, [
+            # 9: the geohash column length (Place.GEOHASH_PRECISION)
+            {'place_id': place_id, 'hash': geo.encode(latitude, longitude, 9)}
+            for place_id, latitude, longitude in rows
+        ])
+
+
+def foreign_key_and_sort_indexes(connection):
+    """Indexes on the foreign keys and on the columns used for lookups and ordering"""
+    create_index(connection, 'places', 'ix_places_owner_id')
+    create_index(connection, 'places', 'ix_places_created_at_id')
+    create_index(connection, 'reviews', 'ix_reviews_place_id')
+    create_index(connection, 'reviews', 'ix_reviews_rating')
+    create_index(connection, 'amenities', 'ix_amenities_name')
+    create_index(connection, 'place_amenity', 'ix_place_amenity_amenity_id')
+
+
+def cascading_foreign_keys(connection):
+    """
+    ON DELETE CASCADE on the foreign keys (see the models' passive_deletes).
+
+    Only MySQL can change a foreign key in place, SQLite would need every
+    table rebuilt: SQLite databases are for development and tests, recreate them.
+    """
+    if connection.dialect.name != 'mysql':
+        return
+    inspector = inspect(connection)
+    for table in ('places', 'reviews', 'place_amenity'):
+        for foreign_key in inspector.get_foreign_keys(table):
+            if (foreign_key.get('options') or {}).get('ondelete', '').upper() == 'CASCADE':
+                continue
+            columns = ', '.join(foreign_key['constrained_columns'])
+            referred = ', '.join(foreign_key['referred_columns'])
+            connection.execute(text(f"ALTER TABLE {table} DROP FOREIGN KEY {foreign_key['name']}"))
+            connection.execute(text(
+                f"ALTER TABLE {table} ADD CONSTRAINT {foreign_key['name']} FOREIGN KEY ({columns}) "
+                f"REFERENCES {foreign_key['referred_table']} ({referred}) ON DELETE CASCADE"
+            ))
+
+
+UUID_COLUMNS = {
+    'users': ('id',),
+    'amenities': ('id',),
+    'places': ('id', 'owner_id'),
+    'reviews': ('id', 'place_id', 'user_id'),
+    'place_amenity': ('place_id', 'amenity_id'),
+}
+UUID_PATTERN = '^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$'
+
+
+def binary_uuid_keys(connection):
+    """
+    Ids and foreign keys stored as BINARY(16) instead of CHAR(36) (see UUIDString).
+
+    Existing rows keep their ids, only their storage changes. Only MySQL stores
+    them as binary, other databases keep the strings.
+
+    Raises:
+        RuntimeError: If a row has an id that is not a UUID, nothing is changed then
+    """
+    if connection.dialect.name != 'mysql':
+        return
+    inspector = inspect(connection)
+    pending = []
+    for table, columns in UUID_COLUMNS.items():
+        types = {column['name']: column['type'].__class__.__name__ for column in inspector.get_columns(table)}
+        for column in columns:
+            if types[column] == 'BINARY':
+                continue
+            if types[column] != 'VARBINARY':  # VARBINARY: a previous run stopped halfway, rows are checked
+                bad = connection.scalar(text(f"SELECT COUNT(*) FROM {table} WHERE {column} NOT REGEXP :pattern"),
+                                        {'pattern': UUID_PATTERN})
+                if bad:
+                    raise RuntimeError(f"{bad} rows of {table} have a {column} that is not a UUID, fix them first")
+            pending.append((table, column))
+    if not pending:
+        return
+
+    # Both sides of a foreign key must have the same type while it exists
+    for table in ('places', 'reviews', 'place_amenity'):
+        for foreign_key in inspector.get_foreign_keys(table):
+            connection.execute(text(f"ALTER TABLE {table} DROP FOREIGN KEY {foreign_key['name']}"))
+
+    # CHAR -> VARBINARY keeps the text, which is then packed to 16 bytes in
+    # place. MODIFY keeps the primary keys and the indexes on the columns.
+    for table, column in pending:
+        connection.execute(text(f"ALTER TABLE {table} MODIFY {column} VARBINARY(36) NOT NULL"))
+        connection.execute(text(f"UPDATE {table} SET {column} = UNHEX(REPLACE({column}, '-', '')) "
+                                f"WHERE LENGTH({column}) = 36"))
+        connection.execute(text(f"ALTER TABLE {table} MODIFY {column} BINARY(16) NOT NULL"))
+
+    # Recreated from the models, so that a rerun after a failure finds them too
+    for table in ('places', 'reviews', 'place_amenity'):
+        for foreign_key in db.metadata.tables[table].foreign_key_constraints:
+            columns = ', '.join(column.name for column in foreign_key.columns)
+            referred = ', '.join(element.column.name for element in foreign_key.elements)
+            connection.execute(text(
+                f"ALTER TABLE {table} ADD FOREIGN KEY ({columns}) "
+                f"REFERENCES {foreign_key.referred_table.name} ({referred}) ON DELETE CASCADE"
+            ))
+
+
+MIGRATIONS = [
+    place_rating_columns,
+    place_geohash,
+    foreign_key_and_sort_indexes,
+    cascading_foreign_keys,
+    binary_uuid_keys,
+]
+
+
+def applied_versions(engine):
+    """Versions recorded in schema_version (creates the table if needed)"""
+    with engine.begin() as connection:
+        schema_version.create(connection, checkfirst=True)
+        return set(connection.scalars(select(schema_version.c.version)))
+
+
+def pending(engine):
+    """
+    Names of the migrations missing from the database, read only.
+
+    Returns:
+        list: Names of the migrations migrate() would apply
+    """
+    with engine.connect() as connection:
+        if not inspect(connection).has_table(schema_version.name):
+            return [migration.__name__ for migration in MIGRATIONS]
+        applied = set(connection.scalars(select(schema_version.c.version)))
+    return [migration.__name__ for version, migration in enumerate(MIGRATIONS, start=1) if version not in applied]
+
+
+@contextmanager
+def migration_lock(engine):
+    """
+    Hold the MySQL named lock LOCK_NAME for the block, on its own connection.
+    SQLite serializes the writers of its file anyway.
+
+    Raises:
+        RuntimeError: If another process kept the lock for LOCK_TIMEOUT seconds
+    """
+    if engine.dialect.name != 'mysql':
+        yield
+        return
+    with engine.connect() as connection:
+        acquired = connection.scalar(text("SELECT GET_LOCK(:name, :timeout)"),
+                                     {'name': LOCK_NAME, 'timeout': LOCK_TIMEOUT})
+        if acquired != 1:
+            raise RuntimeError(f"Another process is migrating the database (lock {LOCK_NAME})")
+        try:
+            yield
+        finally:
+            connection.execute(text("SELECT RELEASE_LOCK(:name)"), {'name': LOCK_NAME})
+
+
+def migrate(engine):
+    """
+    Apply the migrations missing from the database, in order.
+
+    Returns:
+        list: Names of the migrations applied
+    """
+    with migration_lock(engine):
+        # Read under the lock: what another process applied meanwhile is skipped
+        applied = applied_versions(engine)
+        names = []
+        for version, migration in enumerate(MIGRATIONS, start=1):
+            if version in applied:
+                continue
+            with engine.begin() as connection:
+                migration(connection)
+                connection.execute(schema_version.insert().values(
+                    version=version, name=migration.__name__, applied_at=datetime.now(timezone.utc)
+                ))
+            names.append(migration.__name__)
+    return names
@@ -20,6 +20,21 @@ class Repository(ABC):
     def get_by_attribute(self, attr_name, attr_value):
         pass
 
+    def get_many(self, obj_ids):
+        pass
+
+    def add_all(self, objs):
+        pass
+
+    def exists(self, obj_id):
+        pass
+
+    def count(self):
+        pass
+
+    def delete_many(self, obj_ids):
+        pass
+
 class InMemoryRepository(Repository):
     def __init__(self):
         self._storage = {}
@@ -55,3 +70,25 @@ class InMemoryRepository(Repository):
     def get_by_attribute(self, attr_name, attr_value):
         # print(f"Looking for objects with {attr_name}={attr_value} in repository {id(self)}")
         return next((obj for obj in self._storage.values() if getattr(obj, attr_name) == attr_value), None)
+
+    def get_many(self, obj_ids):
+        """Objects of the given ids, in the order of the ids, unknown ids are skipped"""
+        return [self._storage[obj_id] for obj_id in dict.fromkeys(obj_ids) if obj_id in self._storage]
+
+    def add_all(self, objs):
+        for obj in objs:
+            self._storage[obj.id] = obj
+
+    def exists(self, obj_id):
+        return obj_id in self._storage
+
+    def count(self):
+        return len(self._storage)
+
+    def delete_many(self, obj_ids):
+        """Delete the objects of the given ids, returns how many were deleted"""
+        deleted = 0
+        for obj_id in dict.fromkeys(obj_ids):
+            if self._storage.pop(obj_id, None) is not None:
+                deleted += 1
+        return deleted
@@ -0,0 +1,81 @@
+"""
+Unit of work: several repository writes, one database transaction.
+
+Outside of a transaction() block every repository write commits on its own.
+Inside one, the writes are only flushed (sent to the database, so later
+queries in the block see them) and the block commits once at its end, or
+rolls everything back if an exception leaves it. Blocks can be nested, only
+the outermost one commits.
+
+The state lives on flask.g, like the identity map, so it never outlives the
+application context (one request). An error inside a block aborts the whole
+unit of work: after a failed flush the session must be rolled back anyway.
+
+Grouping is opt-in: a request only commits once if its writes run inside
+a transaction() block. The endpoints don't open one around the whole
+request, their writes outside of the facade's own blocks commit one by one.
+"""
+from contextlib import contextmanager
+from flask import g, has_app_context
+from part3.app.extensions import db
+
+
+def active():
+    """True inside a transaction() block"""
+    return has_app_context() and g.get('unit_of_work_depth', 0) > 0
+
+
+def commit():
+    """Commit a repository write, or only flush it inside a transaction() block"""
+    if active():
+        db.session.flush()
+    else:
+        db.session.commit()
+
+
+def after_commit(callback):
+    """Run callback once the current transaction() block committed, right away outside of one"""
+    if active():
+        g.unit_of_work_callbacks.append(callback)
+    else:
+        callback()
+
+
+def on_rollback(callback):
+    """Run callback if the current transaction() block rolls back, never outside of one"""
+    if active():
+        g.unit_of_work_rollbacks.append(callback)
+
+
+@contextmanager
+def transaction():
+    """
+    Group the repository writes of the block in a single transaction.
+
+    Raises:
+        Whatever the block raised, after rolling back the transaction
+    """
+    depth = g.get('unit_of_work_depth', 0)
+    if depth == 0:
+        g.unit_of_work_callbacks = []
+        g.unit_of_work_rollbacks = []
+    g.unit_of_work_depth = depth + 1
+    try:
+        yield
+        if depth == 0:
+            db.session.commit()
+    except BaseException:
+        if depth == 0:
+            db.session.rollback()
+            g.unit_of_work_depth = depth
+            rollbacks, g.unit_of_work_rollbacks = g.unit_of_work_rollbacks, []
+            for callback in rollbacks:
+                callback()
+        raise
+    finally:
+        g.unit_of_work_depth = depth
+
+    if depth == 0:
+        callbacks, g.unit_of_work_callbacks = g.unit_of_work_callbacks, []
+        for callback in callbacks:
+            callback()
@@ -0,0 +1,325 @@
+"""
+Bulk import of amenities, places and reviews from NDJSON.
+
+Every line is a JSON object with a "type" ("amenity", "place" or "review")
+and the same fields as the matching POST endpoint, e.g.
+
+    {"type": "amenity", "id": "<amenity id>", "name": "Wi-Fi"}
+    {"type": "place", "id": "<place id>", "title": "Loft", "price": 80, "latitude": -37.8, "longitude": 144.9, "amenities": ["<amenity id>"]}
+    {"type": "review", "place_id": "<place id>", "user_id": "<user id>", "text": "Great", "rating": 5}
+
+Rows may carry their own "id", a UUID string like the ids the API hands out,
+so that later rows can refer to them. Every row
+is validated with the model validators, then rows are written in batches:
+one transaction per batch and one executemany INSERT per table, references
+(owners, amenities, places, users) are resolved with one IN query per batch.
+A bad row is reported with its line number and skipped, the others go in,
+including lines that are not valid UTF-8. Reviews follow the rules of the
+API: nobody reviews their own place or the same place twice.
+"""
+from collections import defaultdict
+import json
+from sqlalchemy import Float, bindparam, case, cast, insert, inspect, select, tuple_, update
+from sqlalchemy.exc import SQLAlchemyError
+from part3.app import db
+from part3.app.models.amenity import Amenity
+from part3.app.models.place import Place, place_amenity
+from part3.app.models.review import Review
+from part3.app.models.user import User
+from part3.app.services import ids
+
+ROW_TYPES = ('amenity', 'place', 'review')
+
+
+class ModelRow:
+    """
+    Stand-in for a model instance that only runs the model's validation.
+
+    The model's own validators and setters (Place's @validates methods,
+    Review.set_rating, ...) run against it and store their result as plain
+    attributes. Building a mapped instance does the same checks but also sets
+    up ORM state and fires attribute events for every field, which is most of
+    the cost of an import.
+    """
+
+    # model -> (column keys, {key: default factory}, {key: validator}), read once from the mapper
+    _schemas = {}
+
+    def __init__(self, model):
+        if model not in ModelRow._schemas:
+            defaults = {}
+            for column in model.__table__.columns:
+                if column.default is not None:
+                    default = column.default
+                    defaults[column.key] = (lambda arg=default.arg: arg) if default.is_scalar else (lambda arg=default.arg: arg(None))
+            validators = {key: method for key, (method, _) in inspect(model).validators.items()}
+            ModelRow._schemas[model] = ([column.key for column in model.__table__.columns], defaults, validators)
+        self._model = model
+        self._keys, self._defaults, self._validators = ModelRow._schemas[model]
+        self.__dict__.update(dict.fromkeys(self._keys))
+
+    def __getattr__(self, name):
+        # Helpers the validators call on self (valid_string_length, refresh_geohash, ...)
+        attribute = getattr(self._model, name)
+        return attribute.__get__(self) if callable(attribute) else attribute
+
+    def validate(self, key, value):
+        """Set a field through the model's @validates method, like assigning it on an instance"""
+        validator = self._validators.get(key)
+        setattr(self, key, validator(self, key, value) if validator else value)
+
+    def values(self):
+        """Column name -> value ready for a Core INSERT, with the column defaults filled in"""
+        values = {key: self.__dict__[key] for key in self._keys}
+        for key, default in self._defaults.items():
+            if values[key] is None:
+                values[key] = default()
+        return values
+
+
+class BulkImporter:
+    """
+    Streams NDJSON rows into the database in batched transactions.
+
+    Attributes:
+        batch_size (int): Number of lines written per transaction
+        default_owner_id (str): Owner of the places that don't give an owner_id
+        imported (dict): Number of rows imported by type
+        errors (list): {'line': int, 'error': str} of the rejected rows, capped at MAX_REPORTED_ERRORS
+        failed (int): Number of rejected rows
+    """
+
+    MAX_REPORTED_ERRORS = 1000
+
+    def __init__(self, batch_size=1000, default_owner_id=None):
+        self.batch_size = batch_size
+        self.default_owner_id = default_owner_id
+        self.imported = {row_type: 0 for row_type in ROW_TYPES}
+        self.errors = []
+        self.failed = 0
+        self.lines = 0
+
+    def run(self, lines):
+        """
+        Import every line of an NDJSON stream.
+
+        Args:
+            lines (iterable): str or bytes lines, blank lines are skipped
+        Returns:
+            dict: The import report (see report())
+        """
+        batch = []
+        for line_number, line in enumerate(lines, start=1):
+            if isinstance(line, bytes):
+                try:
+                    line = line.decode('utf-8')
+                except UnicodeDecodeError as e:
+                    # A rejected row like any other, earlier batches are committed already
+                    self.lines += 1
+                    self._error(line_number, f"Line is not valid UTF-8: {e.reason} at byte {e.start}")
+                    continue
+            if not line.strip():
+                continue
+            self.lines += 1
+            batch.append((line_number, line))
+            if len(batch) >= self.batch_size:
+                self._import_batch(batch)
+                batch = []
+        if batch:
+            self._import_batch(batch)
+        return self.report()
+
+    def report(self):
+        """
+        Returns:
+            dict: lines read, rows imported by type, number of failed rows and their errors
+        """
+        return {
+            'lines': self.lines,
+            'imported': dict(self.imported),
+            'failed': self.failed,
+            'errors': list(self.errors)
+        }
+
+    def _error(self, line_number, message):
+        self.failed += 1
+        if len(self.errors) < self.MAX_REPORTED_ERRORS:
+            self.errors.append({'line': line_number, 'error': message})
+
+    def _parse(self, batch):
+        """Decode and validate the rows of a batch, grouped by type"""
+        rows = {row_type: [] for row_type in ROW_TYPES}
+        for line_number, line in batch:
+            try:
+                data = json.loads(line)
+                if not isinstance(data, dict):
+                    raise ValueError("Each line must be a JSON object")
+                row_type = data.get('type')
+                if row_type not in ROW_TYPES:
+                    raise ValueError(f"Unknown row type {row_type!r}, expected one of {', '.join(ROW_TYPES)}")
+                row = getattr(self, f'_build_{row_type}')(data)
+            except (ValueError, TypeError) as e:
+                self._error(line_number, str(e))
+                continue
+            rows[row_type].append((line_number, data, row))
+        return rows
+
+    @staticmethod
+    def _apply_id(row, data):
+        if data.get('id') is not None:
+            if not ids.is_valid(data['id']):
+                raise ValueError("id must be a UUID string")
+            row.id = data['id']
+        return row.values()
+
+    def _build_amenity(self, data):
+        amenity = ModelRow(Amenity)
+        amenity.set_name(data.get('name'))
+        amenity.description = data.get('description')
+        return self._apply_id(amenity, data)
+
+    def _build_place(self, data):
+        amenity_ids = data.get('amenities') or []
+        if not isinstance(amenity_ids, list) or not all(isinstance(a, str) for a in amenity_ids):
+            raise ValueError("amenities must be a list of amenity ids")
+        # Same fields, in the same order, as Place.__init__
+        place = ModelRow(Place)
+        for key in ('title', 'description', 'price', 'latitude', 'longitude'):
+            place.validate(key, data.get(key))
+        place.validate('owner_id', data.get('owner_id') or self.default_owner_id)
+        return self._apply_id(place, data)
+
+    def _build_review(self, data):
+        if not data.get('place_id') or not data.get('user_id'):
+            raise ValueError("place_id and user_id are required")
+        review = ModelRow(Review)
+        review.set_text(data.get('text'))
+        review.set_rating(data.get('rating'))
+        review.place_id = data['place_id']
+        review.user_id = data['user_id']
+        return review.values()
+
+    def _existing_ids(self, model, candidates):
+        """Ids of the list that are already rows of model's table (one IN query)"""
+        if not candidates:
+            return set()
+        return set(db.session.scalars(select(model.id).where(model.id.in_(set(candidates)))))
+
+    def _place_owners(self, place_ids):
+        """place id -> owner_id of the places of the list that exist (one IN query)"""
+        if not place_ids:
+            return {}
+        return dict(db.session.execute(select(Place.id, Place.owner_id).where(Place.id.in_(set(place_ids)))).all())
+
+    def _keep_new(self, model, rows):
+        """Drop (and report) rows whose id is already taken, earlier batches are committed already"""
+        taken = self._existing_ids(model, [row['id'] for _, _, row in rows])
+        kept = []
+        for line_number, data, row in rows:
+            if row['id'] in taken:
+                self._error(line_number, f"{model.__name__} with ID {row['id']} already exists")
+                continue
+            taken.add(row['id'])
+            kept.append((line_number, data, row))
+        return kept
+
+    def _import_batch(self, batch):
+        rows = self._parse(batch)
+        written = []  # (line_number, row_type) of the rows lost if the batch fails
+        try:
+            self._insert_amenities(rows['amenity'], written)
+            self._insert_places(rows['place'], written)
+            self._insert_reviews(rows['review'], written)
+            db.session.commit()
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            for line_number, row_type in written:
+                self.imported[row_type] -= 1
+                self._error(line_number, f"Batch rejected by the database: {e.__class__.__name__}")
+
+    def _insert_amenities(self, rows, written):
+        rows = self._keep_new(Amenity, rows)
+        if rows:
+            db.session.execute(insert(Amenity.__table__), [row for _, _, row in rows])
+        for line_number, _, row in rows:
+            self.imported['amenity'] += 1
+            written.append((line_number, 'amenity'))
+
+    def _insert_places(self, rows, written):
+        rows = self._keep_new(Place, rows)
+        owners = self._existing_ids(User, [row['owner_id'] for _, _, row in rows])
+        # Amenities of this batch are already inserted, the IN query sees them
+        amenities = self._existing_ids(Amenity, [amenity_id for _, data, _ in rows
+                                                 for amenity_id in data.get('amenities') or []])
+
+        places = []
+        links = []
+        for line_number, data, row in rows:
+            if row['owner_id'] not in owners:
+                self._error(line_number, f"User with ID {row['owner_id']} not found")
+                continue
+            amenity_ids = list(dict.fromkeys(data.get('amenities') or []))
+            missing = [amenity_id for amenity_id in amenity_ids if amenity_id not in amenities]
+            if missing:
+                self._error(line_number, f"Amenity with ID {missing[0]} not found")
+                continue
+            places.append(row)
+            links.extend({'place_id': row['id'], 'amenity_id': amenity_id} for amenity_id in amenity_ids)
+            self.imported['place'] += 1
+            written.append((line_number, 'place'))
+
+        if places:
+            db.session.execute(insert(Place.__table__), places)
+        if links:
+            db.session.execute(insert(place_amenity), links)
+
+    def _insert_reviews(self, rows, written):
+        if not rows:
+            return
+        # Places of this batch are already inserted, the IN query sees them
+        owners = self._place_owners([row['place_id'] for _, _, row in rows])
+        users = self._existing_ids(User, [row['user_id'] for _, _, row in rows])
+        pairs = {(row['user_id'], row['place_id']) for _, _, row in rows}
+        reviewed = {tuple(pair) for pair in db.session.execute(
+            select(Review.user_id, Review.place_id).where(tuple_(Review.user_id, Review.place_id).in_(pairs))
+        )}
+
+        reviews = []
+        deltas = defaultdict(lambda: [0, 0])
+        for line_number, _, row in rows:
+            pair = (row['user_id'], row['place_id'])
+            if row['place_id'] not in owners:
+                self._error(line_number, f"Place with ID {row['place_id']} not found")
+            elif row['user_id'] not in users:
+                self._error(line_number, f"User with ID {row['user_id']} not found")
+            elif owners[row['place_id']] == row['user_id']:
+                self._error(line_number, "You cannot review your own place")
+            elif pair in reviewed:
+                self._error(line_number, f"User {row['user_id']} has already reviewed place {row['place_id']}")
+            else:
+                reviewed.add(pair)
+                reviews.append(row)
+                deltas[row['place_id']][0] += 1
+                deltas[row['place_id']][1] += row['rating']
+                self.imported['review'] += 1
+                written.append((line_number, 'review'))
+
+        if reviews:
+            db.session.execute(insert(Review.__table__), reviews)
+            self._adjust_ratings(deltas)
+
+    @staticmethod
+    def _adjust_ratings(deltas):
+        """Same UPDATE as PlaceRepository.adjust_rating, one executemany for the whole batch"""
+        places = Place.__table__
+        new_count = places.c.review_count + bindparam('count_delta')
+        new_sum = places.c.rating_sum + bindparam('rating_delta')
+        statement = update(places).where(places.c.id == bindparam('place_id')).ordered_values(
+            (places.c.rating_avg, case((new_count > 0, cast(new_sum, Float) / new_count), else_=0.0)),
+            (places.c.review_count, new_count),
+            (places.c.rating_sum, new_sum),
+        )
+        db.session.execute(statement, [
+            {'place_id': place_id, 'count_delta': count, 'rating_delta': rating}
+            for place_id, (count, rating) in deltas.items()
+        ])
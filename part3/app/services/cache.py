@@ -0,0 +1,77 @@
+from collections import OrderedDict
+from threading import Lock
+import time
+
+
+class EntityCache:
+    """
+    Small per-process LRU cache with a time to live.
+
+    Used by the HBnBFacade to keep serialized entities (plain dicts) by id,
+    so repeated lookups of the same user/place/amenity don't hit the database.
+    Entries are dropped when they are older than `ttl` seconds, when the cache
+    is full (least recently used first) or when invalidated after a write.
+
+    Attributes:
+        maxsize (int): Maximum number of entries kept
+        ttl (float): Seconds an entry stays valid
+        hits (int): Number of lookups answered from the cache
+        misses (int): Number of lookups that had to go to the database
+    """
+
+    def __init__(self, maxsize=1024, ttl=60, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key):
+        """
+        Return the cached value for key, or None on a miss/expired entry.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at > self._clock():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def set(self, key, value):
+        """Store value under key, evicting the least recently used entry if full"""
+        with self._lock:
+            self._entries[key] = (value, self._clock() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key):
+        """Forget a single entry (after an update or delete)"""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        """Forget every entry, the hit/miss counters are kept"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """
+        Returns:
+            dict: hits, misses, current size and settings of the cache
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'ttl': self.ttl
+            }
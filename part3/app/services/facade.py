@@ -2,10 +2,49 @@ from part3.app.services.repositories.UserRepository import UserRepository
 from part3.app.services.repositories.PlaceRepository import PlaceRepository
 from part3.app.services.repositories.ReviewRepository import ReviewRepository
 from part3.app.services.repositories.AmenityRepository import AmenityRepository
+from part3.app.services.repositories.RevokedTokenRepository import RevokedTokenRepository
 from part3.app.models.user import User
 from part3.app.models.place import Place
 from part3.app.models.review import Review
 from part3.app.models.amenity import Amenity
+from part3.app.services.cache import EntityCache
+from part3.app.persistence import identity_map, unit_of_work
+from part3.app.services import geo, ids
+from part3.app.services.revocation import RevocationList
+from part3.app.services.search_index import PlaceSearchIndex
+from part3.app.services.bulk_import import BulkImporter
+from part3.app.services.passwords import HasherBusy
+from part3.app.extensions import passwords
+from flask_jwt_extended import create_access_token, create_refresh_token
+from sqlalchemy.exc import IntegrityError
+from contextlib import contextmanager
+from datetime import datetime, timezone
+import base64
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def encode_place_cursor(place):
+    """Build an opaque page cursor from the (created_at, id) of a place"""
+    raw = json.dumps([place.created_at.isoformat(), place.id])
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii')
+
+
+def decode_place_cursor(cursor):
+    """
+    Turn a page cursor back into a (created_at, id) tuple.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        created_at, place_id = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        return datetime.fromisoformat(created_at), place_id
+    except (TypeError, ValueError, UnicodeError) as err:
+        raise ValueError("Invalid cursor") from err
+
 
 class HBnBFacade:
     """
@@ -18,15 +57,152 @@ class HBnBFacade:
     centralizing business logic and keeping the API layer clean.
     """
 
-    def __init__(self):
+    # Largest page the places listing will return in one request
+    MAX_PAGE_SIZE = 100
+
+    # Read-through cache settings for the serialized user/place/amenity lookups
+    CACHE_SIZE = 1024
+    CACHE_TTL = 60
+
+    # Home page featured lists, dropped by every place write, and recomputed
+    # at least every FEATURED_TTL seconds (the ratings change with the reviews)
+    FEATURED_CATEGORIES = ('new', 'top-rated', 'popular', 'unique')
+    FEATURED_TTL = 30
+    MAX_FEATURED = 24
+    # A "unique stay" offers more than 3 amenities
+    UNIQUE_MIN_AMENITIES = 4
+
+    # Largest radius accepted by the nearby search
+    MAX_RADIUS_KM = 500
+    # Candidates read per result of the nearby search, closest first by the
+    # database's approximate distance, before the exact distance sort
+    NEARBY_CANDIDATES_PER_RESULT = 4
+
+    def __init__(self, app=None):
         """
         Initialize repositories for each entity type.
         Each repository is responsible for storing and retrieving a specific entity type.
+
+        The repositories reach the database of the app the facade is bound to
+        (init_app), which create_app() does for the module-level facade.
         """
+        # Persistence backend of the bound app, see persistence.backends
+        self.backend = None
         self.user_repo = UserRepository()
         self.place_repo = PlaceRepository()
         self.review_repo = ReviewRepository()
         self.amenity_repo = AmenityRepository()
+        # Revoked sessions and used refresh tokens, checked on every JWT
+        self.revocations = RevocationList(RevokedTokenRepository())
+
+        # Per-process caches of serialized entities by id
+        # Every write below invalidates the entries it makes stale
+        self.user_cache = EntityCache(self.CACHE_SIZE, self.CACHE_TTL)
+        self.place_cache = EntityCache(self.CACHE_SIZE, self.CACHE_TTL)
+        self.amenity_cache = EntityCache(self.CACHE_SIZE, self.CACHE_TTL)
+        # Precomputed featured lists by (category, limit)
+        self.featured_cache = EntityCache(64, self.FEATURED_TTL)
+        # Full-text index of place titles/descriptions, built on the first search
+        self.search_index = PlaceSearchIndex()
+
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """
+        Serve an application from now on: the database of its persistence
+        backend, and caches emptied of whatever the previous app had stored.
+        """
+        self.backend = app.config['PERSISTENCE_BACKEND']
+        self.clear_caches()
+        with app.app_context():
+            self.revocations.init_app(app)
+        app.extensions['hbnb_facade'] = self
+
+    def cache_stats(self):
+        """Hit/miss counters of the entity caches"""
+        return {
+            'users': self.user_cache.stats(),
+            'places': self.place_cache.stats(),
+            'amenities': self.amenity_cache.stats(),
+            'featured': self.featured_cache.stats()
+        }
+
+    def clear_caches(self):
+        """Empty every entity cache (e.g. when switching to another database)"""
+        self.user_cache.clear()
+        self.place_cache.clear()
+        self.amenity_cache.clear()
+        self.featured_cache.clear()
+        self.search_index.reset()
+
+    @contextmanager
+    def transaction(self):
+        """
+        Run several facade operations as one unit of work: one commit at the
+        end of the block, nothing written if it raises.
+
+            with facade.transaction():
+                facade.create_amenity(...)
+                facade.add_amenity_to_place(...)
+
+        On a rollback only the cache entries the block stored are dropped
+        (see _cache_set), the request identity map is emptied with the session.
+        Writes outside of a block still commit one by one.
+
+        Raises:
+            Whatever the block raised, after the rollback
+        """
+        with unit_of_work.transaction():
+            yield
+
+    @staticmethod
+    def _cache_set(cache, key, value):
+        """Cache a value; stored inside a transaction it may come from rows the block rolls back"""
+        cache.set(key, value)
+        unit_of_work.on_rollback(lambda: cache.invalidate(key))
+
+    def _cached(self, cache, kind, obj_id, load):
+        """
+        Serialized entity lookup: the request identity map first, then the
+        process wide cache, and only then the database through `load`.
+
+        Args:
+            cache (EntityCache): Process cache for this entity type
+            kind (str): Identity map kind, e.g. 'Place:serialized'
+            obj_id (str): ID of the entity
+            load (callable): Returns the serialized entity or None if not found
+        Returns:
+            dict: A copy of the serialized entity (callers may modify it), or None
+        """
+        data = identity_map.lookup(kind, obj_id)
+        if data is None:
+            data = cache.get(obj_id)
+            if data is None:
+                data = load(obj_id)
+                if data is None:
+                    return None
+                self._cache_set(cache, obj_id, data)
+            identity_map.remember(kind, obj_id, data)
+        return dict(data)
+
+    def _forget(self, cache, kind, obj_id):
+        """Drop a serialized entity from both the request map and the cache"""
+        cache.invalidate(obj_id)
+        identity_map.forget(kind, obj_id)
+        # Inside a transaction another request can cache the old row again until the commit
+        unit_of_work.after_commit(lambda: cache.invalidate(obj_id))
+
+    def _forget_all(self, cache, kind):
+        """Drop every serialized entity of a type (after a cascading change)"""
+        cache.clear()
+        identity_map.forget_kind(kind)
+        unit_of_work.after_commit(cache.clear)
+
+    def _forget_featured(self):
+        """Drop the featured lists after a place was created, changed or deleted"""
+        self.featured_cache.clear()
+        unit_of_work.after_commit(self.featured_cache.clear)
 
 # === User operations ===
     def create_user(self, user_data):
@@ -55,6 +231,19 @@ class HBnBFacade:
     def get_user(self, user_id):
         return self.user_repo.get(user_id)
 
+    def get_user_data(self, user_id):
+        """
+        Retrieve the public (serialized) data of a user, through the cache.
+
+        Returns:
+            dict: The serialized user if found, None otherwise
+        """
+        def load(user_id):
+            user = self.user_repo.get(user_id)
+            return user.serialized if user else None
+
+        return self._cached(self.user_cache, 'User:serialized', user_id, load)
+
     def get_user_by_parameter(self, key, value):
         return self.user_repo.get_by_attribute(key, value)
     
@@ -63,7 +252,8 @@ class HBnBFacade:
 
     def get_all_users(self):
         users = self.user_repo.get_all()
-        print(f"All users in repository: {[u.id for u in users]}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("All users in repository: %s", [u.id for u in users])
         return [u.serialize() for u in users]
 
     def update_user(self, user_id, user_data):
@@ -75,12 +265,81 @@ class HBnBFacade:
             return False
         # process password separate due to hashing requirement
         if 'password' in user_data:
-            password = user_data.pop('password')
-            user.hash_password(password)
+            # The validator of User.password stores the hash
+            user.password = user_data.pop('password')
 
         user.update(user_data)
+        self._forget(self.user_cache, 'User:serialized', user_id)
         return user
 
+    def rehash_password(self, user, password):
+        """
+        Store a new hash of the password a user just logged in with, when the
+        stored one was made with a lower bcrypt cost than the configured one.
+
+        Returns:
+            bool: True if the hash was replaced
+        """
+        if not passwords.needs_rehash(user.password):
+            return False
+        try:
+            self.user_repo.update(user.id, {'password': password})
+        except (ValueError, HasherBusy):
+            # A password older than the current rules, or a login burst: the
+            # login still succeeds with the old hash, next one will try again
+            return False
+        return True
+
+    def issue_tokens(self, user, session=None):
+        """
+        Access and refresh token of a user, in a new session unless one is given.
+
+        Returns:
+            dict: access_token, refresh_token and user_id
+        """
+        claims = {"is_admin": user.is_admin, "fam": session or ids.new_id()}
+        return {
+            'access_token': create_access_token(identity=user.id, additional_claims=claims),
+            'refresh_token': create_refresh_token(identity=user.id, additional_claims=claims),
+            'user_id': user.id
+        }
+
+    def refresh_tokens(self, payload):
+        """
+        Exchange a refresh token (its decoded payload) for a new pair in the
+        same session. The signature check of the JWT replaces the password check.
+
+        Returns:
+            dict: The new tokens (see issue_tokens), None if the token was
+            already exchanged (the session is then revoked) or its user is gone
+        """
+        if not self.revocations.use_refresh_token(payload):
+            # A refresh token is used once: whoever replays it holds a copy
+            self.revocations.revoke_session(payload)
+            return None
+        user = self.user_repo.get(payload['sub'])
+        if user is None:
+            return None
+        # Claims read again: the admin status may have changed since the login
+        return self.issue_tokens(user, session=payload['fam'])
+
+    def revoke_session(self, payload):
+        """Log out the session of a decoded token, its access and refresh tokens stop working"""
+        self.revocations.revoke_session(payload)
+
+    def is_session_revoked(self, payload):
+        """True if the session of a decoded token was revoked, without a query almost always"""
+        return self.revocations.is_revoked(payload)
+
+    def purge_revoked_tokens(self):
+        """
+        Forget the revocations of tokens that have expired anyway.
+
+        Returns:
+            int: Number of revocations deleted
+        """
+        return self.revocations.purge(datetime.now(timezone.utc))
+
     def delete_user(self, user_id):
         """
         Delete a user by ID
@@ -95,7 +354,20 @@ class HBnBFacade:
         if not user:
             return False
 
-        self.user_repo.delete(user_id)
+        with self.transaction():
+            # The user's reviews of other places go with the user,
+            # take them out of those places' aggregated ratings first
+            for place_id, count, rating_sum in self.review_repo.get_rating_totals_by_user(user_id):
+                self.place_repo.adjust_rating(place_id, -count, -rating_sum)
+
+            self.user_repo.delete(user_id)
+        self._forget(self.user_cache, 'User:serialized', user_id)
+        # Places and reviews of the user are cascaded away with it by the database
+        identity_map.forget_kind('Place')
+        identity_map.forget_kind('Review')
+        self._forget_all(self.place_cache, 'Place:serialized')
+        self._forget_featured()
+        self.search_index.reset()
         return True
       
 # === Place Operations ===
@@ -103,15 +375,8 @@ class HBnBFacade:
     def create_place(self, place_data):
         """Create a Place Object with optional amenities"""
 
-        # Extract amenity IDs from the request
-        amenity_ids = place_data.get('amenities', [])
-        amenities = []
-
-        # Get actual amenity objects from the repository
-        for amenity_id in amenity_ids:
-            amenity = self.amenity_repo.get(amenity_id)
-            if amenity:
-                amenities.append(amenity)
+        # Get actual amenity objects from the repository (one query, unknown ids are skipped)
+        amenities = self.amenity_repo.get_many(place_data.get('amenities', []))
 
         # Verify owner exists (This is JWT (Authorization) Related)
         owner_id = place_data.get('owner_id')
@@ -130,6 +395,10 @@ class HBnBFacade:
         )
 
         self.place_repo.add(place)
+        self._forget_featured()
+        # The search index only sees committed places
+        place_id, title, description = place.id, place.title, place.description
+        unit_of_work.after_commit(lambda: self.search_index.add(place_id, title, description))
         return place
         
     def get_place(self, place_id):
@@ -141,28 +410,163 @@ class HBnBFacade:
         Returns:
             dict: The place data as a dictionary if found, None otherwise
         """
-        place = self.place_repo.get(place_id)
-        if place is None:
-            return None
-            
+        def load(place_id):
+            # Its amenities and reviews are then read with one query each
+            place = self.place_repo.get(place_id)
+            return place.serialization() if place else None
+
         # Return the serialized place, not the place object itself
-        return place.serialization()
+        # (a copy, callers add keys like 'owner' to it)
+        return self._cached(self.place_cache, 'Place:serialized', place_id, load)
+
+    def get_place_owner_id(self, place_id):
+        """
+        Owner of a place, for the authorization checks: only the owner_id
+        column is read, the place is neither loaded nor serialized.
+
+        Returns:
+            str: The owner's ID, None if the place does not exist
+        """
+        return self.place_repo.get_owner_id(place_id)
 
     def get_all_places(self):
         all_places = self.place_repo.get_all()
         json_places = [item.serialization() for item in all_places]
         return json_places
+
+    def get_top_rated_places(self, limit=6):
+        """Places with the best average rating (from the aggregated columns)"""
+        return [place.summary_serialization() for place in self.place_repo.get_top_rated(limit)]
+
+    def get_most_popular_places(self, limit=6):
+        """Places with the most reviews (from the aggregated columns)"""
+        return [place.summary_serialization() for place in self.place_repo.get_most_popular(limit)]
+
+    def get_featured_places(self, category, limit=6):
+        """
+        Places for one of the home page carousel categories, sorted by the database.
+        Results are cached for FEATURED_TTL seconds, a little staleness is fine there.
+
+        Args:
+            category (str): 'new', 'top-rated', 'popular' or 'unique'
+            limit (int): Number of places, clamped between 1 and MAX_FEATURED
+        Returns:
+            list: Place summaries
+        Raises:
+            ValueError: If the category is unknown
+        """
+        if category not in self.FEATURED_CATEGORIES:
+            raise ValueError(f"Unknown category {category}")
+        limit = max(1, min(limit, self.MAX_FEATURED))
+
+        featured = self.featured_cache.get((category, limit))
+        if featured is None:
+            if category == 'new':
+                places = self.place_repo.get_newest(limit)
+            elif category == 'top-rated':
+                places = self.place_repo.get_top_rated(limit)
+            elif category == 'popular':
+                places = self.place_repo.get_most_popular(limit)
+            else:
+                places = self.place_repo.get_most_amenities(limit, self.UNIQUE_MIN_AMENITIES)
+            featured = [place.summary_serialization() for place in places]
+            self._cache_set(self.featured_cache, (category, limit), featured)
+        return list(featured)
+
+    def backfill_place_ratings(self):
+        """
+        Recompute review_count, rating_sum and rating_avg of every place from the reviews table.
+        Needed once for data created before the columns existed.
+
+        Returns:
+            int: Number of places updated
+        """
+        updated = self.place_repo.recompute_ratings()
+        self._forget_all(self.place_cache, 'Place:serialized')
+        return updated
+
+    def search_places(self, query, page=1, per_page=20):
+        """
+        Full-text search over place titles and descriptions, best match first.
+
+        Args:
+            query (str): Search words
+            page (int): 1-based page number
+            per_page (int): Results per page, clamped to MAX_PAGE_SIZE
+        Returns:
+            dict: {'results': [...], 'total': int, 'page': int, 'per_page': int}
+                each result is a place summary with its relevance 'score'
+        """
+        page = max(1, page)
+        per_page = max(1, min(per_page, self.MAX_PAGE_SIZE))
+
+        if not self.search_index.built:
+            self.search_index.rebuild(self.place_repo.get_search_documents())
+
+        total, ranked = self.search_index.search(query, (page - 1) * per_page, per_page)
+        places = {place.id: place for place in self.place_repo.get_places_by_ids([pid for pid, _ in ranked])}
+
+        results = []
+        for place_id, score in ranked:
+            # Skip places deleted by another process since the index was built
+            if place_id in places:
+                place_data = places[place_id].summary_serialization()
+                place_data['score'] = round(score, 4)
+                results.append(place_data)
+        return {'results': results, 'total': total, 'page': page, 'per_page': per_page}
+
+    def get_places_page(self, limit=20, cursor=None, min_price=None, max_price=None,
+                        amenity_ids=None, owner_id=None):
+        """
+        Retrieve one page of places, filtered and paginated by the database.
+
+        Args:
+            limit (int): Page size, clamped between 1 and MAX_PAGE_SIZE
+            cursor (str, optional): next_cursor returned with the previous page
+            min_price, max_price (float, optional): Price per night range
+            amenity_ids (list, optional): Amenities the place must all offer
+            owner_id (str, optional): Owner of the places
+        Returns:
+            dict: {'places': [...], 'next_cursor': str or None}
+        Raises:
+            ValueError: If the cursor is invalid
+        """
+        limit = max(1, min(limit, self.MAX_PAGE_SIZE))
+        after = decode_place_cursor(cursor) if cursor else None
+
+        places, has_more = self.place_repo.get_places_page(
+            limit, after=after, min_price=min_price, max_price=max_price,
+            amenity_ids=amenity_ids, owner_id=owner_id)
+
+        return {
+            'places': [place.summary_serialization() for place in places],
+            'next_cursor': encode_place_cursor(places[-1]) if has_more else None
+        }
         
     def update_place(self, place_id, place_data):
         new_data = self.place_repo.update(place_id, place_data)
+        self._forget(self.place_cache, 'Place:serialized', place_id)
+        self._forget_featured()
+        title, description = new_data.title, new_data.description
+        unit_of_work.after_commit(lambda: self.search_index.add(place_id, title, description))
         return new_data.serialization()
 
     def delete_place(self, place_id):
-        place = self.get_place(place_id)
-        if not place:
+        """
+        Delete a place, its reviews and amenity links, none of them loaded.
+
+        Returns:
+            bool: True if the place was deleted, False if it does not exist
+        """
+        if not self.place_repo.exists(place_id):
             return False
 
         self.place_repo.delete(place_id)
+        # Its reviews are cascaded away by the database
+        identity_map.forget_kind('Review')
+        self._forget(self.place_cache, 'Place:serialized', place_id)
+        self._forget_featured()
+        unit_of_work.after_commit(lambda: self.search_index.remove(place_id))
         return True
     
     def get_place_by_title(self, title):
@@ -173,7 +577,98 @@ class HBnBFacade:
 
     def get_place_by_location(self, latitude, longitude):
         return self.place_repo.get_place_by_location(latitude, longitude)
+
+    def get_places_in_bbox(self, min_lat, min_lng, max_lat, max_lng, limit=None):
+        """
+        Places inside a map viewport.
+
+        Args:
+            min_lat, max_lat (float): Latitude range, -90.0 to 90.0
+            min_lng, max_lng (float): Longitude range, -180.0 to 180.0
+                (min_lng > max_lng for a viewport crossing the antimeridian)
+            limit (int, optional): Clamped to MAX_PAGE_SIZE
+        Returns:
+            list: Place summaries
+        Raises:
+            ValueError: If the box is invalid
+        """
+        if not (-90.0 <= min_lat <= max_lat <= 90.0):
+            raise ValueError("Latitudes must be within -90.0 to 90.0 and min_lat <= max_lat")
+        if not (-180.0 <= min_lng <= 180.0 and -180.0 <= max_lng <= 180.0):
+            raise ValueError("Longitudes must be within -180.0 to 180.0")
+        limit = max(1, min(limit or self.MAX_PAGE_SIZE, self.MAX_PAGE_SIZE))
+
+        places = self.place_repo.get_places_in_bbox(min_lat, min_lng, max_lat, max_lng, limit)
+        return [place.summary_serialization() for place in places]
+
+    def get_places_nearby(self, latitude, longitude, radius_km, limit=20):
+        """
+        Places within radius_km of a point, closest first.
+        Candidates come from the bounding box of the circle (geohash index),
+        at most NEARBY_CANDIDATES_PER_RESULT per result, the closest ones by
+        an approximate distance, whatever the number of places in the box.
+        Then the exact haversine distance is checked.
+
+        Args:
+            limit (int): At least 1, clamped to MAX_PAGE_SIZE
+        Returns:
+            list: Place summaries with an added 'distance_km'
+        Raises:
+            ValueError: If the point, radius or limit is invalid
+        """
+        if not (-90.0 <= latitude <= 90.0 and -180.0 <= longitude <= 180.0):
+            raise ValueError("Invalid coordinates")
+        if not 0 < radius_km <= self.MAX_RADIUS_KM:
+            raise ValueError(f"Radius must be between 0 and {self.MAX_RADIUS_KM} km")
+        if limit < 1:
+            raise ValueError("Limit must be a positive number")
+        limit = min(limit, self.MAX_PAGE_SIZE)
+
+        box = geo.bounding_box(latitude, longitude, radius_km)
+        candidates = self.place_repo.get_places_closest_in_bbox(
+            latitude, longitude, box, limit * self.NEARBY_CANDIDATES_PER_RESULT)
+        nearby = []
+        for place in candidates:
+            distance = geo.haversine_km(latitude, longitude, place.latitude, place.longitude)
+            if distance <= radius_km:
+                nearby.append((distance, place))
+        nearby.sort(key=lambda item: (item[0], item[1].id))
+
+        results = []
+        for distance, place in nearby[:limit]:
+            place_data = place.summary_serialization()
+            place_data['distance_km'] = round(distance, 3)
+            results.append(place_data)
+        return results
+
+    def backfill_place_geohashes(self):
+        """
+        Compute the geohash of places created before the column existed.
+
+        Returns:
+            int: Number of places updated
+        """
+        return self.place_repo.fill_missing_geohashes()
     
+    def bulk_import(self, lines, default_owner_id=None, batch_size=1000):
+        """
+        Import amenities, places and reviews from NDJSON lines (see services/bulk_import.py).
+
+        Args:
+            lines (iterable): NDJSON lines, str or bytes
+            default_owner_id (str): Owner of the places without an owner_id
+            batch_size (int): Lines written per transaction
+        Returns:
+            dict: {'lines', 'imported': {type: count}, 'failed', 'errors': [{'line', 'error'}]}
+        """
+        report = BulkImporter(batch_size, default_owner_id).run(lines)
+        # The rows were written around the repositories, drop everything derived from them
+        self._forget_all(self.place_cache, 'Place:serialized')
+        self._forget_all(self.amenity_cache, 'Amenity:serialized')
+        self.featured_cache.clear()
+        self.search_index.reset()
+        return report
+
     def get_places_by_user(self, user_id):
         """Get all places owned by a specific user"""
         user = self.get_user(user_id)
@@ -181,7 +676,7 @@ class HBnBFacade:
             return None
             
         # Get all places from this user
-        places = [place.serialization() for place in user.places]
+        places = [place.serialization() for place in self.place_repo.get_places_by_owner(user_id)]
         return places
     
 
@@ -223,6 +718,9 @@ class HBnBFacade:
             return False
 
         self.amenity_repo.delete(amenity_id)
+        self._forget(self.amenity_cache, 'Amenity:serialized', amenity_id)
+        # Serialized places embed their amenities
+        self._forget_all(self.place_cache, 'Place:serialized')
         return True
 
     def get_amenity(self, amenity_id):
@@ -234,17 +732,32 @@ class HBnBFacade:
         Returns:
             Amenity: The amenity instance if found, None otherwise
         """
-        # Debug output
-        print(f"Looking for amenity with ID: {amenity_id}")
-        all_amenities = self.amenity_repo.get_all()
-        print(f"Available amenities: {[a.id for a in all_amenities]}")
-        
-        # Try to get the amenity
+        # One primary key lookup, update_amenity/delete_amenity go through here too
         amenity = self.amenity_repo.get(amenity_id)
-        print(f"Found amenity: {amenity}")
-        
+        logger.debug("Amenity %s: %s", amenity_id, amenity)
         return amenity
 
+    def get_amenity_data(self, amenity_id):
+        """
+        Retrieve the serialized data of an amenity, through the cache.
+
+        Returns:
+            dict: The serialized amenity if found, None otherwise
+        """
+        def load(amenity_id):
+            amenity = self.amenity_repo.get(amenity_id)
+            if amenity is None:
+                return None
+            return {
+                'id': amenity.id,
+                'name': amenity.name,
+                'description': amenity.description,
+                'created_at': str(amenity.created_at),
+                'updated_at': str(amenity.updated_at)
+            }
+
+        return self._cached(self.amenity_cache, 'Amenity:serialized', amenity_id, load)
+
     def get_all_amenities(self):
         """
         Retrieve all amenities.
@@ -284,6 +797,8 @@ class HBnBFacade:
 
         # Save the updated amenity
         self.amenity_repo.update(amenity_id, amenity_data)
+        self._forget(self.amenity_cache, 'Amenity:serialized', amenity_id)
+        self._forget_all(self.place_cache, 'Place:serialized')
 
         return amenity
 
@@ -322,10 +837,6 @@ class HBnBFacade:
         if not amenity:
             return False
         
-        # Debug statement
-        print(f"place.amenities type: {type(place.amenities)}")
-        print(f"place.amenities: {place.amenities}")
-
         # Fail safe check for the user not to review or rate more than once
         for place_amenity in place.amenities:
             if place_amenity.id == amenity.id:
@@ -334,6 +845,8 @@ class HBnBFacade:
         # Add the amenity to the place's amenities
         place.amenities.append(amenity)
         self.place_repo.update(place_id, {})
+        self._forget(self.place_cache, 'Place:serialized', place_id)
+        self._forget_featured()
 
         return True
             
@@ -367,6 +880,8 @@ class HBnBFacade:
             if place_amenity.id == amenity.id:
                 place.amenities.remove(place_amenity)
                 self.place_repo.update(place_id, {})  # Save changes
+                self._forget(self.place_cache, 'Place:serialized', place_id)
+                self._forget_featured()
                 return True
                 
         return False  # Amenity not found in place's amenities
@@ -377,37 +892,25 @@ class HBnBFacade:
         """
         Create a new review and store it in the repository.
         Additionally, link the review to its associated place.
+
+        Queries: whether the place and the user exist, by primary key, then
+        the insert and the rating update of the place. Neither is loaded.
         """
-        # Get place and user objects first
         place_id = review_data.get('place_id')
         user_id = review_data.get('user_id')
 
-        # Add direct duplicate check here
-        all_reviews = self.review_repo.get_all()
-        for review in all_reviews:
-            if str(review.user_id) == str(user_id) and str(review.place_id) == str(place_id):
-                raise ValueError(f"User {user_id} has already reviewed place {place_id}")
-        
-        # Debug all repository data
-        print(f"Looking for user with ID: {user_id}")
-        all_users = self.user_repo.get_all()
-        print(f"All users in repository: {[u.id for u in all_users]}")
-        
-        # Get the raw objects, not serialized versions
-        place_obj = self.place_repo.get(place_id)
-        user_obj = self.user_repo.get(user_id)
-        
-        print(f"Found place: {place_obj}")
-        print(f"Found user: {user_obj}")
+        # Existence only: loading the place would read its reviews and amenities
+        place_found = self.place_repo.exists(place_id)
+        user_found = self.user_repo.exists(user_id)
+        logger.debug("Review of place %s by user %s: found %s, %s", place_id, user_id, place_found, user_found)
 
         # Fail safe
-        if not place_obj:
+        if not place_found:
             raise ValueError(f"Place with ID {place_id} not found")
 
-        if not user_obj:
+        if not user_found:
             raise ValueError(f"User with ID {user_id} not found")
 
-        # Create review with direct object references
         review = Review(
             text=review_data.get('text'),
             rating=review_data.get('rating'),
@@ -415,9 +918,17 @@ class HBnBFacade:
             user_id=user_id
         )
 
-        # Store in repository
-        self.review_repo.add(review)
-
+        # Store in repository, together with the place's new rating
+        # Duplicates are rejected by the unique (user_id, place_id) constraint
+        try:
+            with self.transaction():
+                self.review_repo.add(review)
+                self.place_repo.adjust_rating(place_id, 1, review.rating)
+        except IntegrityError:
+            raise ValueError(f"User {user_id} has already reviewed place {place_id}")
+
+        # Serialized places embed their reviews
+        self._forget(self.place_cache, 'Place:serialized', place_id)
         return review
 
     def delete_review(self, review_id):
@@ -432,7 +943,12 @@ class HBnBFacade:
         if not review:
             return False
 
-        self.review_repo.delete(review_id)
+        place_id = review.place_id
+        rating = review.rating
+        with self.transaction():
+            self.review_repo.delete(review_id)
+            self.place_repo.adjust_rating(place_id, -1, -rating)
+        self._forget(self.place_cache, 'Place:serialized', place_id)
         return True
 
     def get_review(self, review_id):
@@ -447,6 +963,16 @@ class HBnBFacade:
 
         return self.review_repo.get(review_id)
 
+    def get_review_author(self, review_id):
+        """
+        Author and place of a review, for the authorization checks: only
+        those two columns are read, the review is not loaded.
+
+        Returns:
+            tuple: (user_id, place_id), None if the review does not exist
+        """
+        return self.review_repo.get_author(review_id)
+
     def get_all_reviews(self):
         """
         Retrieve all reviews.
@@ -476,6 +1002,9 @@ class HBnBFacade:
         if not review:
             return None
 
+        old_place_id = review.place_id
+        old_rating = review.rating
+
         # Update only the provided fields
         if 'text' in review_data:
             review.set_text(review_data['text'])
@@ -483,8 +1012,18 @@ class HBnBFacade:
         if 'rating' in review_data:
             review.set_rating(review_data['rating'])
 
-        # Save the updated review
-        self.review_repo.update(review_id, review_data)
+        with self.transaction():
+            # Save the updated review
+            self.review_repo.update(review_id, review_data)
+
+            # Keep the aggregated ratings in step (an admin may also move the review)
+            if review.place_id != old_place_id:
+                self.place_repo.adjust_rating(old_place_id, -1, -old_rating)
+                self.place_repo.adjust_rating(review.place_id, 1, review.rating)
+                self._forget(self.place_cache, 'Place:serialized', old_place_id)
+            elif review.rating != old_rating:
+                self.place_repo.adjust_rating(review.place_id, 0, review.rating - old_rating)
+        self._forget(self.place_cache, 'Place:serialized', review.place_id)
 
         return review
 
@@ -498,10 +1037,6 @@ class HBnBFacade:
         Returns:
             list: List of reviews for the place
         """
-        place_dict = self.get_place(place_id)
-        if not place_dict:
-            return None
-
         # I need to get the place object to parse
         place_obj = self.place_repo.get(place_id)
         if not place_obj:
@@ -513,7 +1048,7 @@ class HBnBFacade:
                 'id': review.id,
                 'text': review.text,
                 'rating': review.rating,
-                'user_id': review.user.id,
+                'user_id': review.user_id,
                 'created_at': str(review.created_at) if hasattr(review, 'created_at') else None,
                 'updated_at': str(review.updated_at) if hasattr(review, 'updated_at') else None
             } for review in place_obj.reviews
@@ -529,12 +1064,7 @@ class HBnBFacade:
         Returns:
                 bool: True if the user has already reviewed the place, False otherwise
         """
-        reviews = self.review_repo.get_all()
-        for review in reviews:
-            if review.user_id == user_id and review.place_id == place_id:
-                return True
-            
-        return False
+        return self.review_repo.user_has_reviewed_place(user_id, place_id)
         
     def get_review_by_id(self, id):
         return self.review_repo.get_review_by_id(id)
@@ -0,0 +1,148 @@
+"""
+Geohash and distance helpers for the place geo search.
+
+A geohash interleaves longitude/latitude bits and writes them in base32, so
+places that are close to each other share a common prefix. Every place stores
+its geohash (see Place.geohash) in an indexed column: all places inside one
+geohash cell are then a single index range scan (geohash >= cell AND
+geohash < cell + '{').
+"""
+import math
+
+BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+# Sorts right after 'z', the last base32 character, used to close a prefix range
+PREFIX_END = '{'
+EARTH_RADIUS_KM = 6371.0088
+
+
+def encode(latitude, longitude, precision=9):
+    """
+    Geohash of a point.
+
+    Args:
+        latitude (float): -90.0 to 90.0
+        longitude (float): -180.0 to 180.0
+        precision (int): Number of characters (9 is about 5 meters)
+    Returns:
+        str: The geohash
+    """
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    geohash = []
+    bits = 0
+    bit_count = 0
+    even = True  # Longitude bits come first
+
+    while len(geohash) < precision:
+        if even:
+            middle = (lng_range[0] + lng_range[1]) / 2
+            if longitude >= middle:
+                bits = (bits << 1) | 1
+                lng_range[0] = middle
+            else:
+                bits = bits << 1
+                lng_range[1] = middle
+        else:
+            middle = (lat_range[0] + lat_range[1]) / 2
+            if latitude >= middle:
+                bits = (bits << 1) | 1
+                lat_range[0] = middle
+            else:
+                bits = bits << 1
+                lat_range[1] = middle
+        even = not even
+
+        bit_count += 1
+        if bit_count == 5:
+            geohash.append(BASE32[bits])
+            bits = 0
+            bit_count = 0
+
+    return ''.join(geohash)
+
+
+def cell_size(precision):
+    """
+    Returns:
+        tuple: (height in degrees of latitude, width in degrees of longitude) of a cell
+    """
+    total_bits = 5 * precision
+    lng_bits = (total_bits + 1) // 2
+    lat_bits = total_bits // 2
+    return 180.0 / (1 << lat_bits), 360.0 / (1 << lng_bits)
+
+
+def covering_cells(min_lat, min_lng, max_lat, max_lng, max_cells=16):
+    """
+    Geohash cells that together cover a bounding box.
+
+    Picks the finest precision that still covers the box with at most
+    max_cells cells, so the database does a few short index range scans.
+    A box crossing the antimeridian (min_lng > max_lng) is split in two.
+
+    Returns:
+        list: Sorted geohash prefixes
+    """
+    if min_lng > max_lng:
+        return sorted(set(covering_cells(min_lat, min_lng, max_lat, 180.0, max_cells // 2)
+                          + covering_cells(min_lat, -180.0, max_lat, max_lng, max_cells // 2)))
+
+    best = ['']  # Precision 0: one cell, the whole world
+    for precision in range(1, 10):
+        cell_lat, cell_lng = cell_size(precision)
+        rows = math.floor(max_lat / cell_lat) - math.floor(min_lat / cell_lat) + 1
+        columns = math.floor(max_lng / cell_lng) - math.floor(min_lng / cell_lng) + 1
+        if rows * columns > max_cells:
+            break
+
+        cells = set()
+        lat = min_lat
+        for _ in range(rows):
+            lng = min_lng
+            for _ in range(columns):
+                cells.add(encode(min(lat, 90.0), min(lng, 180.0), precision))
+                lng += cell_lng
+            lat += cell_lat
+        # Make sure the far corners are in, whatever the float rounding did
+        cells.add(encode(max_lat, max_lng, precision))
+        cells.add(encode(min_lat, max_lng, precision))
+        cells.add(encode(max_lat, min_lng, precision))
+        best = sorted(cells)
+
+    return best
+
+
+def haversine_km(lat1, lng1, lat2, lng2):
+    """Great circle distance between two points in kilometers"""
+    lat1, lng1, lat2, lng2 = map(math.radians, (lat1, lng1, lat2, lng2))
+    a = (math.sin((lat2 - lat1) / 2) ** 2
+         + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+def bounding_box(latitude, longitude, radius_km):
+    """
+    Smallest latitude/longitude box containing the circle of radius_km around a point.
+
+    Returns:
+        tuple: (min_lat, min_lng, max_lat, max_lng), min_lng > max_lng if it crosses the antimeridian
+    """
+    delta_lat = math.degrees(radius_km / EARTH_RADIUS_KM)
+    min_lat = latitude - delta_lat
+    max_lat = latitude + delta_lat
+
+    # Close to a pole the circle covers every longitude
+    if min_lat <= -90.0 or max_lat >= 90.0:
+        return max(min_lat, -90.0), -180.0, min(max_lat, 90.0), 180.0
+
+    delta_lng = math.degrees(radius_km / (EARTH_RADIUS_KM * math.cos(math.radians(latitude))))
+    if delta_lng >= 180.0:
+        return min_lat, -180.0, max_lat, 180.0
+
+    min_lng = longitude - delta_lng
+    max_lng = longitude + delta_lng
+    if min_lng < -180.0:
+        min_lng += 360.0
+    if max_lng > 180.0:
+        max_lng -= 360.0
+    return min_lat, min_lng, max_lat, max_lng
@@ -0,0 +1,78 @@
+"""
+Verified JWT claims kept per token.
+
+Every protected request decodes its token: base64, JSON and an HMAC
+signature check, then the claims validation. A client sends the same
+access token with every request until it expires, so the claims of the
+tokens verified recently are kept, keyed by the encoded token, and a
+token seen again costs a dictionary lookup. The key is the whole encoded
+token, signature included, so a token altered in any way is a miss and
+goes through the full verification.
+
+A cached token is accepted with the same time checks the library applies
+when it decodes one: its exp and nbf claims, give or take JWT_DECODE_LEEWAY.
+Past them the token goes through the full decoding, which raises the
+usual error. The blocklist (services.revocation) is still checked on
+every request, a logged out session is refused whether its token is
+cached or not.
+
+The public hooks of flask_jwt_extended (decode_key_loader, the blocklist
+and verification loaders) all run around the decoding, none can skip it,
+so the cache overrides JWTManager._decode_jwt_from_config, the private
+method decode_token() and the view decorators go through. The package is
+pinned in requirements.txt and a test fails if that signature changes.
+"""
+from datetime import timedelta
+import time
+from flask import current_app
+from flask_jwt_extended import JWTManager
+from part3.app.services.cache import EntityCache
+
+
+class CachingJWTManager(JWTManager):
+    """
+    JWTManager remembering the claims of the tokens it verified.
+
+    Attributes:
+        claims_cache (EntityCache): Claims by encoded token, its stats()
+            tell how many requests skipped the verification
+    """
+
+    CACHE_SIZE = 4096
+    # Upper bound only, an entry is dropped at the exp of its token anyway
+    CACHE_TTL = 900
+
+    def __init__(self, app=None, add_context_processor=False, clock=time.time):
+        self.claims_cache = EntityCache(self.CACHE_SIZE, self.CACHE_TTL)
+        self._clock = clock
+        super().__init__(app, add_context_processor)
+
+    def init_app(self, app, add_context_processor=False):
+        # Tokens verified with another app's key must be verified again
+        self.claims_cache.clear()
+        super().init_app(app, add_context_processor)
+
+    def _decode_jwt_from_config(self, encoded_token, csrf_value=None, allow_expired=False):
+        # Double submit CSRF and expired tokens are rare, they skip the cache
+        if csrf_value is not None or allow_expired:
+            return super()._decode_jwt_from_config(encoded_token, csrf_value, allow_expired)
+
+        claims = self.claims_cache.get(encoded_token)
+        if claims is not None and self._in_time(claims):
+            return dict(claims)
+
+        claims = super()._decode_jwt_from_config(encoded_token, csrf_value, allow_expired)
+        self.claims_cache.set(encoded_token, dict(claims))
+        return claims
+
+    def _in_time(self, claims):
+        """The exp and nbf checks of PyJWT, with the leeway of the app"""
+        leeway = current_app.config['JWT_DECODE_LEEWAY']
+        if isinstance(leeway, timedelta):
+            leeway = leeway.total_seconds()
+        now = self._clock()
+        if 'exp' in claims and claims['exp'] <= now - leeway:
+            return False
+        if 'nbf' in claims and claims['nbf'] > now + leeway:
+            return False
+        return True
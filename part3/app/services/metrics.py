@@ -0,0 +1,167 @@
+"""
+Per endpoint request metrics, exported in the Prometheus text format.
+
+Metrics.init_app() hooks the Flask app: every request records its latency
+and response size, and the SQL statements it sends (counted per request,
+each one timed) through SQLAlchemy cursor events. Everything is labelled
+with the method and the URL rule of the endpoint ('/api/v1/places/<place_id>',
+never the actual id), so the number of series stays bounded. Statements
+sent outside of a request (startup, CLI commands) are not recorded.
+
+Histograms keep a count per bucket, the sum and the count of observations,
+like the Prometheus client libraries, and render() writes the cumulative
+buckets. Admins read them at GET /api/v1/metrics.
+"""
+import bisect
+import threading
+import time
+from flask import g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Content type of the text exposition format
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Histogram:
+    """
+    Observations counted per bucket, per set of label values.
+
+    Attributes:
+        name (str): Metric name
+        labels (tuple): Label names, observe() takes their values in this order
+        buckets (tuple): Upper bounds of the buckets, ascending (+Inf is implied)
+    """
+
+    def __init__(self, name, description, labels, buckets):
+        self.name = name
+        self.description = description
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        # Label values -> [count per bucket..., count above the last bucket, sum, count]
+        self._series = {}
+
+    def observe(self, values, value):
+        """Record one observation, the caller holds the lock of the registry"""
+        series = self._series.get(values)
+        if series is None:
+            series = self._series[values] = [0] * (len(self.buckets) + 3)
+        series[bisect.bisect_left(self.buckets, value)] += 1
+        series[-2] += value
+        series[-1] += 1
+
+    def render(self):
+        """The lines of the metric in the text exposition format"""
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} histogram"]
+        bounds = [_number(bound) for bound in self.buckets] + ['+Inf']
+        for values, series in sorted(self._series.items()):
+            labels = ','.join(f'{name}="{_escape(value)}"' for name, value in zip(self.labels, values))
+            cumulative = 0
+            for bound, count in zip(bounds, series):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'{self.name}_sum{{{labels}}} {_number(series[-2])}')
+            lines.append(f'{self.name}_count{{{labels}}} {series[-1]}')
+        return lines
+
+
+class Metrics:
+    """
+    The request and SQL metrics of the apps it is bound to (init_app).
+
+    Attributes:
+        request_duration (Histogram): Seconds per request, by method, route and status
+        response_size (Histogram): Response body bytes, by method and route
+        queries_per_request (Histogram): SQL statements sent by a request, by method and route
+        query_duration (Histogram): Seconds per SQL statement, by method and route of its request
+    """
+
+    LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+    SIZE_BUCKETS = (100, 1000, 10000, 100000, 1000000)
+    QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 25, 50, 100)
+    QUERY_LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._listening = False
+        self.reset()
+
+    def reset(self):
+        """Start over with no observation"""
+        with self._lock:
+            self.request_duration = Histogram(
+                'hbnb_http_request_duration_seconds', 'Time spent serving a request.',
+                ('method', 'route', 'status'), self.LATENCY_BUCKETS)
+            self.response_size = Histogram(
+                'hbnb_http_response_size_bytes', 'Size of the response body.',
+                ('method', 'route'), self.SIZE_BUCKETS)
+            self.queries_per_request = Histogram(
+                'hbnb_db_queries_per_request', 'SQL statements sent while serving a request.',
+                ('method', 'route'), self.QUERY_COUNT_BUCKETS)
+            self.query_duration = Histogram(
+                'hbnb_db_query_duration_seconds', 'Time spent executing one SQL statement.',
+                ('method', 'route'), self.QUERY_LATENCY_BUCKETS)
+
+    def init_app(self, app):
+        """Record the requests of app from now on, the previous observations are dropped"""
+        self.reset()
+        app.before_request(self._start_request)
+        app.after_request(self._finish_request)
+        if not self._listening:
+            # On the Engine class: every engine, including those created later
+            event.listen(Engine, 'before_cursor_execute', self._start_query)
+            event.listen(Engine, 'after_cursor_execute', self._finish_query)
+            self._listening = True
+
+    @staticmethod
+    def _route():
+        return request.url_rule.rule if request.url_rule is not None else 'unmatched'
+
+    def _start_request(self):
+        g.metrics_started = time.perf_counter()
+        g.metrics_queries = 0
+
+    def _finish_request(self, response):
+        started = g.pop('metrics_started', None)
+        if started is None:
+            # A before_request hook registered earlier answered the request
+            return response
+        elapsed = time.perf_counter() - started
+        route = self._route()
+        size = response.content_length
+        with self._lock:
+            self.request_duration.observe((request.method, route, str(response.status_code)), elapsed)
+            self.queries_per_request.observe((request.method, route), g.pop('metrics_queries', 0))
+            if size is not None:
+                # Streamed responses have no length
+                self.response_size.observe((request.method, route), size)
+        return response
+
+    def _start_query(self, conn, cursor, statement, parameters, context, executemany):
+        if context is not None and has_request_context() and 'metrics_started' in g:
+            # On the execution context: a statement that fails leaves nothing behind
+            context.metrics_started = time.perf_counter()
+
+    def _finish_query(self, conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, 'metrics_started', None)
+        if started is None:
+            return
+        elapsed = time.perf_counter() - started
+        g.metrics_queries += 1
+        with self._lock:
+            self.query_duration.observe((request.method, self._route()), elapsed)
+
+    def render(self):
+        """Every metric in the Prometheus text exposition format"""
+        with self._lock:
+            histograms = (self.request_duration, self.response_size, self.queries_per_request, self.query_duration)
+            lines = [line for histogram in histograms for line in histogram.render()]
+        return '\n'.join(lines) + '\n'
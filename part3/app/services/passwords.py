@@ -0,0 +1,138 @@
+"""
+Password hashing off the request threads.
+
+bcrypt is slow on purpose: hashing or checking a password takes a few
+hundred milliseconds of CPU. Run inline, each one holds a request thread,
+and a burst of logins takes every thread and core the other endpoints
+need. PasswordHasher runs them on a pool of worker processes instead:
+- at most PASSWORD_HASH_WORKERS run at once, the cores logins may take
+- at most PASSWORD_HASH_QUEUE are running or waiting, past that a call
+  raises HasherBusy right away (the API answers 503) rather than queueing
+  requests that would time out anyway
+- PASSWORD_HASH_WORKERS = 0 runs them in the calling thread (tests)
+
+The bcrypt cost (log2 of the number of rounds) is BCRYPT_LOG_ROUNDS, one
+configured value shared by every process. Were each process to pick its
+own, two workers would rehash the password of every login back and forth.
+`flask calibrate-passwords` tells which cost takes PASSWORD_HASH_TARGET_MS
+on a machine. Hashes made with any cost still verify, needs_rehash() only
+asks for a new one when the stored cost is below the configured one: a
+hash is never downgraded.
+"""
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+import threading
+import time
+import flask_bcrypt
+
+MIN_ROUNDS = 10
+MAX_ROUNDS = 16
+
+
+class HasherBusy(Exception):
+    """Every hashing slot is taken, the caller should retry later"""
+
+
+def _hash(password, rounds):
+    return flask_bcrypt.generate_password_hash(password, rounds).decode('utf-8')
+
+
+def _check(hashed, password):
+    return flask_bcrypt.check_password_hash(hashed, password)
+
+
+def _time_hash(rounds):
+    started = time.perf_counter()
+    _hash('calibration', rounds)
+    return time.perf_counter() - started
+
+
+def cost_of(hashed):
+    """bcrypt cost of a hash ('$2b$12$...' gives 12), None if it is not a bcrypt hash"""
+    try:
+        return int(hashed.split('$')[2])
+    except (AttributeError, IndexError, ValueError):
+        return None
+
+
+class PasswordHasher:
+    """
+    bcrypt on a bounded pool of worker processes, set up by init_app().
+
+    Attributes:
+        rounds (int): bcrypt cost of the new hashes
+        workers (int): Worker processes, 0 when hashing in the calling thread
+    """
+
+    def __init__(self, app=None):
+        self.rounds = 12
+        self.workers = 0
+        self._pool = None
+        self._slots = threading.BoundedSemaphore(1)
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.close()
+        self.workers = app.config['PASSWORD_HASH_WORKERS']
+        self._slots = threading.BoundedSemaphore(app.config['PASSWORD_HASH_QUEUE'] or 4 * max(self.workers, 1))
+        if self.workers:
+            context = multiprocessing.get_context('fork') \
+                if 'fork' in multiprocessing.get_all_start_methods() else None
+            self._pool = ProcessPoolExecutor(self.workers, mp_context=context)
+            # With fork the workers all start on the first submit: do it now,
+            # from the thread running create_app, before any request thread exists
+            self._pool.submit(cost_of, '').result()
+        self.rounds = app.config['BCRYPT_LOG_ROUNDS']
+        app.extensions['passwords'] = self
+
+    def _run(self, function, *args):
+        """
+        Run function in a worker and wait for its result.
+
+        Raises:
+            HasherBusy: If PASSWORD_HASH_QUEUE calls are already running or waiting
+        """
+        if not self._slots.acquire(blocking=False):
+            raise HasherBusy("Too many password checks in progress, try again later")
+        try:
+            if self._pool is None:
+                return function(*args)
+            return self._pool.submit(function, *args).result()
+        finally:
+            self._slots.release()
+
+    def calibrate(self, target):
+        """
+        Lowest cost whose hashes take at least target seconds on this machine,
+        between MIN_ROUNDS and MAX_ROUNDS. Timed once at MIN_ROUNDS, every
+        extra round doubles the time. A suggestion for BCRYPT_LOG_ROUNDS, the
+        cost in use never changes (see `flask calibrate-passwords`).
+        """
+        elapsed = self._run(_time_hash, MIN_ROUNDS)
+        rounds = MIN_ROUNDS
+        while elapsed < target and rounds < MAX_ROUNDS:
+            rounds += 1
+            elapsed *= 2
+        return rounds
+
+    def hash(self, password):
+        """bcrypt hash of password with the current cost"""
+        return self._run(_hash, password, self.rounds)
+
+    def verify(self, hashed, password):
+        """True if password matches the hash, whatever cost it was made with"""
+        if hashed is None or password is None:
+            return False
+        return self._run(_check, hashed, password)
+
+    def needs_rehash(self, hashed):
+        """True if the hash was made with a lower cost than the configured one"""
+        cost = cost_of(hashed)
+        return cost is None or cost < self.rounds
+
+    def close(self):
+        """Stop the worker processes"""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
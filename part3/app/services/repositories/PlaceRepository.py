@@ -1,20 +1,254 @@
-from part3.app.models.place import Place
+import math
+from part3.app.models.place import Place, place_amenity
+from part3.app.models.amenity import Amenity
+from part3.app.models.review import Review
 from part3.app import db
+from part3.app.services import geo, ids
+from sqlalchemy import Float, and_, case, cast, delete, func, or_, select, update
+from sqlalchemy.orm import selectinload
 from part3.app.persistence.SQLAlchemy_repository import SQLAlchemyRepository
+from part3.app.persistence import identity_map, unit_of_work
 
 class PlaceRepository(SQLAlchemyRepository):
     def __init__(self):
         super().__init__(Place)
 
+    def eager_options(self):
+        """
+        Place.serialization() reads amenities and reviews, the serializing reads
+        (get_all, get_place_by_id, get_places_by_owner) load both up front so a
+        list of places always costs 3 queries instead of 1 + N. get/get_many stay
+        lazy: writes and existence checks don't pay for the collections.
+        """
+        return [selectinload(Place.amenities), selectinload(Place.reviews)]
+
+    def get_places_by_ids(self, place_ids):
+        """
+        Places of a list of ids with their amenities (what summary_serialization() reads),
+        one IN query per IN_BATCH_SIZE ids. Unknown ids are skipped.
+        """
+        places = []
+        for start in range(0, len(place_ids), self.IN_BATCH_SIZE):
+            batch = place_ids[start:start + self.IN_BATCH_SIZE]
+            places.extend(self.model.query.options(selectinload(Place.amenities)).filter(Place.id.in_(batch)))
+        return places
+
+    def get_all(self):
+        return self.model.query.options(*self.eager_options()).all()
+
+    def get_search_documents(self):
+        """(id, title, description) of every place, without building ORM objects"""
+        return db.session.query(Place.id, Place.title, Place.description).yield_per(1000)
+
+    def get_places_by_owner(self, owner_id):
+        return self.model.query.options(*self.eager_options()).filter_by(owner_id=owner_id).all()
+
+    def delete(self, place_id):
+        """
+        Delete a place with one DELETE statement. Its reviews and amenity links
+        go with it through ON DELETE CASCADE: session.delete() would send one
+        DELETE per review whenever the place's reviews are loaded in the session.
+
+        Returns:
+            bool: True if the place was deleted, False if it does not exist
+        """
+        place_id = ids.normalize(place_id)
+        if place_id is None:
+            return False
+        result = db.session.execute(delete(Place).where(Place.id == place_id))
+        unit_of_work.commit()
+        identity_map.forget('Place', place_id)
+        return result.rowcount > 0
+
+    def get_owner_id(self, place_id):
+        """owner_id of a place (None if it does not exist), one primary key lookup of that column only"""
+        if ids.normalize(place_id) is None:
+            return None
+        return db.session.scalar(select(Place.owner_id).where(Place.id == place_id))
+
     def get_place_by_title(self, title):
         return self.model.query.filter_by(title=title).first()
 
     def get_place_by_id(self, id):
-        return self.model.query.filter_by(id=id).first()
+        return self.model.query.options(*self.eager_options()).filter_by(id=id).first()
 
     def get_place_by_location(self, latitude, longitude):
-        return self.model.query.filter_by(latittude = latitude, longitude=longitude).first()
+        return self.model.query.filter_by(latitude=latitude, longitude=longitude).first()
+
+    def get_places_in_bbox(self, min_lat, min_lng, max_lat, max_lng, limit=None):
+        """
+        Places inside a latitude/longitude box.
+
+        The geohash cells covering the box become a few index range scans,
+        then the exact box is checked on latitude/longitude.
+        A box crossing the antimeridian has min_lng > max_lng.
+        """
+        query = self._in_bbox(min_lat, min_lng, max_lat, max_lng)
+        if limit is not None:
+            query = query.order_by(Place.id).limit(limit)
+        return query.all()
+
+    def get_places_closest_in_bbox(self, latitude, longitude, box, limit):
+        """
+        The limit places of a box closest to a point, closest first.
+
+        The database orders them by the equirectangular approximation of the
+        distance (longitude difference scaled by cos(latitude), the shorter
+        way around the antimeridian), no trigonometry on its side. The order
+        is approximate: the caller checks the exact distances.
+
+        Args:
+            box (tuple): min_lat, min_lng, max_lat, max_lng (see get_places_in_bbox)
+        """
+        d_lat = Place.latitude - latitude
+        d_lng = func.abs(Place.longitude - longitude)
+        d_lng = case((d_lng > 180.0, 360.0 - d_lng), else_=d_lng) * math.cos(math.radians(latitude))
+        query = self._in_bbox(*box).order_by(d_lat * d_lat + d_lng * d_lng, Place.id).limit(limit)
+        return query.all()
+
+    def _in_bbox(self, min_lat, min_lng, max_lat, max_lng):
+        """Query of the places inside a box, with their amenities"""
+        cells = geo.covering_cells(min_lat, min_lng, max_lat, max_lng)
+        query = self.model.query.options(selectinload(Place.amenities))
+        if cells != ['']:
+            query = query.filter(or_(*[
+                and_(Place.geohash >= cell, Place.geohash < cell + geo.PREFIX_END) for cell in cells
+            ]))
+
+        query = query.filter(Place.latitude.between(min_lat, max_lat))
+        if min_lng <= max_lng:
+            query = query.filter(Place.longitude.between(min_lng, max_lng))
+        else:
+            query = query.filter(or_(Place.longitude >= min_lng, Place.longitude <= max_lng))
+        return query
+
+    def fill_missing_geohashes(self, batch_size=1000):
+        """
+        Compute the geohash of places created before the column existed.
+
+        Returns:
+            int: Number of places updated
+        """
+        updated = 0
+        while True:
+            places = self.model.query.filter(Place.geohash.is_(None)).limit(batch_size).all()
+            if not places:
+                return updated
+            for place in places:
+                place.refresh_geohash(place.latitude, place.longitude)
+            unit_of_work.commit()
+            updated += len(places)
     
+    def get_places_page(self, limit, after=None, min_price=None, max_price=None,
+                        amenity_ids=None, owner_id=None):
+        """
+        Keyset paginated listing ordered by (created_at, id).
+
+        Args:
+            limit (int): Maximum number of places to return
+            after (tuple, optional): (created_at, id) of the last place of the previous page
+            min_price (float, optional): Lowest price per night to include
+            max_price (float, optional): Highest price per night to include
+            amenity_ids (list, optional): Only places offering ALL of these amenities
+            owner_id (str, optional): Only places owned by this user
+
+        Returns:
+            tuple: (list of places, bool True if there is another page)
+        """
+        # The listing summary has no reviews, amenities are the only relation read
+        query = self.model.query.options(selectinload(Place.amenities))
+
+        if owner_id is not None:
+            query = query.filter(Place.owner_id == owner_id)
+        if min_price is not None:
+            query = query.filter(Place.price >= min_price)
+        if max_price is not None:
+            query = query.filter(Place.price <= max_price)
+        for amenity_id in amenity_ids or []:
+            query = query.filter(Place.amenities.any(Amenity.id == amenity_id))
+
+        # Seek past the previous page instead of using OFFSET
+        if after is not None:
+            created_at, place_id = after
+            query = query.filter(or_(
+                Place.created_at > created_at,
+                and_(Place.created_at == created_at, Place.id > place_id)
+            ))
+
+        # Fetch one extra row to know if there is a next page
+        places = query.order_by(Place.created_at, Place.id).limit(limit + 1).all()
+        return places[:limit], len(places) > limit
+
+    def adjust_rating(self, place_id, count_delta, rating_delta):
+        """
+        Apply a review change to the aggregated rating columns in one atomic UPDATE.
+
+        Args:
+            place_id (str): ID of the reviewed place
+            count_delta (int): +1 for a new review, -1 for a deleted one, 0 for an edit
+            rating_delta (int): Change of the sum of ratings
+        """
+        new_count = Place.review_count + count_delta
+        new_sum = Place.rating_sum + rating_delta
+        # rating_avg is SET first: MySQL evaluates SET clauses left to right
+        # with already updated values, SQLite uses the old ones. Computing it
+        # from the old columns before they change is correct on both.
+        statement = update(Place).where(Place.id == place_id).ordered_values(
+            (Place.rating_avg, case((new_count > 0, cast(new_sum, Float) / new_count), else_=0.0)),
+            (Place.review_count, new_count),
+            (Place.rating_sum, new_sum),
+        ).execution_options(synchronize_session='fetch')
+        db.session.execute(statement)
+        unit_of_work.commit()
+
+    def recompute_ratings(self):
+        """
+        Backfill the aggregated rating columns of every place from its reviews.
+
+        Returns:
+            int: Number of places updated
+        """
+        reviews_of_place = Review.place_id == Place.id
+        statement = update(Place).values(
+            review_count=select(func.count(Review.id)).where(reviews_of_place).scalar_subquery(),
+            rating_sum=select(func.coalesce(func.sum(Review.rating), 0)).where(reviews_of_place).scalar_subquery(),
+            rating_avg=select(func.coalesce(func.avg(Review.rating), 0.0)).where(reviews_of_place).scalar_subquery(),
+        ).execution_options(synchronize_session=False)
+        result = db.session.execute(statement)
+        unit_of_work.commit()
+        # Objects already in the session still hold the old aggregates
+        db.session.expire_all()
+        return result.rowcount
+
+    def get_top_rated(self, limit, min_reviews=1):
+        """Best average rating first, ties broken by number of reviews"""
+        return self.model.query.options(selectinload(Place.amenities)) \
+            .filter(Place.review_count >= min_reviews) \
+            .order_by(Place.rating_avg.desc(), Place.review_count.desc(), Place.id) \
+            .limit(limit).all()
+
+    def get_most_popular(self, limit):
+        """Most reviewed places first"""
+        return self.model.query.options(selectinload(Place.amenities)) \
+            .order_by(Place.review_count.desc(), Place.rating_avg.desc(), Place.id) \
+            .limit(limit).all()
+
+    def get_newest(self, limit):
+        """Most recently created places first"""
+        return self.model.query.options(selectinload(Place.amenities)) \
+            .order_by(Place.created_at.desc(), Place.id.desc()) \
+            .limit(limit).all()
+
+    def get_most_amenities(self, limit, min_amenities=1):
+        """Places offering the most amenities (at least min_amenities)"""
+        amenity_count = func.count(place_amenity.c.amenity_id)
+        return self.model.query.options(selectinload(Place.amenities)) \
+            .join(place_amenity, place_amenity.c.place_id == Place.id) \
+            .group_by(Place.id) \
+            .having(amenity_count >= min_amenities) \
+            .order_by(amenity_count.desc(), Place.id) \
+            .limit(limit).all()
+
     # Maybe implement get places by PriceRange ?
     # Should ther be a method get ammenities from place ID ?
 
@@ -1,6 +1,8 @@
 from part3.app.models.review import Review
 from part3.app import db
 from part3.app.persistence.SQLAlchemy_repository import SQLAlchemyRepository
+from part3.app.services import ids
+from sqlalchemy import exists, func, select
 
 class ReviewRepository(SQLAlchemyRepository):
     def __init__(self):
@@ -9,9 +11,34 @@ class ReviewRepository(SQLAlchemyRepository):
     def get_review_by_id(self, id):
         return self.model.query.filter_by(id=id).first()
     
+    def get_author(self, review_id):
+        """(user_id, place_id) of a review (None if it does not exist), one primary key lookup of those columns only"""
+        if ids.normalize(review_id) is None:
+            return None
+        return db.session.execute(select(Review.user_id, Review.place_id).where(Review.id == review_id)).first()
+
     def get_review_by_rating(self, rating):
         return self.model.query.filter_by(rating=rating).all()
 
+    def get_rating_totals_by_user(self, user_id):
+        """
+        Number and sum of ratings of a user's reviews, grouped by place.
+
+        Returns:
+            list: (place_id, count, rating_sum) tuples
+        """
+        return db.session.query(Review.place_id, func.count(Review.id), func.sum(Review.rating)) \
+            .filter(Review.user_id == user_id) \
+            .group_by(Review.place_id).all()
+
+    def user_has_reviewed_place(self, user_id, place_id):
+        """EXISTS lookup served by the unique (user_id, place_id) index"""
+        if ids.normalize(user_id) is None or ids.normalize(place_id) is None:
+            return False
+        return db.session.query(
+            exists().where(Review.user_id == user_id, Review.place_id == place_id)
+        ).scalar()
+
     # def get_reviews_by_placeID(self, place_id):
     #     return self.model.query.filter_by(id=place_id).all()
     
@@ -0,0 +1,44 @@
+from part3.app.models.revoked_token import RevokedToken
+from part3.app import db
+from part3.app.persistence.SQLAlchemy_repository import SQLAlchemyRepository
+from part3.app.persistence import unit_of_work
+from sqlalchemy import delete, exists, select
+from sqlalchemy.exc import IntegrityError
+
+class RevokedTokenRepository(SQLAlchemyRepository):
+    def __init__(self):
+        super().__init__(RevokedToken)
+
+    def revoke(self, jti, kind, expires_at):
+        """
+        Record a revoked jti, the primary key makes it atomic across processes.
+
+        Returns:
+            bool: False if it was already revoked
+        """
+        try:
+            self.add(RevokedToken(jti, kind, expires_at))
+        except IntegrityError:
+            return False
+        return True
+
+    def is_revoked(self, jti, kind):
+        return db.session.scalar(select(exists().where(RevokedToken.jti == jti, RevokedToken.kind == kind)))
+
+    def get_revoked_since(self, kind, since, now):
+        """jti of the rows of a kind revoked since a time (None: ever) and not expired at now"""
+        query = select(RevokedToken.jti).where(RevokedToken.kind == kind, RevokedToken.expires_at > now)
+        if since is not None:
+            query = query.where(RevokedToken.revoked_at >= since)
+        return db.session.scalars(query).all()
+
+    def purge_expired(self, now):
+        """
+        Delete the rows whose tokens have expired anyway.
+
+        Returns:
+            int: Number of rows deleted
+        """
+        result = db.session.execute(delete(RevokedToken).where(RevokedToken.expires_at <= now))
+        unit_of_work.commit()
+        return result.rowcount
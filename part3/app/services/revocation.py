@@ -0,0 +1,150 @@
+"""
+Revoked refresh tokens and sessions, checked without a database query.
+
+Login starts a session: its access and refresh tokens carry the session id
+in a 'fam' claim. /auth/refresh exchanges a refresh token for a new pair
+(rotation) and records the old one as used. A used refresh token presented
+again has leaked, and the whole session is revoked. /auth/logout revokes
+the session of the token it is given.
+
+Every request with a JWT asks whether its session was revoked. Revoked
+sessions are stored in the revoked_tokens table, and each process keeps a
+Bloom filter of them. A session missing from the filter (almost every
+request) is answered from memory. A hit, either a revoked session or a
+false positive (ERROR_RATE), is confirmed in the table. Each process picks
+up the sessions other processes revoked within SYNC_SECONDS, with one
+query per interval.
+"""
+from datetime import datetime, timedelta, timezone
+import hashlib
+import math
+import threading
+import time
+from part3.app.models.revoked_token import RevokedToken
+
+
+class BloomFilter:
+    """
+    Set membership in a few bits per item, with false positives but no false negatives.
+
+    Attributes:
+        capacity (int): Items it holds at its error rate, more raise the rate
+        count (int): Items added
+    """
+
+    def __init__(self, capacity, error_rate):
+        self.capacity = capacity
+        self.count = 0
+        self._size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self._hashes = max(1, round(self._size / capacity * math.log(2)))
+        self._bits = bytearray((self._size + 7) // 8)
+
+    def _positions(self, key):
+        # Double hashing: k positions out of the two halves of one digest
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        step = int.from_bytes(digest[8:], 'little') | 1
+        return [(first + i * step) % self._size for i in range(self._hashes)]
+
+    def add(self, key):
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key):
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+
+class RevocationList:
+    """
+    The revoked sessions and used refresh tokens, see the module docstring.
+
+    Attributes:
+        session_lifetime (timedelta): Lifetime of a refresh token, a revoked
+            session can be forgotten that long after the revocation
+    """
+
+    CAPACITY = 10000
+    ERROR_RATE = 0.001
+    SYNC_SECONDS = 5
+
+    def __init__(self, repository, clock=time.monotonic):
+        self.session_lifetime = timedelta(days=30)
+        self._repository = repository
+        self._clock = clock
+        self._lock = threading.Lock()  # Filter updates
+        self._filter = BloomFilter(self.CAPACITY, self.ERROR_RATE)
+        self._synced_at = None
+        self._next_sync = 0
+
+    def init_app(self, app):
+        """Settings of the app, and the revoked sessions of its database (needs an app context)"""
+        self.session_lifetime = app.config['JWT_REFRESH_TOKEN_EXPIRES']
+        self.load()
+
+    def load(self):
+        """Rebuild the filter from the table, with room for twice the revoked sessions"""
+        started = datetime.now(timezone.utc)
+        sessions = self._repository.get_revoked_since(RevokedToken.SESSION, None, started)
+        bloom = BloomFilter(max(self.CAPACITY, 2 * len(sessions)), self.ERROR_RATE)
+        for session in sessions:
+            bloom.add(session)
+        with self._lock:
+            self._filter = bloom
+            self._synced_at = started
+            self._next_sync = self._clock() + self.SYNC_SECONDS
+
+    def _sync(self):
+        """Add the sessions revoked by other processes since the last sync, once per SYNC_SECONDS"""
+        if self._clock() < self._next_sync:
+            return
+        with self._lock:
+            if self._clock() < self._next_sync:
+                return
+            self._next_sync = self._clock() + self.SYNC_SECONDS
+            started = datetime.now(timezone.utc)
+            # Overlap the previous sync: a row committed late keeps its earlier revoked_at
+            since = self._synced_at - timedelta(seconds=self.SYNC_SECONDS)
+            for session in self._repository.get_revoked_since(RevokedToken.SESSION, since, started):
+                if session not in self._filter:
+                    self._filter.add(session)
+            self._synced_at = started
+            full = self._filter.count > self._filter.capacity
+        if full:
+            self.load()
+
+    def is_revoked(self, payload):
+        """True if the session of a decoded JWT was revoked, tokens without a session never are"""
+        session = payload.get('fam')
+        if session is None:
+            return False
+        self._sync()
+        if session not in self._filter:
+            return False
+        return self._repository.is_revoked(session, RevokedToken.SESSION)
+
+    def revoke_session(self, payload):
+        """Revoke the session of a decoded JWT: none of its tokens are accepted anymore"""
+        session = payload.get('fam')
+        if session is None:
+            return
+        self._repository.revoke(session, RevokedToken.SESSION, datetime.now(timezone.utc) + self.session_lifetime)
+        with self._lock:
+            if session not in self._filter:
+                self._filter.add(session)
+
+    def use_refresh_token(self, payload):
+        """
+        Record a refresh token as exchanged.
+
+        Returns:
+            bool: False if it already was, the token was replayed
+        """
+        expires_at = datetime.fromtimestamp(payload['exp'], timezone.utc)
+        return self._repository.revoke(payload['jti'], RevokedToken.REFRESH, expires_at)
+
+    def purge(self, now):
+        """Delete the revocations expired at now, then rebuild the filter without them"""
+        deleted = self._repository.purge_expired(now)
+        self.load()
+        return deleted
@@ -0,0 +1,140 @@
+"""
+In-process full-text index over place titles and descriptions.
+
+Works the same on every database backend (SQLite has no FULLTEXT, MySQL has
+no FTS5). The index is an inverted index: term -> {place_id: term counts}.
+Results are ranked with BM25, title matches weigh more than description ones.
+The facade builds it lazily from the database on the first search and then
+keeps it up to date on create/update/delete of places.
+
+Note: every process has its own index, a place created through another
+process only shows up after that process' index is rebuilt.
+"""
+from collections import Counter
+from threading import Lock
+import math
+import re
+
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+STOP_WORDS = frozenset({
+    'a', 'an', 'and', 'at', 'by', 'for', 'in', 'is', 'it', 'of', 'on', 'or', 'the', 'to', 'with'
+})
+
+
+def tokenize(text):
+    """Lowercase words of a text, without stop words"""
+    if not text:
+        return []
+    return [token for token in TOKEN_PATTERN.findall(text.lower()) if token not in STOP_WORDS]
+
+
+class PlaceSearchIndex:
+    """
+    Inverted index of places with BM25 ranking.
+
+    Attributes:
+        built (bool): False until the index was filled from the database
+    """
+
+    # BM25 parameters and the extra weight of a title match
+    K1 = 1.2
+    B = 0.75
+    TITLE_WEIGHT = 3
+
+    def __init__(self):
+        self.built = False
+        self._postings = {}    # term -> {place_id: weighted term frequency}
+        self._lengths = {}     # place_id -> weighted document length
+        self._documents = {}   # place_id -> terms of the place, to remove it quickly
+        self._total_length = 0
+        self._lock = Lock()
+
+    def _terms(self, title, description):
+        terms = Counter()
+        for token in tokenize(title):
+            terms[token] += self.TITLE_WEIGHT
+        for token in tokenize(description):
+            terms[token] += 1
+        return terms
+
+    def _remove(self, place_id):
+        length = self._lengths.pop(place_id, None)
+        if length is None:
+            return
+        self._total_length -= length
+        for term in self._documents.pop(place_id):
+            del self._postings[term][place_id]
+            if not self._postings[term]:
+                del self._postings[term]
+
+    def _add(self, place_id, title, description):
+        self._remove(place_id)
+        terms = self._terms(title, description)
+        for term, frequency in terms.items():
+            self._postings.setdefault(term, {})[place_id] = frequency
+        length = sum(terms.values())
+        self._lengths[place_id] = length
+        self._documents[place_id] = set(terms)
+        self._total_length += length
+
+    def rebuild(self, documents):
+        """
+        Replace the whole index.
+
+        Args:
+            documents (iterable): (place_id, title, description) tuples
+        """
+        with self._lock:
+            self._postings = {}
+            self._lengths = {}
+            self._documents = {}
+            self._total_length = 0
+            for place_id, title, description in documents:
+                self._add(place_id, title, description)
+            self.built = True
+
+    def add(self, place_id, title, description):
+        """Index (or re-index) a place, ignored until the index is built"""
+        with self._lock:
+            if self.built:
+                self._add(place_id, title, description)
+
+    def remove(self, place_id):
+        """Drop a place from the index"""
+        with self._lock:
+            self._remove(place_id)
+
+    def reset(self):
+        """Forget everything, the next search rebuilds the index"""
+        with self._lock:
+            self._postings = {}
+            self._lengths = {}
+            self._documents = {}
+            self._total_length = 0
+            self.built = False
+
+    def search(self, query, offset=0, limit=20):
+        """
+        Rank the places matching any term of the query.
+
+        Returns:
+            tuple: (total number of matches, list of (place_id, score) for the requested page)
+        """
+        with self._lock:
+            count = len(self._lengths)
+            if count == 0:
+                return 0, []
+            average_length = self._total_length / count or 1
+
+            scores = Counter()
+            for term in set(tokenize(query)):
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+                for place_id, frequency in postings.items():
+                    norm = self.K1 * (1 - self.B + self.B * self._lengths[place_id] / average_length)
+                    scores[place_id] += idf * frequency * (self.K1 + 1) / (frequency + norm)
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return len(ranked), ranked[offset:offset + limit]
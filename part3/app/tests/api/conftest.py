@@ -1,5 +1,7 @@
 import pytest
-from part3.app import create_app
+from sqlalchemy import event
+from part3.app import create_app, db
+from part3.app.services.facade import facade
 from part3.app.models.user import User
 from part3.app.models.amenity import Amenity
 
@@ -20,6 +22,32 @@ def client(app):
 def runner(app):
     return app.test_cli_runner()
 
+@pytest.fixture()
+def testing_app():
+    """App backed by an in-memory SQLite database, dropped after each test"""
+    app = create_app("testing")
+    facade.clear_caches()
+    with app.app_context():
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+@pytest.fixture()
+def testing_client(testing_app):
+    return testing_app.test_client()
+
+@pytest.fixture()
+def queries(testing_app):
+    """Records every SQL statement sent to the testing database"""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", record)
+    yield statements
+    event.remove(db.engine, "before_cursor_execute", record)
+
 @pytest.fixture()
 def amenity_data():
     """Fixture providing test data for an amenity"""
@@ -0,0 +1,160 @@
+import inspect
+import pytest
+from flask_jwt_extended import JWTManager, decode_token
+from part3.app import db
+from part3.app.extensions import jwt
+from part3.app.models.place import Place
+from part3.app.models.review import Review
+from part3.app.models.user import User
+from part3.app.services import ids
+from part3.app.services.facade import facade
+from part3.app.services.jwt_claims import CachingJWTManager
+
+
+class TestOwnershipChecks():
+
+    @pytest.fixture()
+    def world(self, testing_app):
+        owner = User("Ann", "Host", "ann@host.com", "G00dP455!")
+        guest = User("Bob", "Guest", "bob@guest.com", "G00dP455!")
+        admin = User("Cat", "Admin", "cat@admin.com", "G00dP455!")
+        admin.is_admin = True
+        db.session.add_all([owner, guest, admin])
+        db.session.commit()
+        place = Place("Loft", "Top floor", 120, 10.0, 20.0, owner.id, [])
+        db.session.add(place)
+        db.session.commit()
+        review = Review("Lovely", 5, place_id=place.id, user_id=guest.id)
+        db.session.add(review)
+        db.session.commit()
+        return {
+            'place': place.id,
+            'review': review.id,
+            'owner': facade.issue_tokens(owner)['access_token'],
+            'guest': facade.issue_tokens(guest)['access_token'],
+            'admin': facade.issue_tokens(admin)['access_token'],
+        }
+
+    def auth(self, token):
+        return {"Authorization": f"Bearer {token}"}
+
+    def test_owner_lookup_reads_one_column(self, world, queries):
+        assert facade.get_place_owner_id(world['place']) is not None
+        assert facade.get_place_owner_id(ids.new_id()) is None
+
+        assert len(queries) == 2
+        assert "places.owner_id" in queries[0]
+        assert "places.title" not in queries[0]
+
+    def test_place_owner_checks(self, testing_client, world):
+        path = f"/api/v1/places/{world['place']}"
+
+        assert testing_client.delete(path, headers=self.auth(world['guest'])).status_code == 403
+        assert testing_client.delete("/api/v1/places/no-such-place",
+                                     headers=self.auth(world['owner'])).status_code == 404
+        assert testing_client.delete(path, headers=self.auth(world['owner'])).status_code == 204
+
+    def test_admin_passes_the_place_check(self, testing_client, world):
+        response = testing_client.delete(f"/api/v1/places/{world['place']}", headers=self.auth(world['admin']))
+        assert response.status_code == 204
+
+    def test_review_author_checks(self, testing_client, world):
+        path = f"/api/v1/reviews/{world['review']}"
+        moved = {"text": "Moved", "rating": 4, "place_id": "another-place"}
+        kept = {"text": "Still lovely", "rating": 4, "place_id": world['place']}
+
+        assert testing_client.put(path, json=kept, headers=self.auth(world['owner'])).status_code == 403
+        assert testing_client.put(path, json=moved, headers=self.auth(world['guest'])).status_code == 403
+        assert testing_client.put(path, json=kept, headers=self.auth(world['guest'])).status_code == 200
+        assert testing_client.delete(path, headers=self.auth(world['owner'])).status_code == 403
+        assert testing_client.delete(path, headers=self.auth(world['guest'])).status_code == 204
+
+
+class TestClaimsCache():
+
+    @pytest.fixture()
+    def token(self, testing_app):
+        user = User("Ann", "Host", "ann@host.com", "G00dP455!")
+        db.session.add(user)
+        db.session.commit()
+        return facade.issue_tokens(user)['access_token']
+
+    def get_me(self, client, token):
+        return client.get("/api/v1/users/me", headers={"Authorization": f"Bearer {token}"})
+
+    def test_overridden_decoder_matches_flask_jwt_extended(self):
+        # CachingJWTManager overrides a private method: an upgrade that changes it must fail here
+        parameters = ['self', 'encoded_token', 'csrf_value', 'allow_expired']
+        assert list(inspect.signature(JWTManager._decode_jwt_from_config).parameters) == parameters
+        assert list(inspect.signature(CachingJWTManager._decode_jwt_from_config).parameters) == parameters
+
+    def test_decode_token_goes_through_the_cache(self, token):
+        hits = jwt.claims_cache.stats()['hits']
+
+        assert decode_token(token) == decode_token(token)
+        assert jwt.claims_cache.stats()['hits'] == hits + 1
+
+    def test_token_verified_once(self, testing_client, token, monkeypatch):
+        assert self.get_me(testing_client, token).status_code == 200
+
+        def verify_again(*args, **kwargs):
+            pytest.fail("token verified again")
+        monkeypatch.setattr(JWTManager, "_decode_jwt_from_config", verify_again)
+        hits = jwt.claims_cache.stats()['hits']
+        assert self.get_me(testing_client, token).status_code == 200
+        assert jwt.claims_cache.stats()['hits'] == hits + 1
+
+    def test_altered_token_is_not_served_from_cache(self, testing_client, token):
+        assert self.get_me(testing_client, token).status_code == 200
+        header, payload, signature = token.split(".")
+        altered = ".".join([header, payload, signature[::-1]])
+
+        assert self.get_me(testing_client, altered).status_code == 422
+
+    def test_cached_token_expires(self, testing_client, token, monkeypatch):
+        assert self.get_me(testing_client, token).status_code == 200
+        verified = []
+        verify = JWTManager._decode_jwt_from_config
+
+        def verify_again(*args, **kwargs):
+            verified.append(1)
+            return verify(*args, **kwargs)
+        monkeypatch.setattr(JWTManager, "_decode_jwt_from_config", verify_again)
+        # Past its exp the cached claims are not used anymore
+        monkeypatch.setattr(jwt, "_clock", lambda: float("inf"))
+
+        self.get_me(testing_client, token)
+        assert verified == [1]
+
+    def test_cached_token_honours_leeway_and_nbf(self, testing_app, token, monkeypatch):
+        claims = decode_token(token)
+        testing_app.config['JWT_DECODE_LEEWAY'] = 30
+
+        # Just past exp, within the leeway: still served from the cache
+        monkeypatch.setattr(jwt, "_clock", lambda: claims['exp'] + 10)
+        assert jwt._in_time(claims)
+        monkeypatch.setattr(jwt, "_clock", lambda: claims['exp'] + 31)
+        assert not jwt._in_time(claims)
+
+        # Not valid before nbf (beyond the leeway), like the library's own decoding
+        monkeypatch.setattr(jwt, "_clock", lambda: claims['nbf'] - 31)
+        assert not jwt._in_time(claims)
+        monkeypatch.setattr(jwt, "_clock", lambda: claims['nbf'] - 10)
+        assert jwt._in_time(claims)
+
+    def test_expired_within_leeway_is_accepted(self, testing_app, testing_client, token, monkeypatch):
+        assert self.get_me(testing_client, token).status_code == 200
+        exp = jwt.claims_cache.get(token)['exp']
+        testing_app.config['JWT_DECODE_LEEWAY'] = 60
+        monkeypatch.setattr(jwt, "_clock", lambda: exp + 30)
+
+        def verify_again(*args, **kwargs):
+            pytest.fail("token verified again")
+        monkeypatch.setattr(JWTManager, "_decode_jwt_from_config", verify_again)
+        assert self.get_me(testing_client, token).status_code == 200
+
+    def test_revoked_session_refused_from_cache(self, testing_client, token):
+        assert self.get_me(testing_client, token).status_code == 200
+        facade.revoke_session(jwt.claims_cache.get(token))
+
+        assert self.get_me(testing_client, token).status_code == 401
@@ -0,0 +1,57 @@
+import os
+import pytest
+from part3.app import create_app, db
+from part3.app.config import TestingConfig, config
+from part3.app.services.facade import facade
+
+
+class TestPersistenceBackends():
+
+    @pytest.fixture()
+    def make_app(self):
+        """create_app() for a TestingConfig with the given settings"""
+        def make(**settings):
+            config['backend_test'] = type('BackendTestConfig', (TestingConfig,), settings)
+            return create_app('backend_test')
+        yield make
+        config.pop('backend_test', None)
+
+    def test_sqlite_memory_backend(self, make_app):
+        app = make_app()
+        assert app.config['SQLALCHEMY_DATABASE_URI'] == 'sqlite:///:memory:'
+        assert app.extensions['hbnb_facade'] is facade
+        assert facade.backend == 'sqlite-memory'
+
+    def test_sqlite_backend_keeps_the_data(self, make_app, tmp_path):
+        path = str(tmp_path / 'hbnb.db')
+        app = make_app(PERSISTENCE_BACKEND='sqlite', SQLITE_PATH=path)
+        with app.app_context():
+            amenity_id = facade.create_amenity({'name': 'WiFi'}).id
+            assert facade.get_amenity_data(amenity_id)['name'] == 'WiFi'
+            db.session.remove()
+            db.engine.dispose()
+        assert os.path.exists(path)
+
+        # A new app on the same file sees the amenity, one in memory does not
+        app = make_app(PERSISTENCE_BACKEND='sqlite', SQLITE_PATH=path)
+        with app.app_context():
+            assert facade.get_amenity(amenity_id).name == 'WiFi'
+            db.session.remove()
+            db.engine.dispose()
+        app = make_app()
+        with app.app_context():
+            # Nothing served from the cache filled by the previous app either
+            assert facade.get_amenity_data(amenity_id) is None
+            db.session.remove()
+
+    def test_database_uri_wins(self, make_app, tmp_path):
+        uri = f"sqlite:///{tmp_path / 'other.db'}"
+        app = make_app(PERSISTENCE_BACKEND='mysql', SQLALCHEMY_DATABASE_URI=uri)
+        assert app.config['SQLALCHEMY_DATABASE_URI'] == uri
+
+    def test_unknown_backend(self, make_app):
+        with pytest.raises(ValueError):
+            make_app(PERSISTENCE_BACKEND='redis')
+        # Not the part2 in-memory repositories, the name says what it is
+        with pytest.raises(ValueError):
+            make_app(PERSISTENCE_BACKEND='memory')
@@ -0,0 +1,51 @@
+from part3.app import db
+from part3.app.models.amenity import Amenity
+from part3.app.models.user import User
+from part3.app.services.facade import facade
+
+
+class TestBatchRepository():
+
+    def test_add_all_get_many_count_exists(self, testing_app, queries):
+        amenities = [Amenity(f"Amenity {i}") for i in range(5)]
+        facade.amenity_repo.add_all(amenities)
+        ids = [a.id for a in amenities]
+
+        assert facade.amenity_repo.count() == 5
+        assert facade.amenity_repo.exists(ids[0])
+        assert not facade.amenity_repo.exists("unknown")
+
+        with testing_app.app_context():
+            db.session.expunge_all()
+            queries.clear()
+            found = facade.amenity_repo.get_many([ids[3], "unknown", ids[1], ids[3]])
+            assert [a.id for a in found] == [ids[3], ids[1]]
+            assert len(queries) == 1
+
+    def test_delete_many(self, testing_app):
+        amenities = [Amenity(f"Amenity {i}") for i in range(3)]
+        facade.amenity_repo.add_all(amenities)
+
+        assert facade.amenity_repo.delete_many([amenities[0].id, amenities[1].id, "unknown"]) == 2
+        assert [a.name for a in facade.amenity_repo.get_all()] == ["Amenity 2"]
+
+    def test_create_place_loads_amenities_in_one_query(self, testing_app, queries):
+        owner = User("Ann", "Owner", "ann@owner.com", "G00dP455!")
+        db.session.add(owner)
+        amenities = [Amenity(f"Amenity {i}") for i in range(10)]
+        db.session.add_all(amenities)
+        db.session.commit()
+        owner_id = owner.id
+        amenity_ids = [a.id for a in amenities]
+
+        with testing_app.app_context():
+            db.session.expunge_all()
+            queries.clear()
+            place = facade.create_place({
+                "title": "Loft", "description": "", "price": 50, "latitude": 0, "longitude": 0,
+                "owner_id": owner_id, "amenities": amenity_ids
+            })
+            # One IN query instead of one query per amenity id (the other one reloads place.amenities)
+            lookups = [q for q in queries if "FROM amenities" in q and "place_amenity" not in q]
+            assert len(lookups) == 1
+            assert len(place.amenities) == 10
@@ -0,0 +1,118 @@
+import json
+import pytest
+from flask_jwt_extended import create_access_token
+from part3.app import db
+from part3.app.models.amenity import Amenity
+from part3.app.models.place import Place
+from part3.app.models.review import Review
+from part3.app.models.user import User
+from part3.app.services.facade import facade
+
+
+WIFI_ID = "0192b3c4-0000-7000-8000-000000000001"
+LOFT_ID = "0192b3c4-0000-7000-8000-000000000002"
+
+
+def ndjson(*rows):
+    return "\n".join(json.dumps(row) for row in rows) + "\n"
+
+
+class TestBulkImport():
+
+    @pytest.fixture()
+    def users(self, testing_app):
+        admin = User("Ann", "Admin", "ann@admin.com", "G00dP455!")
+        admin.is_admin = True
+        guest = User("Gus", "Guest", "gus@guest.com", "G00dP455!")
+        db.session.add_all([admin, guest])
+        db.session.commit()
+        return admin.id, guest.id
+
+    def test_imports_rows_that_refer_to_each_other(self, testing_app, users):
+        admin_id, guest_id = users
+        lines = ndjson(
+            {"type": "amenity", "id": WIFI_ID, "name": "Wi-Fi"},
+            {"type": "place", "id": LOFT_ID, "title": "Loft", "price": 80,
+             "latitude": -37.8, "longitude": 144.9, "amenities": [WIFI_ID]},
+            {"type": "review", "place_id": LOFT_ID, "user_id": guest_id, "text": "Great", "rating": 4},
+        ).splitlines()
+
+        report = facade.bulk_import(lines, default_owner_id=admin_id, batch_size=2)
+
+        assert report["imported"] == {"amenity": 1, "place": 1, "review": 1}
+        assert report["failed"] == 0
+        place = db.session.get(Place, LOFT_ID)
+        assert place.owner_id == admin_id
+        assert place.geohash
+        assert [a.name for a in place.amenities] == ["Wi-Fi"]
+        assert (place.review_count, place.rating_avg) == (1, 4.0)
+
+    def test_reports_bad_rows_and_keeps_the_good_ones(self, testing_app, users):
+        admin_id, guest_id = users
+        lines = ndjson(
+            {"type": "place", "id": LOFT_ID, "title": "Fine", "price": 10, "latitude": 0, "longitude": 0},
+            {"type": "place", "title": "Bad price", "price": -1, "latitude": 0, "longitude": 0},
+            {"type": "place", "title": "No amenity", "price": 1, "latitude": 0, "longitude": 0,
+             "amenities": ["missing"]},
+            {"type": "place", "id": LOFT_ID, "title": "Same id", "price": 1, "latitude": 0, "longitude": 0},
+            {"type": "review", "place_id": LOFT_ID, "user_id": guest_id, "text": "Nice", "rating": 5},
+            {"type": "review", "place_id": LOFT_ID, "user_id": guest_id, "text": "Again", "rating": 1},
+            {"type": "review", "place_id": LOFT_ID, "user_id": "nobody", "text": "Hi", "rating": 3},
+            {"type": "booking"},
+            {"type": "amenity", "id": "wifi", "name": "Not a UUID"},
+        ).splitlines() + ["not json"]
+
+        report = facade.bulk_import(lines, default_owner_id=admin_id)
+
+        assert report["imported"] == {"amenity": 0, "place": 1, "review": 1}
+        assert sorted(error["line"] for error in report["errors"]) == [2, 3, 4, 6, 7, 8, 9, 10]
+        assert Place.query.count() == 1
+        assert Review.query.count() == 1
+        assert db.session.get(Place, LOFT_ID).rating_sum == 5
+
+    def test_owner_cannot_review_their_own_place(self, testing_app, users):
+        admin_id, guest_id = users
+        lines = ndjson(
+            {"type": "place", "id": LOFT_ID, "title": "Loft", "price": 80, "latitude": 0, "longitude": 0},
+            {"type": "review", "place_id": LOFT_ID, "user_id": admin_id, "text": "Mine is great", "rating": 5},
+            {"type": "review", "place_id": LOFT_ID, "user_id": guest_id, "text": "Nice", "rating": 3},
+        ).splitlines()
+
+        report = facade.bulk_import(lines, default_owner_id=admin_id)
+
+        assert report["imported"] == {"amenity": 0, "place": 1, "review": 1}
+        assert report["errors"] == [{"line": 2, "error": "You cannot review your own place"}]
+        assert db.session.get(Place, LOFT_ID).rating_sum == 3
+
+    def test_invalid_utf8_line_is_a_rejected_row(self, testing_app, users):
+        admin_id, _ = users
+        lines = [
+            json.dumps({"type": "amenity", "name": "Wi-Fi"}).encode(),
+            b'{"type": "amenity", "name": "Caf\xe9"}',
+            json.dumps({"type": "amenity", "name": "Pool"}).encode(),
+        ]
+
+        # The bad line sits between two batches, the import goes on after it
+        report = facade.bulk_import(lines, default_owner_id=admin_id, batch_size=1)
+
+        assert report["lines"] == 3
+        assert report["imported"]["amenity"] == 2
+        assert report["failed"] == 1
+        assert report["errors"][0]["line"] == 2
+        assert "not valid UTF-8" in report["errors"][0]["error"]
+
+    def test_bulk_endpoint_is_admin_only(self, testing_client, users):
+        admin_id, guest_id = users
+        body = ndjson({"type": "amenity", "name": "Pool"})
+
+        guest_token = create_access_token(identity=guest_id, additional_claims={"is_admin": False})
+        response = testing_client.post("/api/v1/places/bulk", data=body,
+                                       headers={"Authorization": f"Bearer {guest_token}"})
+        assert response.status_code == 403
+
+        admin_token = create_access_token(identity=admin_id, additional_claims={"is_admin": True})
+        response = testing_client.post("/api/v1/places/bulk", data=body, content_type="application/x-ndjson",
+                                       headers={"Authorization": f"Bearer {admin_token}"})
+        assert response.status_code == 200
+        assert response.json["imported"]["amenity"] == 1
+        assert Amenity.query.one().name == "Pool"
@@ -0,0 +1,90 @@
+import pytest
+from part3.app import db
+from part3.app.models.place import Place, place_amenity
+from part3.app.models.review import Review
+from part3.app.models.amenity import Amenity
+from part3.app.models.user import User
+from part3.app.services import ids
+from part3.app.services.facade import facade
+
+
+class TestCascadeDelete():
+
+    @pytest.fixture()
+    def host(self, testing_app):
+        """A host with 5 places, each with 2 amenities and reviews by 3 guests"""
+        host = User("Hal", "Host", "hal@host.com", "G00dP455!")
+        guests = [User("Gus", "Guest", f"gus{i}@guest.com", "G00dP455!") for i in range(3)]
+        amenities = [Amenity("Wi-Fi"), Amenity("Pool")]
+        db.session.add_all([host, *guests, *amenities])
+        db.session.commit()
+
+        for i in range(5):
+            place = facade.create_place({
+                "title": f"Place {i}", "description": "", "price": 50, "latitude": 0, "longitude": 0,
+                "owner_id": host.id, "amenities": [a.id for a in amenities]
+            })
+            for guest in guests:
+                facade.create_review({"text": "Nice", "rating": 4, "place_id": place.id, "user_id": guest.id})
+        return host.id, [guest.id for guest in guests]
+
+    def test_delete_user_is_set_based(self, testing_app, host, queries):
+        host_id, _ = host
+
+        with testing_app.app_context():
+            db.session.expunge_all()
+            queries.clear()
+            assert facade.delete_user(host_id)
+
+        # User lookup, rating totals of the reviewed places and one DELETE:
+        # the places, reviews and amenity links are deleted by the database, never loaded
+        assert len(queries) == 3
+        assert queries[-1].startswith("DELETE FROM users")
+        assert Place.query.count() == 0
+        assert Review.query.count() == 0
+        assert db.session.query(place_amenity).count() == 0
+        assert Amenity.query.count() == 2
+
+    def test_delete_guest_updates_ratings_of_remaining_places(self, testing_app, host):
+        _, guest_ids = host
+
+        assert facade.delete_user(guest_ids[0])
+
+        assert Review.query.count() == 10
+        for place in Place.query.all():
+            assert (place.review_count, place.rating_sum) == (2, 8)
+
+    def test_delete_place_removes_its_reviews(self, testing_app, host):
+        place = Place.query.first()
+
+        assert facade.delete_place(place.id)
+
+        assert Review.query.count() == 12
+        assert Review.query.filter_by(place_id=place.id).count() == 0
+
+    def test_delete_place_is_set_based(self, testing_app, host, queries):
+        place_id = Place.query.first().id
+        # Even with its reviews loaded in the session, no review is deleted one by one
+        assert len(facade.get_place(place_id)['reviews']) == 3
+        queries.clear()
+
+        assert facade.delete_place(place_id)
+
+        # Existence check and one DELETE, the database cascades to the reviews
+        assert len(queries) == 2
+        assert queries[-1].startswith("DELETE FROM places")
+        assert Review.query.filter_by(place_id=place_id).count() == 0
+        assert db.session.query(place_amenity).filter_by(place_id=place_id).count() == 0
+        assert Review.query.count() == 12
+
+    def test_delete_unknown_place(self, testing_app, host, queries):
+        queries.clear()
+
+        assert not facade.delete_place(ids.new_id())
+        assert len(queries) == 1
+
+    def test_delete_invalid_place_id(self, testing_app, host, queries):
+        queries.clear()
+
+        assert not facade.delete_place("no-such-place")
+        assert not queries
@@ -0,0 +1,104 @@
+import pytest
+from part3.app import db
+from part3.app.models.user import User
+from part3.app.services.cache import EntityCache
+from part3.app.services.facade import facade
+
+
+class FakeClock():
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestEntityCache():
+
+    def test_hit_and_miss_counters(self):
+        cache = EntityCache()
+        assert cache.get("a") is None
+        cache.set("a", {"id": "a"})
+        assert cache.get("a") == {"id": "a"}
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_least_recently_used_is_evicted(self):
+        cache = EntityCache(maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+
+    def test_entries_expire(self):
+        clock = FakeClock()
+        cache = EntityCache(ttl=10, clock=clock)
+        cache.set("a", 1)
+        clock.now = 9
+        assert cache.get("a") == 1
+        clock.now = 11
+        assert cache.get("a") is None
+        assert cache.stats()["size"] == 0
+
+
+class TestFacadeCache():
+
+    @pytest.fixture()
+    def place(self, testing_app):
+        owner = User("Ann", "Owner", "ann@owner.com", "G00dP455!")
+        db.session.add(owner)
+        db.session.commit()
+        return facade.create_place({
+            "title": "Cabin", "description": "", "price": 80,
+            "latitude": 1.0, "longitude": 1.0,
+            "owner_id": owner.id, "amenities": []
+        })
+
+    def test_get_place_is_served_from_cache(self, testing_app, place, queries):
+        place_id = place.id
+        facade.get_place(place_id)
+        queries.clear()
+
+        # Next request, so the request identity map is empty
+        with testing_app.app_context():
+            cached = facade.get_place(place_id)
+
+        assert cached["title"] == "Cabin"
+        assert queries == []
+        assert facade.cache_stats()["places"]["hits"] >= 1
+
+    def test_returned_place_can_be_modified_safely(self, place):
+        facade.get_place(place.id).update({"owner": "someone"})
+        assert "owner" not in facade.get_place(place.id)
+
+    def test_add_amenity_invalidates_place(self, place):
+        assert facade.get_place(place.id)["amenities"] == []
+        amenity = facade.create_amenity({"name": "WiFi"})
+
+        facade.add_amenity_to_place(place.id, amenity.id)
+
+        assert [a["name"] for a in facade.get_place(place.id)["amenities"]] == ["WiFi"]
+
+    def test_update_and_delete_invalidate_place(self, place):
+        facade.get_place(place.id)
+        facade.update_place(place.id, {"title": "Chalet"})
+        assert facade.get_place(place.id)["title"] == "Chalet"
+
+        facade.delete_place(place.id)
+        assert facade.get_place(place.id) is None
+
+    def test_user_data_and_invalidation(self, place):
+        assert facade.get_user_data(place.owner_id)["first_name"] == "Ann"
+        facade.update_user(place.owner_id, {"first_name": "Anna"})
+        assert facade.get_user_data(place.owner_id)["first_name"] == "Anna"
+
+    def test_amenity_data_and_invalidation(self, testing_app):
+        amenity = facade.create_amenity({"name": "Pool"})
+        assert facade.get_amenity_data(amenity.id)["name"] == "Pool"
+        facade.update_amenity(amenity.id, {"name": "Spa", "description": "Hot"})
+        assert facade.get_amenity_data(amenity.id)["name"] == "Spa"
+        facade.delete_amenity(amenity.id)
+        assert facade.get_amenity_data(amenity.id) is None
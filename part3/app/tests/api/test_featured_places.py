@@ -0,0 +1,63 @@
+import pytest
+from part3.app import db
+from part3.app.models.user import User
+from part3.app.services.facade import facade
+
+
+class TestFeaturedPlaces():
+
+    @pytest.fixture()
+    def setup(self, testing_app):
+        users = [User("User", str(i), f"user{i}@mail.com", "G00dP455!") for i in range(3)]
+        db.session.add_all(users)
+        db.session.commit()
+        amenities = [facade.create_amenity({"name": f"Amenity {i}"}) for i in range(4)]
+        places = [facade.create_place({
+            "title": f"Place {i}", "description": "", "price": 50,
+            "latitude": 0.0, "longitude": 0.0, "owner_id": users[0].id,
+            "amenities": [a.id for a in amenities] if i == 1 else []
+        }) for i in range(3)]
+        facade.create_review({"text": "ok", "rating": 2, "user_id": users[1].id, "place_id": places[0].id})
+        facade.create_review({"text": "ok", "rating": 2, "user_id": users[2].id, "place_id": places[0].id})
+        facade.create_review({"text": "ok", "rating": 5, "user_id": users[1].id, "place_id": places[2].id})
+        return [p.id for p in places]
+
+    def ids(self, client, category, limit=6):
+        response = client.get(f"/api/v1/places/featured?category={category}&limit={limit}")
+        assert response.status_code == 200
+        return [p["id"] for p in response.json]
+
+    def test_categories(self, testing_client, setup):
+        places = setup
+        assert self.ids(testing_client, "new") == list(reversed(places))
+        assert self.ids(testing_client, "top-rated") == [places[2], places[0]]
+        assert self.ids(testing_client, "popular", limit=1) == [places[0]]
+        assert self.ids(testing_client, "unique") == [places[1]]
+
+    def test_unknown_category(self, testing_client, setup):
+        response = testing_client.get("/api/v1/places/featured?category=cheap")
+        assert response.status_code == 400
+
+    def test_results_are_cached(self, testing_client, setup, queries):
+        self.ids(testing_client, "popular")
+        queries.clear()
+        self.ids(testing_client, "popular")
+        assert not any("FROM places" in q for q in queries)
+
+    def test_place_writes_refresh_the_lists(self, testing_client, setup):
+        places = setup
+        self.ids(testing_client, "new")
+
+        owner_id = facade.get_place_owner_id(places[0])
+        added = facade.create_place({
+            "title": "Newest", "description": "", "price": 50,
+            "latitude": 0.0, "longitude": 0.0, "owner_id": owner_id, "amenities": []
+        })
+        assert self.ids(testing_client, "new")[0] == added.id
+
+        facade.update_place(added.id, {"title": "Renamed"})
+        response = testing_client.get("/api/v1/places/featured?category=new&limit=1")
+        assert response.json[0]["title"] == "Renamed"
+
+        facade.delete_place(added.id)
+        assert added.id not in self.ids(testing_client, "new")
@@ -0,0 +1,125 @@
+import random
+import pytest
+from part3.app import db
+from part3.app.models.user import User
+from part3.app.services import geo
+from part3.app.services.facade import facade
+
+
+class TestGeohash():
+
+    def test_encode_known_value(self):
+        assert geo.encode(57.64911, 10.40744, 11) == "u4pruydqqvj"
+
+    def test_covering_cells_contain_every_point_of_the_box(self):
+        rng = random.Random(42)
+        for _ in range(50):
+            min_lat = rng.uniform(-80, 70)
+            min_lng = rng.uniform(-170, 160)
+            max_lat = min_lat + rng.uniform(0.001, 10)
+            max_lng = min_lng + rng.uniform(0.001, 10)
+            cells = geo.covering_cells(min_lat, min_lng, max_lat, max_lng)
+            assert len(cells) <= 16
+            for _ in range(20):
+                point = geo.encode(rng.uniform(min_lat, max_lat), rng.uniform(min_lng, max_lng))
+                assert any(point.startswith(cell) for cell in cells)
+
+    def test_haversine(self):
+        # Melbourne to Sydney
+        assert 710 < geo.haversine_km(-37.8136, 144.9631, -33.8688, 151.2093) < 716
+
+
+class TestGeoSearch():
+
+    @pytest.fixture()
+    def owner_id(self, testing_app):
+        owner = User("Ann", "Owner", "ann@owner.com", "G00dP455!")
+        db.session.add(owner)
+        db.session.commit()
+        return owner.id
+
+    def add_place(self, owner_id, title, latitude, longitude):
+        return facade.create_place({
+            "title": title, "description": "", "price": 50,
+            "latitude": latitude, "longitude": longitude,
+            "owner_id": owner_id, "amenities": []
+        })
+
+    def test_bbox_matches_brute_force(self, testing_client, owner_id):
+        rng = random.Random(7)
+        points = [(rng.uniform(-38.5, -37.0), rng.uniform(144.0, 146.0)) for _ in range(150)]
+        for i, (lat, lng) in enumerate(points):
+            self.add_place(owner_id, f"Place {i}", lat, lng)
+
+        box = (-37.9, 144.5, -37.6, 145.2)
+        response = testing_client.get("/api/v1/places/bbox?min_lat={}&min_lng={}&max_lat={}&max_lng={}&limit=100".format(*box))
+
+        expected = sorted(f"Place {i}" for i, (lat, lng) in enumerate(points)
+                          if box[0] <= lat <= box[2] and box[1] <= lng <= box[3])
+        assert response.status_code == 200
+        assert sorted(p["title"] for p in response.json) == expected
+
+    def test_bbox_across_antimeridian(self, owner_id):
+        self.add_place(owner_id, "Fiji", -17.7, 179.9)
+        self.add_place(owner_id, "Samoa", -13.8, -172.1)
+        self.add_place(owner_id, "Sydney", -33.8, 151.2)
+
+        places = facade.get_places_in_bbox(-20.0, 175.0, -10.0, -170.0)
+
+        assert sorted(p["title"] for p in places) == ["Fiji", "Samoa"]
+
+    def test_nearby_is_sorted_by_distance(self, testing_client, owner_id):
+        self.add_place(owner_id, "Flinders St", -37.8183, 144.9671)
+        self.add_place(owner_id, "St Kilda", -37.8676, 144.9809)
+        self.add_place(owner_id, "Geelong", -38.1499, 144.3617)
+
+        response = testing_client.get("/api/v1/places/nearby?lat=-37.8136&lng=144.9631&radius_km=10")
+
+        assert [p["title"] for p in response.json] == ["Flinders St", "St Kilda"]
+        assert response.json[0]["distance_km"] < 1
+
+    def test_geohash_follows_coordinates(self, owner_id):
+        place = self.add_place(owner_id, "Moving", 10.0, 10.0)
+        assert place.geohash == geo.encode(10.0, 10.0, 9)
+
+        facade.update_place(place.id, {"latitude": -20.0})
+
+        assert place.geohash == geo.encode(-20.0, 10.0, 9)
+
+    def test_invalid_box(self, testing_client, owner_id):
+        response = testing_client.get("/api/v1/places/bbox?min_lat=10&min_lng=0&max_lat=5&max_lng=1")
+        assert response.status_code == 400
+
+    def test_invalid_nearby_arguments(self, testing_client, owner_id):
+        for query in ("radius_km=501", "radius_km=0", "limit=0", "limit=-5"):
+            response = testing_client.get(f"/api/v1/places/nearby?lat=0&lng=0&{query}")
+            assert response.status_code == 400, query
+
+    def test_nearby_reads_a_bounded_number_of_candidates(self, owner_id, monkeypatch):
+        rng = random.Random(11)
+        points = [(rng.uniform(-38.0, -37.6), rng.uniform(144.7, 145.2)) for _ in range(200)]
+        for i, (lat, lng) in enumerate(points):
+            self.add_place(owner_id, f"Place {i}", lat, lng)
+        read = []
+        closest_in_bbox = facade.place_repo.get_places_closest_in_bbox
+
+        def spy(*args):
+            read.extend(closest_in_bbox(*args))
+            return read
+        monkeypatch.setattr(facade.place_repo, "get_places_closest_in_bbox", spy)
+
+        places = facade.get_places_nearby(-37.8136, 144.9631, 50, limit=5)
+
+        # The whole area is within the radius, only 5 * 4 candidates are read
+        assert len(read) == 5 * facade.NEARBY_CANDIDATES_PER_RESULT
+        expected = sorted(range(len(points)), key=lambda i: geo.haversine_km(-37.8136, 144.9631, *points[i]))[:5]
+        assert [p["title"] for p in places] == [f"Place {i}" for i in expected]
+
+    def test_nearby_across_antimeridian(self, owner_id):
+        self.add_place(owner_id, "East", -17.0, 179.8)
+        self.add_place(owner_id, "West", -17.0, -179.9)
+        self.add_place(owner_id, "Far", -17.0, 178.0)
+
+        places = facade.get_places_nearby(-17.0, -179.95, 100, limit=2)
+
+        assert [p["title"] for p in places] == ["West", "East"]
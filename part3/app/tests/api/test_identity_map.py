@@ -0,0 +1,80 @@
+import pytest
+from flask import g
+from part3.app import db
+from part3.app.models.user import User
+from part3.app.models.place import Place
+from part3.app.persistence import identity_map
+from part3.app.services.facade import facade
+
+
+class TestIdentityMap():
+
+    @pytest.fixture()
+    def place_id(self, testing_app):
+        owner = User("Ann", "Owner", "ann@owner.com", "G00dP455!")
+        db.session.add(owner)
+        db.session.commit()
+        place = facade.create_place({
+            "title": "Cabin", "description": "", "price": 80,
+            "latitude": 1.0, "longitude": 1.0,
+            "owner_id": owner.id, "amenities": []
+        })
+        return place.id
+
+    def test_outside_app_context_always_misses(self):
+        identity_map.remember("Place", "1", object())
+        assert identity_map.lookup("Place", "1") is None
+
+    def test_repository_get_reuses_request_object(self, place_id, queries):
+        first = facade.place_repo.get(place_id)
+        queries.clear()
+
+        assert facade.place_repo.get(place_id) is first
+        assert queries == []
+
+    def test_serialized_place_is_reused_within_request(self, place_id, queries):
+        facade.get_place(place_id)
+        # Even without the process cache, the request map answers
+        facade.clear_caches()
+        queries.clear()
+
+        assert facade.get_place(place_id)["id"] == place_id
+        assert queries == []
+
+    def test_writes_evict_request_entries(self, place_id):
+        facade.get_place(place_id)
+        facade.update_place(place_id, {"title": "Chalet"})
+        assert facade.get_place(place_id)["title"] == "Chalet"
+
+        facade.delete_place(place_id)
+        assert identity_map.lookup("Place", place_id) is None
+        assert facade.get_place(place_id) is None
+
+    def test_place_is_fetched_once_per_request(self, testing_app, place_id, queries):
+        # A new application context is what Flask pushes for every request
+        facade.clear_caches()
+        with testing_app.app_context():
+            queries.clear()
+            facade.get_place(place_id)
+            facade.get_place(place_id)
+            facade.get_reviews_by_place(place_id)
+
+            place_selects = [q for q in queries if q.startswith("SELECT") and "FROM places" in q]
+            assert len(place_selects) == 1
+
+    def test_commit_and_rollback_empty_the_map(self, place_id):
+        facade.place_repo.get(place_id)
+        db.session.commit()
+        assert identity_map.lookup("Place", place_id) is None
+
+        facade.place_repo.get(place_id)
+        db.session.rollback()
+        assert identity_map.lookup("Place", place_id) is None
+
+    def test_map_is_bounded_within_one_context(self, testing_app, monkeypatch):
+        monkeypatch.setattr(identity_map, "MAX_ENTRIES", 3)
+        for i in range(10):
+            identity_map.remember("Place", str(i), object())
+
+        assert identity_map.lookup("Place", "9") is not None
+        assert len(g.identity_map) <= 3
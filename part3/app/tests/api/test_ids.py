@@ -0,0 +1,107 @@
+import time
+import uuid
+import pytest
+from sqlalchemy.dialects import mysql, sqlite
+from sqlalchemy.schema import CreateTable
+from part3.app import db
+from part3.app.models.baseModel import UUIDString
+from part3.app.models.place import place_amenity
+from part3.app.models.user import User
+from part3.app.services import ids
+from part3.app.services.facade import facade
+
+
+class TestIds():
+
+    def test_uuid7_layout(self):
+        before = time.time_ns() // 1_000_000
+        value = ids.uuid7()
+        after = time.time_ns() // 1_000_000
+
+        assert value.version == 7
+        assert value.variant == uuid.RFC_4122
+        assert before <= value.int >> 80 <= after
+
+    def test_uuid7_ids_sort_in_creation_order(self):
+        generated = [ids.uuid7() for _ in range(10000)]
+        assert sorted(generated) == generated
+        assert sorted(map(str, generated)) == [str(value) for value in generated]
+
+    def test_strategy_setting(self):
+        assert ids.get_strategy() == "uuid7"
+        try:
+            ids.set_strategy("uuid4")
+            assert uuid.UUID(ids.new_id()).version == 4
+        finally:
+            ids.set_strategy("uuid7")
+        with pytest.raises(ValueError):
+            ids.set_strategy("serial")
+
+    def test_is_valid(self):
+        assert ids.is_valid(ids.new_id())
+        assert ids.is_valid(str(uuid.uuid4()))
+        assert not ids.is_valid("wifi")
+        assert not ids.is_valid(uuid.uuid4().hex)
+        assert not ids.is_valid(None)
+
+    def test_normalize(self):
+        value = ids.new_id()
+        assert ids.normalize(value.upper()) == value
+        assert ids.normalize(value.replace("-", "")) == value
+        assert ids.normalize("{%s}" % value) == value
+        assert ids.normalize("wifi") is None
+        assert ids.normalize(None) is None
+
+    def test_models_get_time_ordered_ids(self, testing_app):
+        user = User("Ann", "Host", "ann@host.com", "G00dP455!")
+        db.session.add(user)
+        db.session.commit()
+        db.session.expire_all()
+
+        assert uuid.UUID(user.id).version == 7
+        assert db.session.get(User, user.id).id == user.id
+
+
+class TestUUIDString():
+
+    def test_mysql_stores_16_bytes(self):
+        ddl = str(CreateTable(place_amenity).compile(dialect=mysql.dialect()))
+        assert "place_id BINARY(16) NOT NULL" in ddl
+        assert "CHAR(36)" not in ddl and "VARCHAR(36)" not in ddl
+
+    def test_mysql_round_trip(self):
+        column_type = UUIDString()
+        value = ids.new_id()
+        stored = column_type.process_bind_param(value, mysql.dialect())
+        assert stored == uuid.UUID(value).bytes
+        assert column_type.process_result_value(stored, mysql.dialect()) == value
+
+    def test_mysql_rejects_a_non_uuid(self):
+        with pytest.raises(ValueError):
+            UUIDString().process_bind_param("not-a-uuid", mysql.dialect())
+
+    def test_binds_the_canonical_form(self):
+        value = ids.new_id()
+        assert UUIDString().process_bind_param(value.upper(), sqlite.dialect()) == value
+        assert UUIDString().process_bind_param(value.upper(), mysql.dialect()) == uuid.UUID(value).bytes
+
+    def test_any_case_finds_the_row(self, testing_app):
+        user = User("Ann", "Host", "ann@host.com", "G00dP455!")
+        db.session.add(user)
+        db.session.commit()
+
+        assert facade.get_user(user.id.upper()).id == user.id
+        assert facade.user_repo.exists(user.id.upper())
+        assert [u.id for u in facade.user_repo.get_many([user.id.upper(), "wifi"])] == [user.id]
+
+    def test_invalid_id_is_not_found(self, testing_client):
+        assert facade.get_user("wifi") is None
+        assert not facade.user_repo.exists("wifi")
+        assert testing_client.get("/api/v1/places/wifi").status_code == 404
+
+    def test_other_databases_store_the_string(self):
+        column_type = UUIDString()
+        value = ids.new_id()
+        assert column_type.process_bind_param(value, sqlite.dialect()) == value
+        assert column_type.process_result_value(value, sqlite.dialect()) == value
+        assert "VARCHAR(36)" in str(CreateTable(place_amenity).compile(dialect=sqlite.dialect()))
@@ -0,0 +1,73 @@
+import logging
+import pytest
+from part3.app import db
+from part3.app.models.user import User
+from part3.app.services.facade import facade
+from part3.app.services.metrics import Histogram
+
+
+class TestMetricsEndpoint():
+
+    @pytest.fixture()
+    def tokens(self, testing_app):
+        admin = User("Cat", "Admin", "cat@admin.com", "G00dP455!")
+        admin.is_admin = True
+        guest = User("Bob", "Guest", "bob@guest.com", "G00dP455!")
+        db.session.add_all([admin, guest])
+        db.session.commit()
+        return {
+            'admin': {"Authorization": f"Bearer {facade.issue_tokens(admin)['access_token']}"},
+            'guest': {"Authorization": f"Bearer {facade.issue_tokens(guest)['access_token']}"},
+        }
+
+    def test_admin_only(self, testing_client, tokens):
+        assert testing_client.get("/api/v1/metrics/").status_code == 401
+        assert testing_client.get("/api/v1/metrics/", headers=tokens['guest']).status_code == 403
+        response = testing_client.get("/api/v1/metrics/", headers=tokens['admin'])
+
+        assert response.status_code == 200
+        assert response.content_type.startswith("text/plain; version=0.0.4")
+
+    def test_requests_are_recorded_per_route(self, testing_client, tokens):
+        testing_client.get("/api/v1/amenities/")
+        testing_client.get("/api/v1/amenities/")
+        testing_client.get("/api/v1/places/no-such-place")
+        body = testing_client.get("/api/v1/metrics/", headers=tokens['admin']).get_data(as_text=True)
+
+        amenities = 'method="GET",route="/api/v1/amenities/"'
+        assert f'hbnb_http_request_duration_seconds_count{{{amenities},status="200"}} 2' in body
+        assert 'route="/api/v1/places/<place_id>",status="404"' in body
+        assert f'hbnb_db_queries_per_request_count{{{amenities}}} 2' in body
+        assert f'hbnb_db_query_duration_seconds_count{{{amenities}}} 2' in body
+        assert f'hbnb_http_response_size_bytes_count{{{amenities}}} 2' in body
+
+    def test_debug_output_goes_to_the_logger(self, testing_app, capsys, caplog):
+        with caplog.at_level(logging.DEBUG, logger="part3.app.services.facade"):
+            facade.get_amenity("no-such-amenity")
+
+        assert capsys.readouterr().out == ""
+        assert "Amenity no-such-amenity: None" in caplog.text
+
+
+class TestHistogram():
+
+    def test_cumulative_buckets(self):
+        histogram = Histogram("latency_seconds", "Latency.", ("route",), (0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 2.0):
+            histogram.observe(("/a",), value)
+
+        assert histogram.render() == [
+            "# HELP latency_seconds Latency.",
+            "# TYPE latency_seconds histogram",
+            'latency_seconds_bucket{route="/a",le="0.1"} 2',
+            'latency_seconds_bucket{route="/a",le="1.0"} 3',
+            'latency_seconds_bucket{route="/a",le="+Inf"} 4',
+            'latency_seconds_sum{route="/a"} 2.65',
+            'latency_seconds_count{route="/a"} 4',
+        ]
+
+    def test_label_values_are_escaped(self):
+        histogram = Histogram("size_bytes", "Size.", ("route",), (10,))
+        histogram.observe(('say "hi"\\',), 1)
+
+        assert 'size_bytes_count{route="say \\"hi\\"\\\\"} 1' in histogram.render()
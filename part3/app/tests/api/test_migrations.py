@@ -0,0 +1,85 @@
+import sqlite3
+from sqlalchemy import inspect, select
+from part3.app import create_app, db
+from part3.app.config import TestingConfig, config
+from part3.app.persistence.migrations import MIGRATIONS, migrate, pending, schema_version
+
+# Schema of a database created before the rating, geohash and index changes
+LEGACY_SCHEMA = """
+CREATE TABLE users (id VARCHAR(36) PRIMARY KEY, created_at DATETIME, updated_at DATETIME,
+    first_name VARCHAR(50) NOT NULL, last_name VARCHAR(50) NOT NULL, email VARCHAR(120) NOT NULL UNIQUE,
+    password VARCHAR(128) NOT NULL, is_admin BOOLEAN);
+CREATE TABLE amenities (id VARCHAR(36) PRIMARY KEY, created_at DATETIME, updated_at DATETIME,
+    name VARCHAR(50) NOT NULL, description VARCHAR(512));
+CREATE TABLE places (id VARCHAR(36) PRIMARY KEY, created_at DATETIME, updated_at DATETIME,
+    title VARCHAR(100) NOT NULL, description VARCHAR(1000), price FLOAT NOT NULL, latitude FLOAT NOT NULL,
+    longitude FLOAT NOT NULL, owner_id VARCHAR(36) NOT NULL REFERENCES users (id));
+CREATE TABLE reviews (id VARCHAR(36) PRIMARY KEY, created_at DATETIME, updated_at DATETIME,
+    text VARCHAR(100) NOT NULL, rating INTEGER NOT NULL, place_id VARCHAR(36) NOT NULL REFERENCES places (id),
+    user_id VARCHAR(36) NOT NULL REFERENCES users (id), CONSTRAINT unique_review UNIQUE (user_id, place_id));
+CREATE TABLE place_amenity (place_id VARCHAR(36) REFERENCES places (id),
+    amenity_id VARCHAR(36) REFERENCES amenities (id), PRIMARY KEY (place_id, amenity_id));
+INSERT INTO users (id, first_name, last_name, email, password) VALUES
+    ('u1', 'Ann', 'Host', 'ann@host.com', 'x'), ('u2', 'Gus', 'Guest', 'gus@guest.com', 'x'),
+    ('u3', 'Kim', 'Guest', 'kim@guest.com', 'x');
+INSERT INTO places (id, title, price, latitude, longitude, owner_id) VALUES
+    ('p1', 'Loft', 80, -37.8136, 144.9631, 'u1'), ('p2', 'Cabin', 60, 0, 0, 'u1');
+INSERT INTO reviews (id, text, rating, place_id, user_id) VALUES
+    ('r1', 'Great', 5, 'p1', 'u2'), ('r2', 'Fine', 2, 'p1', 'u3');
+"""
+
+
+class TestMigrations():
+
+    def legacy_app(self, tmp_path, monkeypatch):
+        path = tmp_path / "legacy.db"
+        connection = sqlite3.connect(path)
+        connection.executescript(LEGACY_SCHEMA)
+        connection.close()
+        monkeypatch.setitem(config, "legacy", type("LegacyConfig", (TestingConfig,), {
+            "SQLALCHEMY_DATABASE_URI": f"sqlite:///{path}"
+        }))
+        return create_app("legacy")
+
+    def test_app_start_does_not_migrate(self, tmp_path, monkeypatch, caplog):
+        app = self.legacy_app(tmp_path, monkeypatch)
+
+        with app.app_context():
+            columns = {column["name"] for column in inspect(db.engine).get_columns("places")}
+            assert "review_count" not in columns
+            assert pending(db.engine) == [migration.__name__ for migration in MIGRATIONS]
+        assert "Schema migrations pending, run `flask migrate`" in caplog.text
+
+    def test_new_database_starts_without_warning(self, caplog):
+        create_app("testing")
+        assert "Schema migrations pending" not in caplog.text
+
+    def test_upgrades_a_legacy_database(self, tmp_path, monkeypatch):
+        app = self.legacy_app(tmp_path, monkeypatch)
+        result = app.test_cli_runner().invoke(args=["migrate"])
+        assert result.output.startswith(f"Applied {len(MIGRATIONS)} migrations")
+
+        with app.app_context():
+            inspector = inspect(db.engine)
+            columns = {column["name"] for column in inspector.get_columns("places")}
+            assert {"review_count", "rating_sum", "rating_avg", "geohash"} <= columns
+            for table in db.metadata.tables.values():
+                declared = {index.name for index in table.indexes}
+                assert declared <= {index["name"] for index in inspector.get_indexes(table.name)}
+
+            places = {row.id: row for row in db.session.execute(select(db.metadata.tables["places"]))}
+            assert (places["p1"].review_count, places["p1"].rating_sum, places["p1"].rating_avg) == (2, 7, 3.5)
+            assert places["p2"].review_count == 0
+            assert places["p1"].geohash.startswith("r1r0f")
+
+            with db.engine.connect() as connection:
+                versions = connection.scalars(select(schema_version.c.version)).all()
+            assert versions == list(range(1, len(MIGRATIONS) + 1))
+            assert migrate(db.engine) == []
+            assert pending(db.engine) == []
+
+    def test_new_database_is_only_recorded(self, testing_app):
+        assert migrate(db.engine) == [migration.__name__ for migration in MIGRATIONS]
+        with db.engine.connect() as connection:
+            names = connection.scalars(select(schema_version.c.name).order_by(schema_version.c.version)).all()
+        assert names == [migration.__name__ for migration in MIGRATIONS]
@@ -0,0 +1,100 @@
+import threading
+import pytest
+from flask import Flask
+from part3.app import db
+from part3.app.extensions import passwords
+from part3.app.models.user import User
+from part3.app.services.passwords import MAX_ROUNDS, MIN_ROUNDS, HasherBusy, PasswordHasher, cost_of
+
+
+class TestPasswordHasher():
+
+    def hasher(self, **settings):
+        app = Flask(__name__)
+        app.config.update({'PASSWORD_HASH_WORKERS': 0, 'PASSWORD_HASH_QUEUE': 0, 'PASSWORD_HASH_TARGET_MS': 250,
+                           'BCRYPT_LOG_ROUNDS': 4, **settings})
+        return PasswordHasher(app)
+
+    def test_hash_and_verify(self):
+        hasher = self.hasher()
+        hashed = hasher.hash("G00dP455!")
+        assert cost_of(hashed) == 4
+        assert hasher.verify(hashed, "G00dP455!")
+        assert not hasher.verify(hashed, "Wr0ngP455!")
+        assert not hasher.verify(None, "G00dP455!")
+
+    def test_worker_processes(self):
+        hasher = self.hasher(PASSWORD_HASH_WORKERS=1)
+        try:
+            assert hasher.verify(hasher.hash("G00dP455!"), "G00dP455!")
+        finally:
+            hasher.close()
+
+    def test_calibration(self):
+        hasher = self.hasher()
+        assert hasher.calibrate(0) == MIN_ROUNDS
+        assert hasher.calibrate(10 ** 6) == MAX_ROUNDS
+        # Only a suggestion, the configured cost stays
+        assert hasher.rounds == 4
+
+    def test_needs_rehash(self):
+        hasher = self.hasher()
+        hashed = hasher.hash("G00dP455!")
+        assert not hasher.needs_rehash(hashed)
+        hasher.rounds = 5
+        assert hasher.needs_rehash(hashed)
+        assert hasher.verify(hashed, "G00dP455!")
+        # A process configured with a lower cost never downgrades a hash
+        hasher.rounds = 3
+        assert not hasher.needs_rehash(hashed)
+
+    def test_queue_limit(self):
+        hasher = self.hasher(PASSWORD_HASH_QUEUE=1)
+        started, release = threading.Event(), threading.Event()
+
+        def slow(password):
+            started.set()
+            release.wait(5)
+            return password
+
+        worker = threading.Thread(target=hasher._run, args=(slow, "first"))
+        worker.start()
+        started.wait(5)
+        try:
+            with pytest.raises(HasherBusy):
+                hasher.hash("G00dP455!")
+        finally:
+            release.set()
+            worker.join()
+        assert cost_of(hasher.hash("G00dP455!")) == 4
+
+
+class TestLoginHashing():
+
+    @pytest.fixture()
+    def user(self, testing_app):
+        user = User("Ann", "Host", "ann@host.com", "G00dP455!")
+        db.session.add(user)
+        db.session.commit()
+        return user
+
+    def login(self, client):
+        return client.post("/api/v1/auth/login", json={"email": "ann@host.com", "password": "G00dP455!"})
+
+    def test_rehash_on_login_when_the_cost_changed(self, testing_client, user):
+        assert cost_of(user.password) == 4
+        passwords.rounds = 5
+
+        assert self.login(testing_client).status_code == 200
+        db.session.expire_all()
+        assert cost_of(db.session.get(User, user.id).password) == 5
+        # The new hash works, and is not replaced again
+        assert self.login(testing_client).status_code == 200
+
+    def test_busy_hasher_answers_503(self, testing_client, user, monkeypatch):
+        monkeypatch.setattr(passwords, "_slots", threading.BoundedSemaphore(1))
+        passwords._slots.acquire()
+
+        response = self.login(testing_client)
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "1"
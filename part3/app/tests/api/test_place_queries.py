@@ -0,0 +1,87 @@
+import pytest
+from part3.app import db
+from part3.app.models.user import User
+from part3.app.models.review import Review
+from part3.app.services.facade import facade
+
+"""Place read paths must cost a fixed number of queries, whatever the number of places/reviews"""
+
+
+class TestPlaceQueries():
+
+    def seed(self, count):
+        """Create `count` places, each with one amenity and two reviews by different users"""
+        owner = User("Ann", "Owner", "ann@owner.com", "G00dP455!")
+        guests = [User("Guest", str(i), f"guest{i}@mail.com", "G00dP455!") for i in range(2)]
+        db.session.add_all([owner] + guests)
+        db.session.commit()
+        owner_id = owner.id
+        amenity = facade.create_amenity({"name": "WiFi"})
+
+        for i in range(count):
+            place = facade.create_place({
+                "title": f"Place {i}", "description": "", "price": 10,
+                "latitude": 0.0, "longitude": 0.0,
+                "owner_id": owner_id, "amenities": [amenity.id]
+            })
+            db.session.add_all([Review("Nice", 4, place_id=place.id, user_id=g.id) for g in guests])
+        db.session.commit()
+
+        # Start from an empty identity map, like a fresh request would
+        db.session.expunge_all()
+        return owner_id
+
+    @pytest.mark.parametrize("count", [2, 10])
+    def test_get_all_places_query_count(self, testing_app, queries, count):
+        self.seed(count)
+        queries.clear()
+
+        places = facade.get_all_places()
+
+        assert len(places) == count
+        assert all(len(p["reviews"]) == 2 and p["reviews"][0]["user_id"] for p in places)
+        # places + amenities + reviews
+        assert len(queries) == 3
+
+    def test_get_place_query_count(self, testing_app, queries):
+        self.seed(3)
+        place_id = db.session.execute(db.text("SELECT id FROM places LIMIT 1")).scalar()
+        db.session.expunge_all()
+        queries.clear()
+
+        place = facade.get_place(place_id)
+
+        assert len(place["reviews"]) == 2
+        assert len(queries) == 3
+
+    def test_get_places_by_user_query_count(self, testing_app, queries):
+        owner_id = self.seed(5)
+        queries.clear()
+
+        places = facade.get_places_by_user(owner_id)
+
+        assert len(places) == 5
+        # owner lookup + places + amenities + reviews
+        assert len(queries) == 4
+
+    def test_plain_get_loads_no_collection(self, testing_app, queries):
+        self.seed(1)
+        place_id = db.session.execute(db.text("SELECT id FROM places LIMIT 1")).scalar()
+        db.session.expunge_all()
+        queries.clear()
+
+        # Writes and existence checks go through get(), the reviews and amenities stay unloaded
+        assert facade.place_repo.get(place_id) is not None
+        assert len(queries) == 1
+
+    def test_search_query_count(self, testing_app, queries):
+        self.seed(5)
+        facade.search_places("Place")
+        db.session.expunge_all()
+        queries.clear()
+
+        results = facade.search_places("Place")
+
+        assert len(results["results"]) == 5
+        # places + amenities
+        assert len(queries) == 2
@@ -0,0 +1,72 @@
+import pytest
+from part3.app import db
+from part3.app.models.user import User
+from part3.app.models.review import Review
+from part3.app.services.facade import facade
+
+
+class TestPlaceRatings():
+
+    @pytest.fixture()
+    def setup(self, testing_app):
+        users = [User("User", str(i), f"user{i}@mail.com", "G00dP455!") for i in range(4)]
+        db.session.add_all(users)
+        db.session.commit()
+        places = [facade.create_place({
+            "title": f"Place {i}", "description": "", "price": 50,
+            "latitude": 0.0, "longitude": 0.0,
+            "owner_id": users[0].id, "amenities": []
+        }) for i in range(3)]
+        return [u.id for u in users], [p.id for p in places]
+
+    def review(self, user_id, place_id, rating):
+        return facade.create_review({"text": "ok", "rating": rating, "user_id": user_id, "place_id": place_id})
+
+    def aggregates(self, place_id):
+        place = facade.get_place(place_id)
+        return place["review_count"], place["rating_avg"]
+
+    def test_create_update_delete_keep_aggregates(self, setup):
+        users, places = setup
+        first = self.review(users[1], places[0], 5)
+        self.review(users[2], places[0], 2)
+        assert self.aggregates(places[0]) == (2, 3.5)
+
+        facade.update_review(first.id, {"rating": 3})
+        assert self.aggregates(places[0]) == (2, 2.5)
+
+        facade.delete_review(first.id)
+        assert self.aggregates(places[0]) == (1, 2.0)
+
+    def test_delete_user_removes_their_ratings(self, setup):
+        users, places = setup
+        self.review(users[1], places[1], 1)
+        self.review(users[2], places[1], 5)
+
+        facade.delete_user(users[1])
+
+        assert self.aggregates(places[1]) == (1, 5.0)
+
+    def test_top_rated_and_most_popular(self, setup):
+        users, places = setup
+        self.review(users[1], places[0], 3)
+        self.review(users[2], places[0], 3)
+        self.review(users[3], places[0], 3)
+        self.review(users[1], places[1], 5)
+
+        assert [p["id"] for p in facade.get_top_rated_places(6)] == [places[1], places[0]]
+        assert [p["id"] for p in facade.get_most_popular_places(2)] == [places[0], places[1]]
+
+    def test_backfill_command(self, testing_app, setup):
+        users, places = setup
+        # Reviews inserted behind the facade's back leave the aggregates at 0
+        db.session.add_all([Review("ok", 4, place_id=places[2], user_id=users[1]),
+                            Review("ok", 1, place_id=places[2], user_id=users[2])])
+        db.session.commit()
+        assert self.aggregates(places[2]) == (0, 0.0)
+
+        result = testing_app.test_cli_runner().invoke(args=["backfill-ratings"])
+
+        assert "3 places" in result.output
+        assert self.aggregates(places[2]) == (2, 2.5)
+        assert self.aggregates(places[0]) == (0, 0.0)
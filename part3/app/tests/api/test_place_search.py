@@ -0,0 +1,80 @@
+import pytest
+from part3.app import db
+from part3.app.models.user import User
+from part3.app.services.facade import facade
+from part3.app.services.search_index import PlaceSearchIndex, tokenize
+
+
+class TestSearchIndex():
+
+    def test_tokenize_drops_case_punctuation_and_stop_words(self):
+        assert tokenize("The Cosy Loft, by the Sea!") == ["cosy", "loft", "sea"]
+
+    def test_title_match_ranks_above_description_match(self):
+        index = PlaceSearchIndex()
+        index.rebuild([
+            ("1", "Quiet cabin", "A beach is a short walk away"),
+            ("2", "Beach house", "Sleeps four"),
+            ("3", "City flat", "Close to the station"),
+        ])
+        total, ranked = index.search("beach")
+        assert total == 2
+        assert [place_id for place_id, _ in ranked] == ["2", "1"]
+
+    def test_add_and_remove_keep_the_index_current(self):
+        index = PlaceSearchIndex()
+        index.rebuild([("1", "Beach house", "")])
+        index.add("1", "Mountain hut", "")
+        assert index.search("beach") == (0, [])
+        assert index.search("mountain")[0] == 1
+        index.remove("1")
+        assert index.search("mountain") == (0, [])
+
+
+class TestPlaceSearch():
+
+    @pytest.fixture()
+    def owner_id(self, testing_app):
+        owner = User("Ann", "Owner", "ann@owner.com", "G00dP455!")
+        db.session.add(owner)
+        db.session.commit()
+        return owner.id
+
+    def add_place(self, owner_id, title, description=""):
+        return facade.create_place({
+            "title": title, "description": description, "price": 50,
+            "latitude": -37.8, "longitude": 144.9,
+            "owner_id": owner_id, "amenities": []
+        })
+
+    def test_search_ranks_and_paginates(self, testing_client, owner_id):
+        self.add_place(owner_id, "Beach house", "Right on the beach")
+        self.add_place(owner_id, "City loft", "Ten minutes from the beach")
+        for i in range(5):
+            self.add_place(owner_id, f"Farm stay {i}", "Cows and fresh air")
+
+        response = testing_client.get("/api/v1/places/search?q=beach")
+        assert response.status_code == 200
+        assert response.json["total"] == 2
+        assert [p["title"] for p in response.json["results"]] == ["Beach house", "City loft"]
+
+        response = testing_client.get("/api/v1/places/search?q=farm&per_page=2&page=3")
+        assert response.json["total"] == 5
+        assert len(response.json["results"]) == 1
+
+    def test_search_sees_created_updated_and_deleted_places(self, testing_client, owner_id):
+        place = self.add_place(owner_id, "Beach house")
+        assert facade.search_places("beach")["total"] == 1
+
+        self.add_place(owner_id, "Beach bungalow")
+        assert facade.search_places("beach")["total"] == 2
+
+        facade.update_place(place.id, {"title": "Mountain hut"})
+        assert facade.search_places("mountain")["total"] == 1
+        assert facade.search_places("beach")["total"] == 1
+
+        facade.delete_place(place.id)
+        assert facade.search_places("mountain")["total"] == 0
+
+    def test_search_requires_a_query(self, testing_client):
+        assert testing_client.get("/api/v1/places/search").status_code == 400
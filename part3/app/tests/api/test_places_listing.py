@@ -0,0 +1,76 @@
+import pytest
+from part3.app import db
+from part3.app.models.user import User
+from part3.app.services.facade import facade
+
+"""Server side listing mode of GET /api/v1/places (keyset pagination + filters)"""
+
+
+class TestPlacesListing():
+
+    @pytest.fixture()
+    def owners(self, testing_app):
+        first = User("Ann", "Owner", "ann@owner.com", "G00dP455!")
+        second = User("Bob", "Owner", "bob@owner.com", "G00dP455!")
+        db.session.add_all([first, second])
+        db.session.commit()
+        return first, second
+
+    @pytest.fixture()
+    def wifi(self, testing_app):
+        return facade.create_amenity({"name": "WiFi"})
+
+    @pytest.fixture()
+    def places(self, owners, wifi):
+        first, second = owners
+        created = []
+        for i in range(7):
+            created.append(facade.create_place({
+                "title": f"Place {i}",
+                "description": "Somewhere",
+                "price": 10 * (i + 1),
+                "latitude": 10.0,
+                "longitude": 10.0,
+                "owner_id": first.id if i % 2 == 0 else second.id,
+                "amenities": [wifi.id] if i < 3 else []
+            }))
+        return created
+
+    def test_pages_cover_every_place_once(self, testing_client, places):
+        seen = []
+        response = testing_client.get("/api/v1/places/?limit=3")
+        while True:
+            assert response.status_code == 200
+            seen += [p["id"] for p in response.json["places"]]
+            cursor = response.json["next_cursor"]
+            if cursor is None:
+                break
+            response = testing_client.get(f"/api/v1/places/?limit=3&cursor={cursor}")
+
+        assert sorted(seen) == sorted(p.id for p in places)
+        assert len(seen) == len(set(seen))
+
+    def test_page_leaves_out_reviews(self, testing_client, places):
+        response = testing_client.get("/api/v1/places/?limit=2")
+        assert len(response.json["places"]) == 2
+        assert "reviews" not in response.json["places"][0]
+
+    def test_price_filter(self, testing_client, places):
+        response = testing_client.get("/api/v1/places/?min_price=30&max_price=50")
+        assert sorted(p["price"] for p in response.json["places"]) == [30.0, 40.0, 50.0]
+
+    def test_amenity_and_owner_filters(self, testing_client, places, owners, wifi):
+        response = testing_client.get(f"/api/v1/places/?amenity_id={wifi.id}")
+        assert sorted(p["title"] for p in response.json["places"]) == ["Place 0", "Place 1", "Place 2"]
+
+        response = testing_client.get(f"/api/v1/places/?amenity_id={wifi.id}&owner_id={owners[0].id}")
+        assert sorted(p["title"] for p in response.json["places"]) == ["Place 0", "Place 2"]
+
+    def test_invalid_cursor(self, testing_client, places):
+        response = testing_client.get("/api/v1/places/?cursor=not-a-cursor")
+        assert response.status_code == 400
+
+    def test_no_parameters_returns_full_list(self, testing_client, places):
+        response = testing_client.get("/api/v1/places/")
+        assert isinstance(response.json, list)
+        assert len(response.json) == len(places)
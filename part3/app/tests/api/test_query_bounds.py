@@ -0,0 +1,123 @@
+import logging
+import re
+import pytest
+from part3.app import db
+from part3.app.models.amenity import Amenity
+from part3.app.models.user import User
+from part3.app.persistence import identity_map
+from part3.app.services.facade import facade
+
+
+def unbounded_selects(statements):
+    """The SELECTs reading a table with neither WHERE nor LIMIT: the whole table"""
+    unbounded = []
+    for statement in statements:
+        sql = " ".join(statement.split()).upper()
+        if sql.startswith("SELECT") and " FROM " in sql and " WHERE " not in sql and " LIMIT " not in sql:
+            unbounded.append(statement)
+    return unbounded
+
+
+def tables_of(statements):
+    """(verb, first table) of each statement"""
+    pattern = re.compile(r"^(SELECT) .*? FROM (\w+)|^(INSERT) INTO (\w+)|^(UPDATE) (\w+)|^(DELETE) FROM (\w+)")
+    tables = []
+    for statement in statements:
+        groups = [group for group in pattern.match(" ".join(statement.split())).groups() if group]
+        tables.append(tuple(groups))
+    return tables
+
+
+# Every facade operation on a single entity, called with the ids of the data fixture
+SINGLE_ENTITY_CALLS = {
+    "get_user": lambda d: facade.get_user(d["guest"]),
+    "get_user_data": lambda d: facade.get_user_data(d["guest"]),
+    "update_user": lambda d: facade.update_user(d["guest"], {"first_name": "Gil"}),
+    "delete_user": lambda d: facade.delete_user(d["guest"]),
+    "create_place": lambda d: facade.create_place({
+        "title": "Barn", "description": "", "price": 20, "latitude": 1.0, "longitude": 2.0,
+        "owner_id": d["owner"], "amenities": [d["amenity"]]
+    }),
+    "get_place": lambda d: facade.get_place(d["place"]),
+    "get_place_owner_id": lambda d: facade.get_place_owner_id(d["place"]),
+    "update_place": lambda d: facade.update_place(d["place"], {"title": "Attic"}),
+    "delete_place": lambda d: facade.delete_place(d["place"]),
+    "create_amenity": lambda d: facade.create_amenity({"name": "Pool"}),
+    "get_amenity": lambda d: facade.get_amenity(d["amenity"]),
+    "get_amenity_data": lambda d: facade.get_amenity_data(d["amenity"]),
+    "update_amenity": lambda d: facade.update_amenity(d["amenity"], {"name": "Wifi 6", "description": ""}),
+    "delete_amenity": lambda d: facade.delete_amenity(d["amenity"]),
+    "add_amenity_to_place": lambda d: facade.add_amenity_to_place(d["place"], d["other_amenity"]),
+    "remove_amenity_from_place": lambda d: facade.remove_amenity_from_place(d["place"], d["amenity"]),
+    "create_review": lambda d: facade.create_review({
+        "text": "Fine", "rating": 3, "place_id": d["place"], "user_id": d["owner"]
+    }),
+    "get_review": lambda d: facade.get_review(d["review"]),
+    "get_review_author": lambda d: facade.get_review_author(d["review"]),
+    "update_review": lambda d: facade.update_review(d["review"], {"text": "Good", "rating": 4}),
+    "delete_review": lambda d: facade.delete_review(d["review"]),
+    "has_user_reviewed_place": lambda d: facade.has_user_reviewed_place(d["guest"], d["place"]),
+}
+
+
+class TestQueryBounds():
+    """A facade operation on one entity must never read a whole table, whatever the size of the data"""
+
+    @pytest.fixture()
+    def data(self, testing_app):
+        owner = User("Ann", "Owner", "ann@owner.com", "G00dP455!")
+        guest = User("Gus", "Guest", "gus@guest.com", "G00dP455!")
+        wifi = Amenity("Wi-Fi")
+        sauna = Amenity("Sauna")
+        db.session.add_all([owner, guest, wifi, sauna])
+        db.session.commit()
+        place = facade.create_place({
+            "title": "Loft", "description": "", "price": 50, "latitude": -37.8, "longitude": 144.9,
+            "owner_id": owner.id, "amenities": [wifi.id]
+        })
+        review = facade.create_review({"text": "Nice", "rating": 4, "place_id": place.id, "user_id": guest.id})
+        return {
+            "owner": owner.id, "guest": guest.id, "place": place.id, "review": review.id,
+            "amenity": wifi.id, "other_amenity": sauna.id
+        }
+
+    @pytest.fixture(autouse=True)
+    def debug_logging(self, caplog):
+        # Debug only code paths are checked too
+        caplog.set_level(logging.DEBUG, logger="part3.app.services.facade")
+
+    def sql_of(self, call, data, queries):
+        """The statements a facade call sends, with nothing cached: every lookup reaches the database"""
+        db.session.expunge_all()
+        identity_map.clear()
+        facade.user_cache.clear()
+        facade.place_cache.clear()
+        facade.amenity_cache.clear()
+        queries.clear()
+        call(data)
+        return list(queries)
+
+    @pytest.mark.parametrize("name", SINGLE_ENTITY_CALLS)
+    def test_single_entity_calls_are_bounded(self, name, data, queries):
+        statements = self.sql_of(SINGLE_ENTITY_CALLS[name], data, queries)
+
+        assert statements, f"{name} sent no SQL, the harness records nothing"
+        assert unbounded_selects(statements) == []
+
+    def test_harness_catches_a_table_scan(self, data, queries):
+        statements = self.sql_of(lambda d: facade.get_all_amenities(), data, queries)
+
+        assert len(unbounded_selects(statements)) == 1
+
+    def test_create_review_queries(self, data, queries):
+        statements = self.sql_of(SINGLE_ENTITY_CALLS["create_review"], data, queries)
+
+        # Whether the place and the author exist, by primary key, then the writes
+        assert tables_of(statements) == [
+            ("SELECT", "places"), ("SELECT", "users"), ("INSERT", "reviews"), ("UPDATE", "places"),
+        ]
+        assert "WHERE places.id = " in statements[0]
+        assert "WHERE users.id = " in statements[1]
+        # Neither the place nor the author is loaded, let alone their collections
+        assert "places.title" not in statements[0]
+        assert "users.email" not in statements[1]
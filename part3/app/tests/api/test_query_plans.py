@@ -0,0 +1,74 @@
+import re
+import pytest
+from sqlalchemy import event
+from part3.app import db
+from part3.app.models.amenity import Amenity
+from part3.app.models.user import User
+from part3.app.services.facade import facade
+
+# "SCAN places" reads the whole table, "SCAN places USING INDEX ..." walks an index in order
+FULL_SCAN = re.compile(r"^SCAN (\w+)$")
+
+
+class TestQueryPlans():
+    """The hot repository queries must be served by indexes, never by a full table scan"""
+
+    @pytest.fixture()
+    def plans(self, testing_app):
+        """Records the SELECTs sent to the database with their parameters"""
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().startswith("SELECT") and not executemany:
+                statements.append((statement, parameters))
+
+        event.listen(db.engine, "before_cursor_execute", record)
+        yield statements
+        event.remove(db.engine, "before_cursor_execute", record)
+
+    @pytest.fixture()
+    def data(self, testing_app):
+        owner = User("Ann", "Owner", "ann@owner.com", "G00dP455!")
+        guest = User("Gus", "Guest", "gus@guest.com", "G00dP455!")
+        wifi = Amenity("Wi-Fi")
+        db.session.add_all([owner, guest, wifi])
+        db.session.commit()
+        place = facade.create_place({
+            "title": "Loft", "description": "", "price": 50, "latitude": -37.8, "longitude": 144.9,
+            "owner_id": owner.id, "amenities": [wifi.id]
+        })
+        facade.create_review({"text": "Nice", "rating": 4, "place_id": place.id, "user_id": guest.id})
+        return owner.id, guest.id, place.id
+
+    def full_scans(self, statements):
+        scans = []
+        with db.engine.connect() as connection:
+            for statement, parameters in statements:
+                for row in connection.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, tuple(parameters)):
+                    # (id, parent, notused, detail)
+                    match = FULL_SCAN.match(row[-1])
+                    if match:
+                        scans.append((match.group(1), statement))
+        return scans
+
+    def test_hot_queries_use_indexes(self, testing_app, data, plans):
+        owner_id, guest_id, place_id = data
+
+        with testing_app.app_context():
+            db.session.expunge_all()
+            plans.clear()
+            facade.user_repo.get_user_by_email("ann@owner.com")
+            facade.amenity_repo.get_amenity_by_name("Wi-Fi")
+            facade.review_repo.get_review_by_rating(4)
+            facade.review_repo.user_has_reviewed_place(guest_id, place_id)
+            facade.review_repo.get_rating_totals_by_user(guest_id)
+            facade.place_repo.get_places_by_owner(owner_id)
+            facade.place_repo.get(place_id).reviews
+            facade.place_repo.get_newest(6)
+            facade.place_repo.get_top_rated(6)
+            facade.place_repo.get_most_popular(6)
+            facade.place_repo.get_places_page(20)
+            facade.place_repo.get_places_in_bbox(-38, 144, -37, 145)
+
+        assert plans
+        assert self.full_scans(plans) == []
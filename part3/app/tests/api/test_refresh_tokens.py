@@ -0,0 +1,90 @@
+from datetime import datetime, timedelta, timezone
+import pytest
+from flask_jwt_extended import decode_token
+from part3.app import db
+from part3.app.extensions import passwords
+from part3.app.models.revoked_token import RevokedToken
+from part3.app.models.user import User
+from part3.app.services.facade import facade
+from part3.app.services.repositories.RevokedTokenRepository import RevokedTokenRepository
+from part3.app.services.revocation import BloomFilter, RevocationList
+
+
+class TestRefreshTokens():
+
+    @pytest.fixture()
+    def tokens(self, testing_client):
+        db.session.add(User("Ann", "Host", "ann@host.com", "G00dP455!"))
+        db.session.commit()
+        response = testing_client.post("/api/v1/auth/login", json={"email": "ann@host.com", "password": "G00dP455!"})
+        assert response.status_code == 200
+        return response.json
+
+    def post(self, client, path, token):
+        return client.post(f"/api/v1/auth/{path}", headers={"Authorization": f"Bearer {token}"})
+
+    def test_refresh_rotates_the_tokens(self, testing_client, tokens, monkeypatch):
+        # No bcrypt involved, only the signature of the refresh token
+        monkeypatch.setattr(passwords, "verify", lambda *args: pytest.fail("password checked"))
+        response = self.post(testing_client, "refresh", tokens["refresh_token"])
+
+        assert response.status_code == 200
+        assert response.json["refresh_token"] != tokens["refresh_token"]
+        assert self.post(testing_client, "refresh", response.json["refresh_token"]).status_code == 200
+
+    def test_access_token_lasts_a_day(self, tokens):
+        # The frontend does not refresh its tokens yet
+        claims = decode_token(tokens["access_token"])
+        assert claims["exp"] - claims["iat"] == 24 * 3600
+
+    def test_access_token_cannot_refresh(self, testing_client, tokens):
+        assert self.post(testing_client, "refresh", tokens["access_token"]).status_code == 422
+
+    def test_replayed_refresh_token_revokes_the_session(self, testing_client, tokens):
+        renewed = self.post(testing_client, "refresh", tokens["refresh_token"]).json
+
+        assert self.post(testing_client, "refresh", tokens["refresh_token"]).status_code == 401
+        # The tokens obtained with it are revoked too
+        assert self.post(testing_client, "refresh", renewed["refresh_token"]).status_code == 401
+        assert self.post(testing_client, "logout", renewed["access_token"]).status_code == 401
+
+    def test_logout(self, testing_client, tokens):
+        assert self.post(testing_client, "logout", tokens["access_token"]).status_code == 200
+        assert self.post(testing_client, "refresh", tokens["refresh_token"]).status_code == 401
+
+    def test_revocation_check_makes_no_query(self, tokens, queries):
+        assert not facade.is_session_revoked({"fam": "0190b5a4-1c2d-7e3f-8a4b-5c6d7e8f9a0b"})
+        assert queries == []
+
+    def test_revocations_reach_other_processes(self, tokens):
+        now = [0.0]
+        other = RevocationList(RevokedTokenRepository(), clock=lambda: now[0])
+        other.load()
+        payload = {"fam": "0190b5a4-1c2d-7e3f-8a4b-5c6d7e8f9a0b"}
+
+        facade.revoke_session(payload)
+        assert facade.is_session_revoked(payload)
+        assert not other.is_revoked(payload)
+        now[0] += RevocationList.SYNC_SECONDS
+        assert other.is_revoked(payload)
+
+    def test_purge(self, tokens):
+        repository = RevokedTokenRepository()
+        past = datetime.now(timezone.utc) - timedelta(days=1)
+        repository.revoke("0190b5a4-1c2d-7e3f-8a4b-5c6d7e8f9a0b", RevokedToken.SESSION, past)
+        facade.revoke_session({"fam": "0190b5a4-1c2d-7e3f-8a4b-5c6d7e8f9a0c"})
+
+        assert facade.purge_revoked_tokens() == 1
+        assert repository.is_revoked("0190b5a4-1c2d-7e3f-8a4b-5c6d7e8f9a0c", RevokedToken.SESSION)
+
+
+class TestBloomFilter():
+
+    def test_no_false_negatives_and_few_false_positives(self):
+        bloom = BloomFilter(1000, 0.01)
+        for i in range(1000):
+            bloom.add(f"added-{i}")
+
+        assert all(f"added-{i}" in bloom for i in range(1000))
+        false_positives = sum(f"other-{i}" in bloom for i in range(10000))
+        assert false_positives < 300
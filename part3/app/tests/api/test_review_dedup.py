@@ -0,0 +1,39 @@
+import pytest
+from part3.app import db
+from part3.app.models.user import User
+from part3.app.services.facade import facade
+
+
+class TestReviewDedup():
+
+    @pytest.fixture()
+    def review_data(self, testing_app):
+        owner = User("Ann", "Owner", "ann@owner.com", "G00dP455!")
+        guest = User("Gus", "Guest", "gus@guest.com", "G00dP455!")
+        db.session.add_all([owner, guest])
+        db.session.commit()
+        place = facade.create_place({
+            "title": "Cabin", "description": "", "price": 80,
+            "latitude": 1.0, "longitude": 1.0,
+            "owner_id": owner.id, "amenities": []
+        })
+        return {"text": "Lovely", "rating": 5, "place_id": place.id, "user_id": guest.id}
+
+    def test_has_user_reviewed_place(self, review_data):
+        assert not facade.has_user_reviewed_place(review_data["user_id"], review_data["place_id"])
+        facade.create_review(dict(review_data))
+        assert facade.has_user_reviewed_place(review_data["user_id"], review_data["place_id"])
+
+    def test_duplicate_review_is_rejected_by_constraint(self, review_data, queries):
+        facade.create_review(dict(review_data))
+
+        queries.clear()
+        with pytest.raises(ValueError) as exception:
+            facade.create_review(dict(review_data))
+        assert "already reviewed" in str(exception.value)
+
+        # No full scan of the reviews table to find the duplicate
+        assert not any(q.startswith("SELECT") and "FROM reviews" in q and "WHERE" not in q for q in queries)
+
+        # The session is still usable after the rollback
+        assert len(facade.get_reviews_by_place(review_data["place_id"])) == 1
@@ -0,0 +1,124 @@
+import pytest
+from sqlalchemy import event
+from part3.app import db
+from part3.app.models.amenity import Amenity
+from part3.app.models.user import User
+from part3.app.services.facade import facade
+
+
+class TestUnitOfWork():
+
+    @pytest.fixture()
+    def commits(self, testing_app):
+        """Counts the COMMITs sent to the testing database"""
+        counter = []
+
+        def record(conn):
+            counter.append(conn)
+
+        event.listen(db.engine, "commit", record)
+        yield counter
+        event.remove(db.engine, "commit", record)
+
+    @pytest.fixture()
+    def owner_id(self, testing_app):
+        owner = User("Ann", "Owner", "ann@owner.com", "G00dP455!")
+        db.session.add(owner)
+        db.session.commit()
+        return owner.id
+
+    def add_place(self, owner_id, title="Loft"):
+        return facade.create_place({
+            "title": title, "description": "", "price": 50, "latitude": 0, "longitude": 0,
+            "owner_id": owner_id, "amenities": []
+        })
+
+    def test_block_commits_once(self, testing_app, owner_id, commits):
+        place = self.add_place(owner_id)
+        commits.clear()
+
+        with facade.transaction():
+            for i in range(5):
+                amenity = facade.create_amenity({"name": f"Amenity {i}"})
+                facade.add_amenity_to_place(place.id, amenity.id)
+            # Flushed writes are visible inside the block
+            assert facade.amenity_repo.count() == 5
+            assert commits == []
+
+        assert len(commits) == 1
+        assert len(facade.get_place(place.id)["amenities"]) == 5
+
+    def test_error_rolls_back_every_write(self, testing_app, owner_id):
+        with pytest.raises(RuntimeError):
+            with facade.transaction():
+                facade.create_amenity({"name": "Pool"})
+                self.add_place(owner_id)
+                raise RuntimeError("halfway")
+
+        assert facade.amenity_repo.count() == 0
+        assert facade.place_repo.count() == 0
+
+    def test_nested_blocks_join_the_outer_one(self, testing_app, commits):
+        with pytest.raises(RuntimeError):
+            with facade.transaction():
+                with facade.transaction():
+                    facade.create_amenity({"name": "Pool"})
+                assert commits == []
+                raise RuntimeError("after the inner block")
+
+        assert facade.amenity_repo.count() == 0
+
+    def test_rollback_drops_cached_entries(self, testing_app, owner_id):
+        place = self.add_place(owner_id, "Loft")
+
+        with pytest.raises(RuntimeError):
+            with facade.transaction():
+                facade.update_place(place.id, {"title": "Castle"})
+                assert facade.get_place(place.id)["title"] == "Castle"
+                raise RuntimeError("rolled back")
+
+        with testing_app.app_context():
+            assert facade.get_place(place.id)["title"] == "Loft"
+
+    def test_duplicate_review_leaves_the_rating_untouched(self, testing_app, owner_id):
+        guest = User("Gus", "Guest", "gus@guest.com", "G00dP455!")
+        db.session.add(guest)
+        db.session.commit()
+        place = self.add_place(owner_id)
+        review = {"text": "Nice", "rating": 4, "place_id": place.id, "user_id": guest.id}
+
+        facade.create_review(review)
+        with pytest.raises(ValueError):
+            facade.create_review(review)
+
+        place = facade.place_repo.get(place.id)
+        assert (place.review_count, place.rating_sum) == (1, 4)
+
+    def test_failed_block_only_drops_its_own_entries(self, testing_app, owner_id):
+        kept = self.add_place(owner_id, "Loft")
+        facade.get_place(kept.id)
+        facade.search_places("loft")
+        other = self.add_place(owner_id, "Cabin")
+
+        with pytest.raises(RuntimeError):
+            with facade.transaction():
+                facade.get_place(other.id)
+                facade.create_place({
+                    "title": "Loft annex", "description": "", "price": 50, "latitude": 0, "longitude": 0,
+                    "owner_id": owner_id, "amenities": []
+                })
+                raise RuntimeError("rolled back")
+
+        # The entries cached before the block survive, the one cached inside is gone
+        assert facade.place_cache.get(kept.id) is not None
+        assert facade.place_cache.get(other.id) is None
+        # The index was not rebuilt, and never saw the rolled back place
+        assert facade.search_index.built
+        assert [p["title"] for p in facade.search_places("loft")["results"]] == ["Loft"]
+
+    def test_writes_outside_a_block_commit_one_by_one(self, testing_app, commits):
+        # Grouping is opt-in, a request without a block commits every write
+        facade.create_amenity({"name": "Pool"})
+        facade.create_amenity({"name": "Sauna"})
+
+        assert len(commits) == 2
@@ -1,6 +1,6 @@
 // This component displays featured place listings in a horizontally scrollable carousel.
-// It fetches all places data and then uses client-side filtering/sorting
-// to organize places into different categories.
+// Each category is fetched pre-sorted from the server (/places/featured),
+// so only the places shown in the carousel are downloaded.
 
 import React, { useState, useEffect } from 'react';
 import { Link } from 'react-router-dom';
@@ -27,45 +27,13 @@ const FeaturedPlaces = () => {
     const fetchFeaturedPlaces = async () => {
       setLoading(true);
       try {
-        // IMPORTANT: This fetches ALL places in one request
-        // In a larger application, this should be replaced with category-specific API endpoints
-        // that return pre-filtered data from the server
-        const response = await api.get('/places');
-        let places = response.data;
-        
-        // Apply different sorting/filtering based on selected category
-        // NOTE: All of this filtering and sorting happens client-side
-        // In a production app with large datasets, this would be better done on the server
-        // This is a **SWITCH STATEMENT**
-        switch(activeCategory) {
-          case 'new':
-            // Sort by creation date (newest first)
-            places = places.sort((a, b) => new Date(b.created_at) - new Date(a.created_at));
-            break;
-          case 'top-rated':
-            // Sort by rating (highest first)
-            // This filters to only include places with reviews and calculates average rating
-            places = places.filter(place => place.reviews?.length > 0)
-              .sort((a, b) => {
-                const avgA = a.reviews.reduce((sum, r) => sum + r.rating, 0) / a.reviews.length;
-                const avgB = b.reviews.reduce((sum, r) => sum + r.rating, 0) / b.reviews.length;
-                return avgB - avgA;
-              });
-            break;
-          case 'popular':
-            // Sort by number of reviews (most reviewed first) as a proxy for popularity
-            places = places.sort((a, b) => (b.reviews?.length || 0) - (a.reviews?.length || 0));
-            break;
-          case 'unique':
-            // Filter for places with unique amenities
-            // For demo purposes, we're defining "unique" as having more than 3 amenities
-            // In a real app, this might use more sophisticated criteria
-            places = places.filter(place => place.amenities?.length > 3);
-            break;
-          default:
-            break;
-        }
-        
+        // The server sorts/filters each category and returns only the 6 places we show
+        // (GET /places/featured, results are cached server side for a short time)
+        const response = await api.get('/places/featured', {
+          params: { category: activeCategory, limit: 6 }
+        });
+        const places = response.data;
+
         // Limit to 6 places to prevent carousel overload
         setFeaturedPlaces(places.slice(0, 6));
         setLoading(false);
@@ -96,10 +96,14 @@ api.interceptors.request.use(
  */
 export const getAllPlaces = async (searchQuery = '') => {
   try {
-    // If your API supports search parameters, you can add them here
-    // const response = await api.get(`/places?search=${searchQuery}`);
+    // Let the server rank matching places, best match first
+    if (searchQuery) {
+      const response = await api.get('/places/search', {
+        params: { q: searchQuery, per_page: 100 }
+      });
+      return response.data.results;
+    }
 
-    // If not, we'll fetch all places and filter in the component
     const response = await api.get('/places');
     return response.data; // Axios automatically parses JSON
   } catch (error) {
@@ -108,6 +112,70 @@ export const getAllPlaces = async (searchQuery = '') => {
   }
 };
 
+/**
+ * Get one page of places, filtered and paginated by the server
+ * 
+ * @param {Object} params - Optional limit, cursor, min_price, max_price, owner_id
+ * @param {Array} amenityIds - Optional amenity IDs the places must all offer
+ * @returns {Promise<Object>} - { places: [...], next_cursor: string|null }
+ * 
+ * Pass the returned next_cursor back as params.cursor to get the following page.
+ */
+export const getPlacesPage = async (params = {}, amenityIds = []) => {
+  try {
+    const query = new URLSearchParams();
+    Object.entries({ limit: 20, ...params }).forEach(([key, value]) => {
+      if (value !== undefined && value !== null && value !== '') {
+        query.append(key, value);
+      }
+    });
+    amenityIds.forEach(id => query.append('amenity_id', id));
+
+    const response = await api.get(`/places/?${query.toString()}`);
+    return response.data;
+  } catch (error) {
+    console.error('Error fetching places page:', error);
+    throw error;
+  }
+};
+
+/**
+ * Get the places inside a map viewport
+ * 
+ * @param {Object} bounds - { minLat, minLng, maxLat, maxLng } (minLng > maxLng crosses the antimeridian)
+ * @param {number} limit - Maximum number of places (server caps it at 100)
+ * @returns {Promise<Array>} - Array of place summaries
+ */
+export const getPlacesInBounds = async ({ minLat, minLng, maxLat, maxLng }, limit = 100) => {
+  try {
+    const response = await api.get('/places/bbox', {
+      params: { min_lat: minLat, min_lng: minLng, max_lat: maxLat, max_lng: maxLng, limit }
+    });
+    return response.data;
+  } catch (error) {
+    console.error('Error fetching places in bounds:', error);
+    throw error;
+  }
+};
+
+/**
+ * Get the places within a radius of a point, closest first
+ * 
+ * @param {number} lat - Latitude of the center
+ * @param {number} lng - Longitude of the center
+ * @param {number} radiusKm - Search radius in kilometers (max 500)
+ * @returns {Promise<Array>} - Array of place summaries with distance_km
+ */
+export const getPlacesNearby = async (lat, lng, radiusKm = 10) => {
+  try {
+    const response = await api.get('/places/nearby', { params: { lat, lng, radius_km: radiusKm } });
+    return response.data;
+  } catch (error) {
+    console.error('Error fetching nearby places:', error);
+    throw error;
+  }
+};
+
 /**
  * Get details for a specific place by ID
  * 